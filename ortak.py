@@ -0,0 +1,3575 @@
+# -*- coding: utf-8 -*-
+# EXPO CRM ortak katmanı: ayarlar, Drive/Sheets/SMTP yardımcıları, depolama ve tablo katmanı.
+# crm.py (giriş betiği) ve sayfalar/ buradan açıkça içe aktarır. Modül süreç başına bir kez
+# yüklenir; çalıştırmaya özel durum (yüklü tablolar vb.) st.session_state'te tutulur.
+import streamlit as st
+import pandas as pd
+from pydrive2.auth import GoogleAuth, InvalidConfigError
+from pydrive2.drive import GoogleDrive
+from pydrive2.files import ApiRequestError
+from oauth2client.service_account import ServiceAccountCredentials
+import io, os, bisect, copy, datetime, mimetypes, random, re, json, time, uuid, html, threading, hashlib, numbers, atexit, sqlite3, traceback
+import numpy as np
+import smtplib
+from email.message import EmailMessage
+from email.utils import make_msgid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from googleapiclient.discovery import build as build_google_service
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload
+import httplib2
+from sayilar import smart_to_num_series
+from xlsx_yazici import frame_fingerprint, sheet_xml, workbook_zip
+
+# =========================================================
+# ================ UYGULAMA AYARLARI ======================
+# =========================================================
+EMBED_IMAGES = True
+
+# Önbellekteki tablolar sığ kopyalarla dağıtılır; yerinde değişiklikler önbelleğe sızmasın.
+# pandas 3 ile copy-on-write zaten varsayılan.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+ETA_COLUMNS = ["Müşteri Adı", "Proforma No", "Sevk Tarihi", "ETA Tarihi", "Açıklama"]
+
+# (YENİ) Secrets destekli ID/URL okuma (opsiyonel)
+GOOGLE_SHEETS_ID = st.secrets.get("google_sheets_id", "")
+GOOGLE_SHEETS_URL = st.secrets.get("google_sheets_url", "")
+DRIVE_FOLDER_FIYAT_TEKLIFI = st.secrets.get("drive_folder_fiyat_teklifi", "1YLaalS7njnVDLBSutEI0SVJ0Soe2nIyK")
+DRIVE_FOLDER_IHRACAT_EVRATLARI = st.secrets.get("drive_folder_ihracat_evraklari", "1jPYrxzx-vRtKfJiII1FbSpgR9a6Bsb4e")
+PROFORMA_PDF_FOLDER_ID = st.secrets.get(
+    "drive_folder_proformalar", "1ksUGZv5Fxyz_x_m7QJDdvFr1_1cricWe"
+)
+SIPARIS_FORMU_FOLDER_ID = st.secrets.get(
+    "drive_folder_siparis_formlari", "1kSYIG2OiSgkd3JqOtOAGRgxqt_kia2wP"
+)
+
+# --- Referans listeler ---
+ulke_listesi = sorted([
+    "Afganistan","Almanya","Amerika Birleşik Devletleri","Andorra","Angola","Antigua ve Barbuda","Arjantin",
+    "Arnavutluk","Avustralya","Avusturya","Azerbaycan","Bahamalar","Bahreyn","Bangladeş","Barbados","Belçika",
+    "Belize","Benin","Beyaz Rusya","Bhutan","Birleşik Arap Emirlikleri","Birleşik Krallık","Bolivya",
+    "Bosna-Hersek","Botsvana","Brezilya","Brunei","Bulgaristan","Burkina Faso","Burundi","Butan",
+    "Cezayir","Çad","Çekya","Çin","Danimarka","Doğu Timor","Dominik Cumhuriyeti","Dominika","Ekvador",
+    "Ekvator Ginesi","El Salvador","Endonezya","Eritre","Ermenistan","Estonya","Etiyopya","Fas",
+    "Fiji","Fildişi Sahili","Filipinler","Filistin","Finlandiya","Fransa","Gabon","Gambia",
+    "Gana","Gine","Gine-Bissau","Grenada","Guatemala","Guyana","Güney Afrika","Güney Kore",
+    "Güney Sudan","Gürcistan","Haiti","Hindistan","Hırvatistan","Hollanda","Honduras","Hong Kong",
+    "Irak","İran","İrlanda","İspanya","İsrail","İsveç","İsviçre","İtalya","İzlanda","Jamaika",
+    "Japonya","Kamboçya","Kamerun","Kanada","Karadağ","Katar","Kazakistan","Kenya","Kırgızistan",
+    "Kiribati","Kolombiya","Komorlar","Kongo","Kongo Demokratik Cumhuriyeti","Kostarika","Küba",
+    "Kuveyt","Kuzey Kore","Kuzey Makedonya","Laos","Lesotho","Letonya","Liberya","Libya",
+    "Liechtenstein","Litvanya","Lübnan","Lüksemburg","Macaristan","Madagaskar","Malavi","Maldivler",
+    "Malezya","Mali","Malta","Marshall Adaları","Meksika","Mısır","Mikronezya","Moğolistan","Moldova",
+    "Monako","Morityus","Mozambik","Myanmar","Namibya","Nauru","Nepal","Nijer","Nijerya",
+    "Nikaragua","Norveç","Orta Afrika Cumhuriyeti","Özbekistan","Pakistan","Palau","Panama","Papua Yeni Gine",
+    "Paraguay","Peru","Polonya","Portekiz","Romanya","Ruanda","Rusya","Saint Kitts ve Nevis",
+    "Saint Lucia","Saint Vincent ve Grenadinler","Samoa","San Marino","Sao Tome ve Principe","Senegal",
+    "Seyşeller","Sırbistan","Sierra Leone","Singapur","Slovakya","Slovenya","Solomon Adaları","Somali",
+    "Sri Lanka","Sudan","Surinam","Suriye","Suudi Arabistan","Svaziland","Şili","Tacikistan","Tanzanya",
+    "Tayland","Tayvan","Togo","Tonga","Trinidad ve Tobago","Tunus","Tuvalu","Türkiye","Türkmenistan",
+    "Uganda","Ukrayna","Umman","Uruguay","Ürdün","Vanuatu","Vatikan","Venezuela","Vietnam",
+    "Yemen","Yeni Zelanda","Yunanistan","Zambiya","Zimbabve"
+]) + ["Diğer"]
+
+temsilci_listesi = ["KEMAL İLKER ÇELİKKALKAN", "HÜSEYİN POLAT", "EFE YILDIRIM", "FERHAT ŞEKEROĞLU"]
+
+# --- Sabitler ---
+EXCEL_FILE_ID    = "1VhMSqPEVqocgAfGkpn0h7jbcGQjygveJ"
+EVRAK_KLASOR_ID  = "1jPYrxzx-vRtKfJiII1FbSpgR9a6Bsb4e"
+FIYAT_TEKLIFI_ID = "1YLaalS7njnVDLBSutEI0SVJ0Soe2nIyK"
+
+WORKBOOK_PATH = "temp.xlsx"
+# Drive'daki Excel dosyasının revizyonu (modifiedDate/md5Checksum) en fazla bu sıklıkta sorgulanır
+DRIVE_METADATA_TTL = float(st.secrets.get("drive_metadata_ttl_seconds", 30))
+
+ACCOUNTING_EMAILS = st.secrets.get("accounting_emails", ["accounting@expocrm.com"])
+
+COUNTRY_LANGUAGE_MAP = {
+    "Türkiye": "tr",
+    "Amerika Birleşik Devletleri": "en",
+    "Birleşik Krallık": "en",
+    "Kanada": "en",
+    "Avustralya": "en",
+    "Almanya": "de",
+    "Avusturya": "de",
+    "İsviçre": "de",
+    "Fransa": "fr",
+    "Belçika": "fr",
+    "İspanya": "es",
+    "Meksika": "es",
+    "Kolombiya": "es",
+    "Arjantin": "es",
+    "Birleşik Arap Emirlikleri": "ar",
+    "Suudi Arabistan": "ar",
+    "Katar": "ar",
+    "Kuveyt": "ar",
+}
+
+FAIR_MAIL_TEMPLATES = {
+    "tr": {
+        "subject": "Fuar Görüşmemiz Hakkında",
+        "body": (
+            "Merhaba,\n\n"
+            "Fuarda standımızı ziyaret ettiğiniz için teşekkür ederiz. Sunduğumuz ürün ve"
+            " çözümler hakkında sorularınızı yanıtlamaktan memnuniyet duyarız."
+            "\n\n"
+            "İhtiyaçlarınızı daha iyi anlayabilmek ve iş birliği fırsatlarını görüşmek için"
+            " uygun olduğunuz bir zamanı paylaşmanızı rica ederiz.\n\n"
+            "Saygılarımızla,\nEXPOCRM Ekibi"
+        ),
+    },
+    "en": {
+        "subject": "Thank You for Visiting EXPOCRM at the Fair",
+        "body": (
+            "Hello,\n\n"
+            "Thank you for taking the time to meet with us during the trade fair. We would"
+            " be delighted to continue the conversation and share tailored solutions for"
+            " your business.\n\n"
+            "Please let us know a convenient time for a follow-up call or meeting so that"
+            " we can discuss the next steps together.\n\n"
+            "Best regards,\nEXPOCRM Team"
+        ),
+    },
+    "de": {
+        "subject": "Vielen Dank für Ihren Besuch auf unserem Messestand",
+        "body": (
+            "Guten Tag,\n\n"
+            "herzlichen Dank für das Gespräch an unserem Stand. Gerne senden wir Ihnen"
+            " weitere Informationen zu unseren Produkten und prüfen gemeinsame"
+            " Geschäftsmöglichkeiten.\n\n"
+            "Teilen Sie uns bitte mit, wann wir Sie für ein kurzes Nachgespräch erreichen"
+            " können.\n\n"
+            "Best regards,\nEXPOCRM Team"
+        ),
+    },
+    "fr": {
+        "subject": "Suite à notre rencontre sur le salon",
+        "body": (
+            "Bonjour,\n\n"
+            "Nous vous remercions d’avoir visité notre stand lors du salon. Nous serions"
+            " ravis de poursuivre nos échanges et de vous proposer des solutions adaptées"
+            " à vos besoins.\n\n"
+            "N’hésitez pas à nous indiquer vos disponibilités pour un échange complémentaire."
+            "\n\n"
+            "Saludos cordiales,\nEquipo de EXPOCRM"
+        ),
+    },
+    "es": {
+        "subject": "Seguimiento de nuestra reunión en la feria",
+        "body": (
+            "Hola,\n\n"
+            "Muchas gracias por visitarnos durante la feria. Queremos continuar la"
+            " conversación y presentarle nuestras soluciones ajustadas a sus necesidades."
+            "\n\n"
+            "Por favor, indíquenos cuándo podemos coordinar una reunión o llamada de"
+            " seguimiento.\n\n"
+            "Saludos cordiales,\nEquipo de Exportación EXPO"
+        ),
+    },
+    "ar": {
+        "subject": "متابعة بعد زيارتكم لجناحنا في المعرض",
+        "body": (
+            "مرحباً،\n\n"
+            "نشكر لكم زيارتكم لجناحنا خلال المعرض واهتمامكم بمنتجات شكر أوغلو. يسعدنا"
+            " تزويدكم بمعلومات إضافية وبحث فرص التعاون المشتركة.\n\n"
+            "يرجى تزويدنا بالوقت المناسب للتواصل معكم والحديث عن الخطوات القادمة.\n\n"
+            "مع أطيب التحيات،\nفريق EXPOCRM"
+        ),
+    },
+}
+
+HOLIDAY_MAIL_TEMPLATES = {
+    "Ramazan Bayramı": {
+        "tr": {
+            "subject": "Ramazan Bayramınız Kutlu Olsun",
+            "body": (
+                "<p>Değerli iş ortağımız,</p>"
+                "<p>Ramazan Bayramınızı en içten dileklerimizle kutlarız. İş birliğimizin"
+                " artarak devam etmesini diler, sevdiklerinizle birlikte sağlıklı ve mutlu"
+                " günler temenni ederiz.</p>"
+                "<p>Saygılarımızla,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "en": {
+            "subject": "Happy Eid al-Fitr",
+            "body": (
+                "<p>Dear business partner,</p>"
+                "<p>We sincerely wish you a joyful and prosperous Eid al-Fitr. Thank you"
+                " for your trust and cooperation.</p>"
+                "<p>Best regards,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "de": {
+            "subject": "Frohes Zuckerfest",
+            "body": (
+                "<p>Sehr geehrter Geschäftspartner,</p>"
+                "<p>wir wünschen Ihnen und Ihren Liebsten ein gesegnetes und"
+                " erfolgreiches Zuckerfest. Vielen Dank für die vertrauensvolle"
+                " Zusammenarbeit.</p>"
+                "<p>Mit freundlichen Grüßen,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "fr": {
+            "subject": "Bonne fête de l’Aïd al-Fitr",
+            "body": (
+                "<p>Cher partenaire,</p>"
+                "<p>Nous vous souhaitons une fête de l’Aïd al-Fitr pleine de joie et de"
+                " prospérité. Merci pour votre confiance et votre collaboration.</p>"
+                "<p>Cordialement,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "es": {
+            "subject": "Feliz Eid al-Fitr",
+            "body": (
+                "<p>Estimado socio,</p>"
+                "<p>Le deseamos un Eid al-Fitr lleno de alegría y prosperidad. Gracias"
+                " por su confianza y cooperación.</p>"
+                "<p>Saludos cordiales,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "ar": {
+            "subject": "عيد فطر سعيد",
+            "body": (
+                "<p>شريكنا العزيز،</p>"
+                "<p>نهنئكم بعيد الفطر المبارك ونتمنى لكم ولعائلتكم أياماً مليئة"
+                " بالخير والنجاح. نشكركم على ثقتكم وشراكتكم المستمرة.</p>"
+                "<p>مع أطيب التحيات،<br>مجموعة شكر أوغلو</p>"
+            ),
+        },
+    },
+    "Kurban Bayramı": {
+        "tr": {
+            "subject": "Kurban Bayramınız Kutlu Olsun",
+            "body": (
+                "<p>Değerli iş ortağımız,</p>"
+                "<p>Kurban Bayramı'nın bereket ve mutluluk getirmesini diler, bugüne"
+                " kadar gösterdiğiniz iş birliği için teşekkür ederiz.</p>"
+                "<p>En iyi dileklerimizle,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "en": {
+            "subject": "Happy Eid al-Adha",
+            "body": (
+                "<p>Dear business partner,</p>"
+                "<p>May this Eid al-Adha bring peace, happiness, and success to you and"
+                " your loved ones. Thank you for your continued cooperation.</p>"
+                "<p>Sincerely,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "de": {
+            "subject": "Frohes Opferfest",
+            "body": (
+                "<p>Sehr geehrter Geschäftspartner,</p>"
+                "<p>möge das Opferfest Ihnen und Ihrem Team Frieden, Gesundheit und"
+                " Erfolg bringen. Wir danken Ihnen für die gute Zusammenarbeit.</p>"
+                "<p>Mit freundlichen Grüßen,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "fr": {
+            "subject": "Bonne fête de l’Aïd al-Adha",
+            "body": (
+                "<p>Cher partenaire,</p>"
+                "<p>Que cette fête de l’Aïd al-Adha vous apporte paix, bonheur et"
+                " réussite. Merci pour votre collaboration précieuse.</p>"
+                "<p>Cordialement,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "es": {
+            "subject": "Feliz Eid al-Adha",
+            "body": (
+                "<p>Estimado socio,</p>"
+                "<p>Que este Eid al-Adha le traiga paz, felicidad y éxito a usted y a"
+                " su equipo. Gracias por su apoyo continuo.</p>"
+                "<p>Saludos cordiales,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "ar": {
+            "subject": "عيد أضحى مبارك",
+            "body": (
+                "<p>شريكنا العزيز،</p>"
+                "<p>نتمنى أن يحمل لكم عيد الأضحى المبارك السلام والسعادة والنجاح،"
+                " ونشكركم على تعاونكم المستمر.</p>"
+                "<p>مع خالص التقدير،<br>مجموعة شكر أوغلو</p>"
+            ),
+        },
+    },
+    "Yeni Yıl": {
+        "tr": {
+            "subject": "Mutlu Yıllar",
+            "body": (
+                "<p>Değerli iş ortağımız,</p>"
+                "<p>Geride bıraktığımız yıl boyunca gösterdiğiniz destek için teşekkür"
+                " ederiz. Yeni yılın size ve ekibinize sağlık, mutluluk ve başarı"
+                " getirmesini dileriz.</p>"
+                "<p>Sevgi ve saygılarımızla,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "en": {
+            "subject": "Happy New Year",
+            "body": (
+                "<p>Dear business partner,</p>"
+                "<p>Thank you for the trust and partnership throughout the past year. We"
+                " wish you and your team a healthy and prosperous New Year.</p>"
+                "<p>Warm regards,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "de": {
+            "subject": "Frohes Neues Jahr",
+            "body": (
+                "<p>Sehr geehrter Geschäftspartner,</p>"
+                "<p>vielen Dank für Ihre Unterstützung im vergangenen Jahr. Wir wünschen"
+                " Ihnen und Ihrem Team ein gesundes und erfolgreiches neues Jahr.</p>"
+                "<p>Mit besten Grüßen,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "fr": {
+            "subject": "Bonne année",
+            "body": (
+                "<p>Cher partenaire,</p>"
+                "<p>Merci pour votre confiance tout au long de l’année écoulée. Nous vous"
+                " souhaitons, à vous et à votre équipe, une nouvelle année pleine de"
+                " santé et de réussite.</p>"
+                "<p>Cordialement,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "es": {
+            "subject": "Feliz Año Nuevo",
+            "body": (
+                "<p>Estimado socio,</p>"
+                "<p>Gracias por su confianza y colaboración durante el último año. Les"
+                " deseamos a usted y a su equipo un Año Nuevo lleno de salud y"
+                " prosperidad.</p>"
+                "<p>Saludos cordiales,<br>Sekeroğlu Group</p>"
+            ),
+        },
+        "ar": {
+            "subject": "سنة جديدة سعيدة",
+            "body": (
+                "<p>شريكنا العزيز،</p>"
+                "<p>نشكر لكم ثقتكم وشراكتكم طوال العام الماضي، ونتمنى لكم ولفريقكم"
+                " عاماً جديداً مليئاً بالصحة والنجاح.</p>"
+                "<p>مع أطيب الأمنيات،<br>مجموعة شكر أوغلو</p>"
+            ),
+        },
+    },
+}
+
+HOLIDAY_FALLBACK_TEMPLATES = {
+    "Ramazan Bayramı": {
+        "subject": "Ramazan Bayramınız Kutlu Olsun / Happy Eid al-Fitr",
+        "body": (
+            "<p>Değerli iş ortağımız,</p>"
+            "<p>Ramazan Bayramınızı en içten dileklerimizle kutlarız. İş birliğimizin"
+            " artarak devam etmesini diler, sevdiklerinizle birlikte sağlıklı ve mutlu"
+            " günler temenni ederiz.</p>"
+            "<p>Saygılarımızla,<br>Sekeroğlu Group</p>"
+            "<hr>"
+            "<p>Dear business partner,</p>"
+            "<p>We sincerely wish you a joyful and prosperous Eid al-Fitr. Thank you for"
+            " your trust and cooperation.</p>"
+            "<p>Best regards,<br>Sekeroğlu Group</p>"
+        ),
+    },
+    "Kurban Bayramı": {
+        "subject": "Kurban Bayramınız Kutlu Olsun / Happy Eid al-Adha",
+        "body": (
+            "<p>Değerli iş ortağımız,</p>"
+            "<p>Kurban Bayramı'nın bereket ve mutluluk getirmesini diler, bugüne kadar"
+            " gösterdiğiniz iş birliği için teşekkür ederiz.</p>"
+            "<p>En iyi dileklerimizle,<br>Sekeroğlu Group</p>"
+            "<hr>"
+            "<p>Dear business partner,</p>"
+            "<p>May this Eid al-Adha bring peace, happiness and success to you and your"
+            " loved ones.</p>"
+            "<p>Sincerely,<br>Sekeroğlu Group</p>"
+        ),
+    },
+    "Yeni Yıl": {
+        "subject": "Mutlu Yıllar / Happy New Year",
+        "body": (
+            "<p>Değerli iş ortağımız,</p>"
+            "<p>Geride bıraktığımız yıl boyunca gösterdiğiniz destek için teşekkür ederiz."
+            " Yeni yılın size ve ekibinize sağlık, mutluluk ve başarı getirmesini dileriz.</p>"
+            "<p>Sevgi ve saygılarımızla,<br>Sekeroğlu Group</p>"
+            "<hr>"
+            "<p>Dear business partner,</p>"
+            "<p>Thank you for the trust and partnership throughout the past year. Wishing"
+            " you a healthy and prosperous New Year.</p>"
+            "<p>Warm regards,<br>Sekeroğlu Group</p>"
+        ),
+    },
+}
+
+LANGUAGE_LABELS = {
+    "tr": "Türkçe",
+    "en": "English",
+    "de": "Deutsch",
+    "fr": "Français",
+    "es": "Español",
+    "ar": "العربية",
+}
+
+def get_holiday_template_content(template_name, language_code):
+    template = HOLIDAY_MAIL_TEMPLATES.get(template_name, {})
+    content = template.get(language_code)
+    if content:
+        return content, False
+    fallback = HOLIDAY_FALLBACK_TEMPLATES.get(template_name)
+    if fallback:
+        return fallback, True
+    return None, False
+
+# =========================================================
+# ================ GENEL YARDIMCILAR ======================
+# =========================================================
+def id_label_map(keys, labels) -> dict:
+    """Seçim kutuları için {anahtar: etiket}; format_func=etiketler.get ile O(1) arama.
+
+    Tekrarlayan anahtarda ilk satırın etiketi geçerlidir.
+    """
+    keys, labels = list(keys), list(labels)
+    return dict(zip(reversed(keys), reversed(labels)))
+
+def report_drive_upload_error(exc, context_desc="Dosya", parent_ids=()):
+    """Drive yükleme hatasını kullanıcıya göster (yalnızca ana script thread'inden çağrılır)."""
+    if isinstance(exc, ApiRequestError):
+        error_text = str(exc)
+        if exc.error.get("code") == 404:
+            # Hedef klasör silinmiş/çöpte olabilir: önbellekteki kaydı bir sonraki denemede yenile
+            for parent_id in parent_ids:
+                forget_drive_folder(parent_id)
+        if "Service Accounts do not have storage quota" in error_text:
+            st.error(
+                "Google servis hesabının kişisel Drive alanı yok. "
+                "Lütfen drive klasörünü paylaşımlı sürücüye taşıyın ya da "
+                "'google_drive_delegated_user'/'GOOGLE_DRIVE_DELEGATED_USER' ile yetki devri yapın."
+            )
+        st.error(f"{context_desc} Google Drive'a yüklenirken API hatası oluştu: {exc}")
+    else:
+        st.error(f"{context_desc} Google Drive'a yüklenirken beklenmeyen bir hata oluştu: {exc}")
+
+# =========================================================
+# ================ GOOGLE DRIVE BAĞLANTISI ================
+# =========================================================
+GOOGLE_DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive"]
+
+def _maybe_apply_delegation(credentials):
+    """Apply optional domain-wide delegation if configured."""
+    delegated_user = ""
+    try:
+        delegated_user = st.secrets.get("google_drive_delegated_user", "")
+    except Exception:
+        # st.secrets erişimi başarısız olabilir (örn. yerel geliştirme); yok say.
+        delegated_user = ""
+    if not delegated_user:
+        delegated_user = os.environ.get("GOOGLE_DRIVE_DELEGATED_USER", "")
+
+    if delegated_user:
+        try:
+            credentials = credentials.create_delegated(delegated_user)
+        except Exception as exc:
+            st.error(
+                "Google Drive servis hesabı için yetki devri başarısız oldu. "
+                "Servis hesabına alan-adı genel yetkisi tanımlı mı kontrol edin. "
+                f"Hedef kullanıcı: {delegated_user}. Hata: {exc}"
+            )
+            raise
+    return credentials
+
+
+def _load_service_account_credentials(scopes=None):
+    # 1) Streamlit secrets (tercih edilen)
+    try:
+        if "google_drive_service_account" in st.secrets:
+            key_dict = dict(st.secrets["google_drive_service_account"])
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(key_dict, scopes or GOOGLE_DRIVE_SCOPES)
+            return _maybe_apply_delegation(creds)
+    except Exception as exc:
+        st.warning(f"Servis hesabı (secrets) okunamadı: {exc}")
+
+    # 2) Ortam değişkeni JSON (opsiyonel)
+    service_account_json = os.environ.get("GOOGLE_DRIVE_SERVICE_ACCOUNT_JSON")
+    if service_account_json:
+        try:
+            key_data = json.loads(service_account_json)
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(key_data, scopes or GOOGLE_DRIVE_SCOPES)
+            return _maybe_apply_delegation(creds)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("GOOGLE_DRIVE_SERVICE_ACCOUNT_JSON geçersiz JSON.") from exc
+
+    # 3) Dosya yolu (opsiyonel)
+    service_account_file = os.environ.get("GOOGLE_DRIVE_SERVICE_ACCOUNT_FILE") or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if service_account_file and os.path.exists(service_account_file):
+        creds = ServiceAccountCredentials.from_json_keyfile_name(service_account_file, scopes or GOOGLE_DRIVE_SCOPES)
+        return _maybe_apply_delegation(creds)
+
+    return None
+
+@st.cache_resource
+def get_drive():
+    gauth = GoogleAuth()
+    service_credentials = _load_service_account_credentials()
+    if service_credentials:
+        gauth.credentials = service_credentials
+        # Drive servisini hemen kur: yüklemeler servisi doğrudan kullanıyor
+        gauth.Authorize()
+        return GoogleDrive(gauth)
+
+    # Ancak yerelde OAuth kullanmak isterseniz (client_secrets.json gerekir)
+    try:
+        gauth.LocalWebserverAuth()
+    except InvalidConfigError as exc:
+        st.error(
+            "Google Drive yetkilendirmesi yapılandırılmadı. "
+            "Lütfen servis hesabını secrets’a ekleyin (önerilen) ya da client_secrets.json sağlayın."
+        )
+        raise RuntimeError("Missing Google Drive OAuth configuration") from exc
+
+    return GoogleDrive(gauth)
+
+drive = get_drive()
+
+
+def drive_safe_name(text, maxlen=120):
+    """Google Drive için güvenli bir ad döndür."""
+    s = str(text or "").strip()
+    if not s:
+        return ""
+    s = re.sub(r"\s+", " ", s)
+    s = s.replace(" ", "_")
+    s = re.sub(r"[\\/*?:\"<>|]+", "_", s)
+    return s[:maxlen]
+
+
+# ---------------- Drive klasör ID önbelleği ----------------
+# (parent_id, ad) -> klasör ID eşlemesi yeniden başlatmalar arasında SQLite dosyasında tutulur.
+# Önbellekteki klasör DRIVE_FOLDER_VERIFY_TTL dolana kadar Drive'a sorulmadan kullanılır;
+# süre dolunca tek bir metadata isteğiyle çöpe atılıp atılmadığı kontrol edilir.
+DRIVE_CACHE_PATH = st.secrets.get("drive_cache_path", "drive_cache.db")
+DRIVE_FOLDER_VERIFY_TTL = float(st.secrets.get("drive_folder_verify_ttl_seconds", 24 * 3600))
+# Klasör listeleri bu süre içinde Drive'a hiç sorulmaz; sonrasında yalnızca değişenler çekilir.
+# Silinen dosyaları yakalamak için liste DRIVE_FOLDER_VERIFY_TTL'de bir baştan alınır.
+DRIVE_LISTING_REFRESH = float(st.secrets.get("drive_listing_refresh_seconds", 60))
+
+@st.cache_resource
+def _drive_cache_db():
+    conn = sqlite3.connect(DRIVE_CACHE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS drive_folders ("
+        "parent_id TEXT NOT NULL, name TEXT NOT NULL, folder_id TEXT NOT NULL, verified_at REAL, "
+        "PRIMARY KEY (parent_id, name))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_drive_folders_folder ON drive_folders (folder_id)")
+    # İçerik özeti (MD5) indeksi: aynı klasöre aynı içerik ikinci kez yüklenmesin
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS drive_files ("
+        "parent_id TEXT NOT NULL, md5 TEXT NOT NULL, file_id TEXT NOT NULL, verified_at REAL, "
+        "PRIMARY KEY (parent_id, md5))"
+    )
+    # Klasör listesi önbelleği: modifiedDate filigranıyla artımlı tazelenir
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS drive_listing ("
+        "parent_id TEXT NOT NULL, file_id TEXT NOT NULL, title TEXT, md5 TEXT, modified TEXT, "
+        "PRIMARY KEY (parent_id, file_id))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS drive_listing_state ("
+        "parent_id TEXT PRIMARY KEY, watermark TEXT, full_at REAL, delta_at REAL)"
+    )
+    return {"conn": conn, "lock": threading.Lock()}
+
+def _cached_drive_folder(parent_id: str, name: str):
+    """Önbellekteki (klasör ID, son doğrulama zamanı) ya da None."""
+    db = _drive_cache_db()
+    with db["lock"]:
+        return db["conn"].execute(
+            "SELECT folder_id, verified_at FROM drive_folders WHERE parent_id = ? AND name = ?",
+            (parent_id, name),
+        ).fetchone()
+
+def _remember_drive_folder(parent_id: str, name: str, folder_id: str):
+    db = _drive_cache_db()
+    with db["lock"]:
+        db["conn"].execute(
+            "INSERT OR REPLACE INTO drive_folders (parent_id, name, folder_id, verified_at) VALUES (?, ?, ?, ?)",
+            (parent_id, name, folder_id, time.time()),
+        )
+
+def forget_drive_folder(folder_id: str):
+    """Çöpe atılan/silinen klasörü ve doğrudan alt klasör kayıtlarını önbellekten düşür."""
+    if not folder_id:
+        return
+    db = _drive_cache_db()
+    with db["lock"]:
+        db["conn"].execute(
+            "DELETE FROM drive_folders WHERE folder_id = ? OR parent_id = ?", (folder_id, folder_id)
+        )
+        db["conn"].execute("DELETE FROM drive_files WHERE parent_id = ?", (folder_id,))
+        db["conn"].execute("DELETE FROM drive_listing WHERE parent_id = ?", (folder_id,))
+        db["conn"].execute("DELETE FROM drive_listing_state WHERE parent_id = ?", (folder_id,))
+
+def _drive_item_alive(item_id: str):
+    """Klasör/dosya hâlâ kullanılabilir mi? True/False; ağ hatasında karar verilemez: None."""
+    try:
+        gfile = drive.CreateFile({"id": item_id})
+        gfile.FetchMetadata(fields="id,labels")
+    except ApiRequestError:
+        return False
+    except Exception:
+        return None
+    return not (gfile.get("labels") or {}).get("trashed", False)
+
+def content_md5(content) -> str:
+    """bytes ya da dosya benzeri nesnenin (ör. UploadedFile) MD5 özeti; Drive'ın md5Checksum'ı ile aynı biçim."""
+    if not isinstance(content, (bytes, bytearray)):
+        content = content.getvalue()
+    return hashlib.md5(content).hexdigest()
+
+def _store_listing(conn, parent_id: str, files, full: bool):
+    """Listeleme sonucunu klasör listesine ve içerik indeksine işle (kilit altında çağrılır)."""
+    now = time.time()
+    if full:
+        conn.execute("DELETE FROM drive_listing WHERE parent_id = ?", (parent_id,))
+        conn.execute("DELETE FROM drive_files WHERE parent_id = ?", (parent_id,))
+    for f in files:
+        if (f.get("labels") or {}).get("trashed", False):
+            conn.execute("DELETE FROM drive_listing WHERE parent_id = ? AND file_id = ?", (parent_id, f["id"]))
+            conn.execute("DELETE FROM drive_files WHERE parent_id = ? AND file_id = ?", (parent_id, f["id"]))
+            continue
+        conn.execute(
+            "INSERT OR REPLACE INTO drive_listing (parent_id, file_id, title, md5, modified) VALUES (?, ?, ?, ?, ?)",
+            (parent_id, f["id"], f.get("title", ""), f.get("md5Checksum"), f.get("modifiedDate", "")),
+        )
+        if f.get("md5Checksum"):
+            conn.execute(
+                "INSERT OR REPLACE INTO drive_files (parent_id, md5, file_id, verified_at) VALUES (?, ?, ?, ?)",
+                (parent_id, f["md5Checksum"], f["id"], now),
+            )
+
+def list_drive_folder(parent_id: str):
+    """Klasördeki dosyalar, en son değişen önce: [{"id", "title", "md5Checksum", "modifiedDate"}].
+
+    Liste önbellekten gelir; DRIVE_LISTING_REFRESH dolduysa yalnızca filigrandan sonra değişen
+    dosyalar sorulur. Drive'a ulaşılamazsa önbellekteki liste döner, hiç liste yoksa hata fırlatır.
+    """
+    db = _drive_cache_db()
+    now = time.time()
+    with db["lock"]:
+        state = db["conn"].execute(
+            "SELECT watermark, full_at, delta_at FROM drive_listing_state WHERE parent_id = ?", (parent_id,)
+        ).fetchone()
+    watermark, full_at, delta_at = state or ("", 0.0, 0.0)
+    full = not state or now - (full_at or 0) >= DRIVE_FOLDER_VERIFY_TTL
+    if full or now - (delta_at or 0) >= DRIVE_LISTING_REFRESH:
+        full = full or not watermark  # boş klasörde filigran yok: baştan listele
+        safe_parent = parent_id.replace("'", "\\'")
+        q = f"'{safe_parent}' in parents"
+        # Artımlı sorguda çöpe atılanlar da gelsin ki listeden düşürülebilsin
+        q += " and trashed = false" if full else f" and modifiedDate > '{watermark}'"
+        try:
+            files = drive.ListFile({
+                'q': q,
+                'supportsAllDrives': True,
+                'includeItemsFromAllDrives': True,
+            }).GetList()
+        except Exception:
+            if not state:
+                raise
+            files = None
+        if files is not None:
+            # Filigran yalnızca Drive'dan okunan tarihlerle ilerler; kendi yüklemelerimiz onu atlatmasın
+            watermark = max([watermark or ""] + [f.get("modifiedDate") or "" for f in files])
+            with db["lock"]:
+                _store_listing(db["conn"], parent_id, files, full)
+                db["conn"].execute(
+                    "INSERT OR REPLACE INTO drive_listing_state (parent_id, watermark, full_at, delta_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (parent_id, watermark, now if full else full_at, now),
+                )
+    with db["lock"]:
+        rows = db["conn"].execute(
+            "SELECT file_id, title, md5, modified FROM drive_listing WHERE parent_id = ? ORDER BY modified DESC",
+            (parent_id,),
+        ).fetchall()
+    return [{"id": i, "title": t, "md5Checksum": m, "modifiedDate": d} for i, t, m, d in rows]
+
+def remember_uploaded_drive_file(parent_id: str, gfile):
+    """Kendi yüklediğimiz dosyayı Drive'ı yeniden listelemeden klasör listesine ve indekse ekle."""
+    db = _drive_cache_db()
+    with db["lock"]:
+        _store_listing(db["conn"], parent_id, [gfile], full=False)
+
+def _remember_drive_file(parent_id: str, md5: str, file_id: str):
+    db = _drive_cache_db()
+    with db["lock"]:
+        db["conn"].execute(
+            "INSERT OR REPLACE INTO drive_files (parent_id, md5, file_id, verified_at) VALUES (?, ?, ?, ?)",
+            (parent_id, md5, file_id, time.time()),
+        )
+
+def find_drive_duplicate(parent_id: str, md5: str):
+    """Klasörde aynı içerikte dosya varsa ID'sini döndür, yoksa None.
+
+    İndeks klasör listesi önbelleğiyle (list_drive_folder) birlikte tazelenir;
+    eski indeks kayıtları kullanılmadan önce tek metadata isteğiyle doğrulanır.
+    """
+    if not parent_id or not md5:
+        return None
+    try:
+        list_drive_folder(parent_id)  # indeksi klasör listesiyle birlikte tazeler
+    except Exception:
+        pass  # listelenemedi: yalnızca mevcut indeksle karar ver
+    db = _drive_cache_db()
+    with db["lock"]:
+        row = db["conn"].execute(
+            "SELECT file_id, verified_at FROM drive_files WHERE parent_id = ? AND md5 = ?", (parent_id, md5)
+        ).fetchone()
+    if not row:
+        return None
+    file_id, verified_at = row
+    if time.time() - (verified_at or 0) < DRIVE_FOLDER_VERIFY_TTL:
+        return file_id
+    alive = _drive_item_alive(file_id)
+    if alive is False:
+        with db["lock"]:
+            db["conn"].execute("DELETE FROM drive_files WHERE file_id = ?", (file_id,))
+        return None
+    if alive:
+        _remember_drive_file(parent_id, md5, file_id)
+    return file_id
+
+def drive_get_or_create_folder_by_name(name: str, parent_id: str) -> str:
+    """Parent altında adı verilen klasörü döndür; yoksa oluştur.
+
+    Daha önce görülen klasörler kalıcı önbellekten Drive çağrısı yapmadan döner.
+    """
+    if not name or not parent_id:
+        return ""
+
+    cached = _cached_drive_folder(parent_id, name)
+    if cached:
+        folder_id, verified_at = cached
+        if time.time() - (verified_at or 0) < DRIVE_FOLDER_VERIFY_TTL:
+            return folder_id
+        alive = _drive_item_alive(folder_id)
+        if alive is None:
+            return folder_id
+        if alive:
+            _remember_drive_folder(parent_id, name, folder_id)
+            return folder_id
+        forget_drive_folder(folder_id)
+
+    safe_query_name = name.replace("'", "\\'")
+    q = (
+        f"title = '{safe_query_name}' and mimeType = 'application/vnd.google-apps.folder' "
+        f"and '{parent_id}' in parents and trashed = false"
+    )
+    try:
+        lst = drive.ListFile({
+            'q': q,
+            'supportsAllDrives': True,
+            'includeItemsFromAllDrives': True,
+        }).GetList()
+        if lst:
+            _remember_drive_folder(parent_id, name, lst[0]['id'])
+            return lst[0]['id']
+
+        meta = {
+            'title': name,
+            'mimeType': 'application/vnd.google-apps.folder',
+            'parents': [{'id': parent_id}],
+        }
+        folder = drive.CreateFile(meta)
+        folder.Upload(param={'supportsAllDrives': True})
+        _remember_drive_folder(parent_id, name, folder['id'])
+        return folder['id']
+    except Exception as exc:
+        st.error(f"Klasör oluşturma/arama hatası: {exc}")
+        return ""
+
+
+# ---------------- Bellekten Drive'a yükleme ----------------
+# Yüklenen dosyalar diske yazılmadan bellekteki tampondan Drive'a gönderilir.
+# Medya gövdesi parçalı (resumable) yüklenir; büyük dosyalar DRIVE_UPLOAD_CHUNK_SIZE'lık parçalarla gider.
+DRIVE_UPLOAD_CHUNK_SIZE = max(1, int(st.secrets.get("drive_upload_chunk_mb", 8))) * 1024 * 1024
+
+def drive_file_view_link(file_id: str) -> str:
+    return f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
+
+def _drive_http():
+    """Bu thread'e ait yetkili HTTP nesnesi (httplib2 thread güvenli değil)."""
+    auth = drive.auth
+    if not getattr(auth.thread_local, "http", None):
+        auth.thread_local.http = auth.Get_Http_Object()
+    return auth.thread_local.http
+
+def drive_upload_content(content, metadata: dict, file_id: str | None = None):
+    """İçeriği bytes ya da dosya benzeri nesneden (ör. UploadedFile) Drive'a yükle.
+
+    file_id verilirse mevcut dosyanın içeriği güncellenir, yoksa metadata ile yeni dosya
+    oluşturulur. Yüklenen dosyanın nesnesi döner; API hataları ApiRequestError olarak fırlar.
+    """
+    stream = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    stream.seek(0)
+    body = dict(metadata)
+    body.setdefault(
+        "mimeType",
+        getattr(content, "type", None)
+        or mimetypes.guess_type(body.get("title") or "")[0]
+        or "application/octet-stream",
+    )
+    media = MediaIoBaseUpload(stream, body["mimeType"], chunksize=DRIVE_UPLOAD_CHUNK_SIZE, resumable=True)
+    files = drive.auth.service.files()
+    if file_id:
+        request = files.update(fileId=file_id, body=body, media_body=media, supportsAllDrives=True)
+    else:
+        request = files.insert(body=body, media_body=media, supportsAllDrives=True)
+    try:
+        uploaded = request.execute(http=_drive_http())
+    except HttpError as exc:
+        raise ApiRequestError(exc) from exc
+    return drive.CreateFile(uploaded)
+
+def upload_or_reuse_drive_file(parent_id: str, filename: str, content, context_desc="Dosya"):
+    """İçeriği parent klasörüne yükle; (link, aynı_içerikli_dosya_id) döndür.
+
+    Klasörde aynı içerikte (MD5) dosya varsa yükleme yapılmaz: mevcut dosyanın linki ve
+    ID'si döner. Yeni yüklemede ikinci değer None, hata olursa ("", None) döner.
+    """
+    existing = find_drive_duplicate(parent_id, content_md5(content))
+    if existing:
+        return drive_file_view_link(existing), existing
+    try:
+        gfile = drive_upload_content(content, {"title": filename, "parents": [{"id": parent_id}]})
+    except Exception as exc:
+        report_drive_upload_error(exc, context_desc, [parent_id])
+        return "", None
+    remember_uploaded_drive_file(parent_id, gfile)
+    return drive_file_view_link(gfile["id"]), None
+
+def upload_to_drive_folder(parent_id: str, filename: str, content, context_desc="Dosya") -> str:
+    """İçeriği parent klasörüne yükle; paylaşım linkini, hata olursa "" döndür.
+
+    Klasörde aynı içerikte (MD5) dosya varsa yükleme yapılmaz, mevcut dosyanın linki döner.
+    """
+    return upload_or_reuse_drive_file(parent_id, filename, content, context_desc)[0]
+
+
+# ---------------- Paralel Drive yükleme ----------------
+# Birden çok belge sınırlı bir thread havuzuyla aynı anda yüklenir. Worker'lar st.* çağırmaz,
+# hata durumunda istisna fırlatır; ilerleme ve hata mesajları ana thread'de gösterilir.
+# Her thread kendi HTTP nesnesini kullandığından (_drive_http) ortak `drive` güvenle paylaşılır.
+DRIVE_PARALLEL_UPLOADS = max(1, int(st.secrets.get("drive_parallel_uploads", 4)))
+
+def _upload_document(parent_id: str, filename: str, data: bytes) -> str:
+    """Tek bir belgeyi yükleyip Drive dosya nesnesini döndür (worker thread'de çalışır)."""
+    return drive_upload_content(data, {"title": filename, "parents": [{"id": parent_id}]})
+
+def upload_documents_parallel(jobs, label="Belgeler yükleniyor"):
+    """jobs: [(anahtar, parent_id, dosya_adı, bytes), ...] -> {anahtar: link}.
+
+    Başarısız dosyalar sonuçta yer almaz; hataları dosya bazında ekrana yazılır.
+    """
+    if not jobs:
+        return {}
+    links = {}
+    toplam = len(jobs)
+    bar = st.progress(0.0, text=f"{label} (0/{toplam})")
+    # Aynı içerik klasörde zaten varsa yüklenmez (indeks erişimi ana thread'de kalır)
+    bekleyen = []
+    for key, parent_id, filename, data in jobs:
+        md5 = content_md5(data)
+        existing = find_drive_duplicate(parent_id, md5)
+        if existing:
+            links[key] = drive_file_view_link(existing)
+        else:
+            bekleyen.append((key, parent_id, filename, data))
+    biten = len(links)
+    bar.progress(biten / toplam, text=f"{label} ({biten}/{toplam})")
+    if bekleyen:
+        with ThreadPoolExecutor(max_workers=min(DRIVE_PARALLEL_UPLOADS, len(bekleyen))) as pool:
+            futures = {
+                pool.submit(_upload_document, parent_id, filename, data): (key, parent_id, filename)
+                for key, parent_id, filename, data in bekleyen
+            }
+            for fut in as_completed(futures):
+                key, parent_id, filename = futures[fut]
+                try:
+                    gfile = fut.result()
+                    remember_uploaded_drive_file(parent_id, gfile)
+                    links[key] = drive_file_view_link(gfile["id"])
+                except Exception as exc:
+                    report_drive_upload_error(exc, filename, [parent_id])
+                biten += 1
+                bar.progress(biten / toplam, text=f"{label} ({biten}/{toplam})")
+    bar.empty()
+    return links
+
+
+# ---------------- İçerik Arşivi kataloğu ----------------
+# Arşiv klasör ağaçları arka plandaki bir thread tarafından yerel SQLite kataloğuna taranır;
+# sayfa listeleme ve aramayı Drive'a gitmeden bu katalogdan yapar. İlk taramadan sonra
+# ARCHIVE_REFRESH aralıklarla yalnızca filigrandan sonra değişen dosyalar sorulur,
+# silinen/taşınanları yakalamak için ağaç DRIVE_FOLDER_VERIFY_TTL'de bir baştan taranır.
+DRIVE_FOLDER_IDS = {
+    "Genel Medya Klasörü": "1gFAaK-6v1e3346e-W0TsizOqSq43vHLY",
+    "Ürün Görselleri":      "18NNlmadm5NNFkI1Amzt_YMwB53j6AmbD",
+    "Kalite Evrakları":     "1pbArzYfA4Tp50zvdyTzSPF2ThrMWrGJc",
+}
+ARCHIVE_REFRESH = float(st.secrets.get("archive_refresh_seconds", 15 * 60))
+DRIVE_FOLDER_MIME = "application/vnd.google-apps.folder"
+
+def _archive_list(q: str):
+    return drive.ListFile({
+        'q': q,
+        'maxResults': 1000,
+        'supportsAllDrives': True,
+        'includeItemsFromAllDrives': True,
+    }).GetList()
+
+def _archive_row(root_id: str, parent_id: str, path: str, f: dict):
+    is_folder = f.get("mimeType") == DRIVE_FOLDER_MIME
+    link = f.get("alternateLink") or (
+        f"https://drive.google.com/drive/folders/{f['id']}" if is_folder else drive_file_view_link(f["id"])
+    )
+    size = f.get("fileSize")
+    return (
+        root_id, f["id"], parent_id, f.get("title", ""), path, f.get("mimeType", ""),
+        int(size) if size else None, f.get("modifiedDate", ""), link, int(is_folder),
+    )
+
+def _crawl_archive(conn_lock, root_id: str, watermark: str, full: bool) -> str:
+    """Kök altındaki ağacı tara ve kataloğa yaz; yeni filigranı döndürür (worker thread'de çalışır)."""
+    conn, lock = conn_lock
+    if full:
+        # Ağacı baştan tara, sonra kök kaydını tek seferde değiştir
+        stack, rows = [(root_id, "")], []
+    else:
+        with lock:
+            known = conn.execute(
+                "SELECT file_id, CASE WHEN path = '' THEN name ELSE path || '/' || name END "
+                "FROM archive_catalog WHERE root = ? AND is_folder = 1",
+                (root_id,),
+            ).fetchall()
+        stack, rows = [], []
+        known_ids = {fid for fid, _ in known}
+        since = watermark  # tarama boyunca sabit: filigran yalnızca sonda ilerler
+        for fid, path in [(root_id, "")] + known:
+            for f in _archive_list(f"'{fid}' in parents and modifiedDate > '{since}'"):
+                if (f.get("labels") or {}).get("trashed", False):
+                    if f.get("mimeType") == DRIVE_FOLDER_MIME:
+                        # Çöpe atılan klasörün alt ağacı artımlı izlenemez: baştan tara
+                        return _crawl_archive(conn_lock, root_id, since, True)
+                    with lock:
+                        conn.execute("DELETE FROM archive_catalog WHERE root = ? AND file_id = ?", (root_id, f["id"]))
+                    continue
+                rows.append(_archive_row(root_id, fid, path, f))
+                watermark = max(watermark, f.get("modifiedDate") or "")
+                if f.get("mimeType") == DRIVE_FOLDER_MIME and f["id"] not in known_ids:
+                    stack.append((f["id"], f"{path}/{f.get('title', '')}".lstrip("/")))
+    # Yeni (ya da tam taramada tüm) klasörlerin içeriği filtresiz listelenir
+    while stack:
+        fid, path = stack.pop()
+        for f in _archive_list(f"'{fid}' in parents and trashed = false"):
+            rows.append(_archive_row(root_id, fid, path, f))
+            watermark = max(watermark, f.get("modifiedDate") or "")
+            if f.get("mimeType") == DRIVE_FOLDER_MIME:
+                stack.append((f["id"], f"{path}/{f.get('title', '')}".lstrip("/")))
+    with lock:
+        conn.execute("BEGIN")
+        try:
+            if full:
+                conn.execute("DELETE FROM archive_catalog WHERE root = ?", (root_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO archive_catalog "
+                "(root, file_id, parent_id, name, path, mime, size, modified, link, is_folder) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return watermark
+
+def _archive_worker(ix: dict):
+    """Arşiv köklerini sırayla tazeler; zamanı gelmemişse bekler ya da elle tetiklenmeyi bekler."""
+    conn, lock, cond = ix["db"]["conn"], ix["db"]["lock"], ix["cond"]
+    while True:
+        with cond:
+            forced, ix["forced"] = ix["forced"], None
+        now = time.time()
+        next_due = now + ARCHIVE_REFRESH
+        for root_id in ix["roots"]:
+            with lock:
+                state = conn.execute(
+                    "SELECT watermark, full_at, delta_at FROM archive_state WHERE root = ?", (root_id,)
+                ).fetchone()
+            watermark, full_at, delta_at = state or ("", 0.0, 0.0)
+            full = not state or not watermark or now - (full_at or 0) >= DRIVE_FOLDER_VERIFY_TTL or forced == "full"
+            if not (full or forced or now - (delta_at or 0) >= ARCHIVE_REFRESH):
+                next_due = min(next_due, (delta_at or 0) + ARCHIVE_REFRESH)
+                continue
+            with cond:
+                ix["status"][root_id] = ("crawling", None)
+            try:
+                watermark = _crawl_archive((conn, lock), root_id, watermark or "", full)
+            except Exception as exc:
+                with cond:
+                    ix["status"][root_id] = ("error", f"{type(exc).__name__}: {exc}")
+                continue
+            with lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO archive_state (root, watermark, full_at, delta_at) VALUES (?, ?, ?, ?)",
+                    (root_id, watermark, now if full else full_at, now),
+                )
+            with cond:
+                ix["status"][root_id] = ("ready", None)
+                ix["version"] += 1
+        with cond:
+            if ix["forced"] is None:
+                cond.wait(max(1.0, next_due - time.time()))
+
+@st.cache_resource
+def _archive_index():
+    db = _drive_cache_db()
+    with db["lock"]:
+        db["conn"].execute(
+            "CREATE TABLE IF NOT EXISTS archive_catalog ("
+            "root TEXT NOT NULL, file_id TEXT NOT NULL, parent_id TEXT, name TEXT, path TEXT, mime TEXT, "
+            "size INTEGER, modified TEXT, link TEXT, is_folder INTEGER, PRIMARY KEY (root, file_id))"
+        )
+        db["conn"].execute(
+            "CREATE TABLE IF NOT EXISTS archive_state (root TEXT PRIMARY KEY, watermark TEXT, full_at REAL, delta_at REAL)"
+        )
+    ix = {
+        "db": db,
+        "roots": list(DRIVE_FOLDER_IDS.values()),
+        "cond": threading.Condition(),
+        "forced": None,          # None | "delta" | "full"
+        "status": {},            # kök -> (durum, hata)
+        "version": 0,            # katalog her değiştiğinde artar
+        "frames": {},            # kök -> (version, DataFrame)
+    }
+    threading.Thread(target=_archive_worker, args=(ix,), name="archive-indexer", daemon=True).start()
+    return ix
+
+def request_archive_refresh(full: bool = False):
+    """Arka plandaki tarayıcıyı hemen çalıştır."""
+    ix = _archive_index()
+    with ix["cond"]:
+        ix["forced"] = "full" if full or ix["forced"] == "full" else "delta"
+        ix["cond"].notify_all()
+
+def archive_status(root_id: str):
+    """(durum, hata, son tarama zamanı | None)."""
+    ix = _archive_index()
+    with ix["cond"]:
+        status, error = ix["status"].get(root_id, ("waiting", None))
+    with ix["db"]["lock"]:
+        row = ix["db"]["conn"].execute("SELECT delta_at FROM archive_state WHERE root = ?", (root_id,)).fetchone()
+    last = datetime.datetime.fromtimestamp(row[0]) if row and row[0] else None
+    return status, error, last
+
+def archive_catalog(root_id: str) -> pd.DataFrame:
+    """Kökün kataloğu (klasör yolu + ada göre sıralı); katalog değişmedikçe aynı DataFrame döner."""
+    ix = _archive_index()
+    with ix["cond"]:
+        version = ix["version"]
+        cached = ix["frames"].get(root_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    with ix["db"]["lock"]:
+        df = pd.read_sql_query(
+            "SELECT name AS 'Ad', path AS 'Klasör', mime AS 'Tür', size AS 'Boyut (KB)', "
+            "modified AS 'Değiştirilme', link AS 'Link', is_folder FROM archive_catalog "
+            "WHERE root = ? ORDER BY path, is_folder DESC, name",
+            ix["db"]["conn"], params=(root_id,),
+        )
+    df["Boyut (KB)"] = (pd.to_numeric(df["Boyut (KB)"], errors="coerce") / 1024).round(1)
+    df["Değiştirilme"] = pd.to_datetime(df["Değiştirilme"], errors="coerce", utc=True).dt.tz_localize(None)
+    df["Tür"] = np.where(df["is_folder"] == 1, "Klasör", df["Tür"].str.rsplit("/", n=1).str[-1])
+    # Arama için Python ile küçük harfe çevrilmiş ad/yol (Türkçe İ/ı tutarlı kalsın)
+    df["_ad"] = pd.Series([str(v).lower() for v in df["Ad"]], index=df.index, dtype=str)
+    df["_arama"] = pd.Series(
+        [f"{a}\n{k}".lower() for a, k in zip(df["Ad"], df["Klasör"])], index=df.index, dtype=str
+    )
+    with ix["cond"]:
+        ix["frames"][root_id] = (version, df)
+    return df
+
+
+def ensure_proforma_folder(base_folder_id: str, proforma_no: str, tarih_value) -> str:
+    """Proforma numarası ve tarihini kullanarak klasörü hazırla."""
+    if not base_folder_id:
+        return ""
+
+    tarih_str = ""
+    if isinstance(tarih_value, datetime.datetime):
+        tarih_str = tarih_value.strftime("%Y-%m-%d")
+    elif isinstance(tarih_value, datetime.date):
+        tarih_str = tarih_value.strftime("%Y-%m-%d")
+    elif tarih_value:
+        try:
+            parsed = pd.to_datetime(tarih_value, errors="coerce")
+        except Exception:
+            parsed = pd.NaT
+        if pd.notna(parsed):
+            tarih_str = parsed.strftime("%Y-%m-%d")
+
+    if not tarih_str:
+        tarih_str = datetime.date.today().strftime("%Y-%m-%d")
+
+    proforma_part = drive_safe_name(proforma_no)
+    date_part = drive_safe_name(tarih_str)
+
+    if proforma_part and date_part:
+        folder_name = drive_safe_name(f"{proforma_part}_{date_part}")
+    elif proforma_part:
+        folder_name = proforma_part
+    else:
+        folder_name = date_part or drive_safe_name(datetime.date.today().strftime("%Y-%m-%d"))
+
+    return drive_get_or_create_folder_by_name(folder_name, base_folder_id)
+
+# =========================================================
+# ================ EXCEL YÜKLE / SAKLA ====================
+# =========================================================
+WORKBOOK_META_FIELDS = "id,title,mimeType,modifiedDate,md5Checksum"
+
+@st.cache_resource
+def _workbook_cache():
+    """Yeniden çalıştırmalar ve oturumlar arasında paylaşılan çalışma kitabı durumu."""
+    return {
+        "lock": threading.Lock(),
+        "parse_lock": threading.Lock(),  # aynı revizyon birden çok oturumda paralel parse/göç edilmesin
+        "failed": {},  # tablo -> hata; mevcut revizyonda okunamayan sayfalar
+        "file": None,
+        "revision": None,
+        "checked_at": 0.0,
+    }
+
+def _drive_revision(gfile):
+    """Drive dosyasının içerik revizyonu: (md5Checksum, modifiedDate)."""
+    return (
+        gfile.get("md5Checksum") or "",
+        gfile.get("modifiedDate") or gfile.get("modifiedTime") or "",
+    )
+
+def _remember_workbook_revision(gfile, cache: dict = None):
+    """Kendi yüklememiz/indirmemiz sonrası revizyonu kaydet; aynı dosya tekrar indirilmesin."""
+    cache = cache or _workbook_cache()
+    with cache["lock"]:
+        cache["revision"] = _drive_revision(gfile)
+        cache["checked_at"] = time.monotonic()
+
+def workbook_file():
+    """Drive'daki Excel dosyasının (metadata çekmeden) paylaşılan nesnesi."""
+    cache = _workbook_cache()
+    with cache["lock"]:
+        if cache["file"] is None:
+            # supportsAllDrives True: paylaşımlı sürücülerde güvenli
+            cache["file"] = drive.CreateFile({'id': EXCEL_FILE_ID, 'supportsAllDrives': True})
+        return cache["file"]
+
+def ensure_workbook(force: bool = False):
+    """Excel dosyasını yalnızca Drive'daki revizyon değiştiğinde indir.
+
+    Metadata sorgusu en fazla DRIVE_METADATA_TTL saniyede bir yapılır; aradaki
+    yeniden çalıştırmalar yerel kopyayı Drive'a gitmeden kullanır.
+    """
+    gfile = workbook_file()
+    cache = _workbook_cache()
+    with cache["lock"]:
+        local_ok = os.path.exists(WORKBOOK_PATH)
+        now = time.monotonic()
+        if local_ok and cache["revision"] and (
+            cache.get("upload_pending")
+            or (not force and now - cache["checked_at"] < DRIVE_METADATA_TTL)
+        ):
+            # Yüklenmeyi bekleyen yerel değişiklik varsa Drive'daki eski sürüm indirilmez
+            return gfile, cache["revision"]
+
+        try:
+            gfile.FetchMetadata(fields=WORKBOOK_META_FIELDS)
+        except Exception as exc:
+            if not (local_ok and cache["revision"]):
+                raise
+            # Drive'a ulaşılamıyorsa son bilinen yerel kopyayla devam et
+            st.warning(f"Drive revizyonu kontrol edilemedi, yerel kopya kullanılıyor: {exc}")
+            cache["checked_at"] = now
+            return gfile, cache["revision"]
+
+        revision = _drive_revision(gfile)
+        if force or not local_ok or revision != cache["revision"]:
+            gfile.GetContentFile(WORKBOOK_PATH)
+            cache["revision"] = revision
+        cache["checked_at"] = now
+        return gfile, cache["revision"]
+
+# Tablo değişkeni -> Excel sayfası (müşteri listesi okunurken her zaman ilk sayfadır)
+TABLE_SHEETS = {
+    "df_musteri": "Sayfa1",
+    "df_kayit": "Kayıtlar",
+    "df_teklif": "Teklifler",
+    "df_proforma": "Proformalar",
+    "df_evrak": "Evraklar",
+    "df_eta": "ETA",
+    "df_fuar_musteri": "FuarMusteri",
+}
+
+# Sayfa yoksa / okunamazsa kullanılacak boş tablo kolonları
+TABLE_DEFAULT_COLUMNS = {
+    "df_musteri": [
+        "Müşteri Adı", "Telefon", "E-posta", "Adres", "Ülke", "Satış Temsilcisi", "Kategori", "Durum", "Vade (Gün)", "Ödeme Şekli"
+    ],
+    "df_kayit": ["Müşteri Adı", "Tarih", "Tip", "Açıklama"],
+    "df_teklif": [
+        "Müşteri Adı", "Tarih", "Teklif No", "Tutar", "Ürün/Hizmet", "Açıklama", "Durum", "PDF"
+    ],
+    "df_proforma": [
+        "Müşteri Adı", "Tarih", "Proforma No", "Tutar", "Açıklama", "Durum", "PDF", "Sipariş Formu", "Vade", "Sevk Durumu"
+    ],
+    "df_evrak": [
+        "Müşteri Adı", "Fatura No", "Fatura Tarihi", "Vade Tarihi", "Tutar",
+        "Ödenen Tutar", "Commercial Invoice", "Sağlık Sertifikası", "Packing List",
+        "Konşimento", "İhracat Beyannamesi", "Fatura PDF", "Sipariş Formu",
+        "Yük Resimleri", "EK Belgeler"
+    ],
+    "df_eta": ETA_COLUMNS,
+    "df_fuar_musteri": [
+        "Fuar Adı", "Müşteri Adı", "Ülke", "Telefon", "E-mail", "Açıklamalar", "Tarih"
+    ],
+}
+
+# Eski dosyalarda bulunmayabilen, okuma sırasında eklenen kolonlar
+TABLE_EXTRA_COLUMNS = {
+    "df_proforma": ["Proforma No", "Vade", "Sevk Durumu"],
+    "df_evrak": ["Yük Resimleri", "EK Belgeler"],
+}
+
+FUAR_KOLONLAR = [
+    "Fuar Adı", "Müşteri Adı", "Ülke", "Telefon", "E-mail",
+    "Satış Temsilcisi", "Açıklamalar", "Görüşme Kalitesi", "Tarih"
+]
+
+# Sayfaların beklediği zorunlu kolonlar. Eksikler yükleme sırasında bir kez eklenir
+# (bkz. migrate_schema); sayfa görüntülemeleri şemayı değiştirmez.
+TABLE_SCHEMA = {
+    "df_musteri": [
+        "ID", "Müşteri Adı", "Telefon", "E-posta", "Adres",
+        "Ülke", "Satış Temsilcisi", "Kategori", "Durum",
+        "Vade (Gün)", "Ödeme Şekli", "Para Birimi", "DT Seçimi"
+    ],
+    "df_kayit": ["ID", "Müşteri Adı", "Tarih", "Tip", "Açıklama"],
+    "df_teklif": ["ID", "Müşteri Adı", "Tarih", "Teklif No", "Tutar", "Ürün/Hizmet", "Açıklama", "Durum", "PDF"],
+    "df_proforma": [
+        "ID", "Müşteri Adı", "Tarih", "Proforma No", "Tutar", "Açıklama", "Durum", "PDF",
+        "Vade (gün)", "Sevk Durumu", "Ülke", "Satış Temsilcisi", "Ödeme Şekli",
+        "Termin Tarihi", "Ulaşma Tarihi", "Sipariş Formu", "Sevk Tarihi"
+    ],
+    "df_evrak": [
+        "ID", "Müşteri Adı", "Proforma No", "Fatura No", "Fatura Tarihi", "Tutar", "Ödenen Tutar",
+        "Vade (gün)", "Vade Tarihi", "Ülke", "Satış Temsilcisi", "Ödeme Şekli",
+        "Commercial Invoice", "Sağlık Sertifikası", "Packing List", "Konşimento",
+        "İhracat Beyannamesi", "Fatura PDF", "Sipariş Formu", "Yük Resimleri",
+        "EK Belgeler", "Ödendi", "Tutar_num"
+    ],
+    "df_eta": ETA_COLUMNS,
+    "df_fuar_musteri": FUAR_KOLONLAR,
+}
+
+# Boş metin dışındaki varsayılanlar; çağrılabilir ise tablo üzerinden hesaplanır
+TABLE_SCHEMA_DEFAULTS = {
+    "df_evrak": {
+        "Ödendi": False,
+        "Ödenen Tutar": 0.0,
+        "Tutar_num": lambda df: smart_to_num_series(df["Tutar"]) if "Tutar" in df.columns else 0.0,
+    },
+    "df_fuar_musteri": {"Görüşme Kalitesi": np.nan, "Tarih": np.nan},
+}
+
+def migrate_schema(frames: dict) -> dict:
+    """Eksik zorunlu kolonları ekle ve boş ID'leri uuid4 ile doldur (yerinde).
+
+    Değişen tablolar için {tablo: (eklenen kolonlar, ID'si doldurulan etiketler)} döndürür;
+    boş sözlük hiçbir şeyin değişmediği anlamına gelir.
+    """
+    changes = {}
+    for table, columns in TABLE_SCHEMA.items():
+        df = frames.get(table)
+        if df is None:
+            continue
+        defaults = TABLE_SCHEMA_DEFAULTS.get(table, {})
+        added = []
+        for col in columns:
+            if col in df.columns:
+                continue
+            if col == "ID":
+                df[col] = [str(uuid.uuid4()) for _ in range(len(df))]
+            else:
+                default = defaults.get(col, "")
+                df[col] = default(df) if callable(default) else default
+            added.append(col)
+        id_labels = []
+        if "ID" in columns and "ID" not in added:
+            ids = df["ID"]
+            mask = ids.isna() | ids.astype(str).str.strip().isin(["", "nan"])
+            if mask.any():
+                id_labels = list(df.index[mask])
+                df["ID"] = ids.astype(object)
+                df.loc[mask, "ID"] = [str(uuid.uuid4()) for _ in range(int(mask.sum()))]
+        if added or id_labels:
+            changes[table] = (added, id_labels)
+    return changes
+
+def _parse_workbook(path: str, tables=None):
+    """İstenen tabloların (varsayılan: yedisi) sayfalarını tek openpyxl oturumunda oku.
+
+    Dosya salt okunur açılır; istenmeyen sayfaların XML'i hiç ayrıştırılmaz. Kitapta
+    olmayan sayfa boş tabloyla, okunamayan sayfa da boş tabloyla karşılanır ama
+    (tablolar, {okunamayan tablo: hata}) olarak ayrıca bildirilir.
+    """
+    tables = list(TABLE_SHEETS) if tables is None else list(tables)
+    sheets, failed = {}, {}
+    try:
+        with pd.ExcelFile(path) as xls:
+            names = xls.sheet_names
+            for table in tables:
+                sheet = (names[0] if names else None) if table == "df_musteri" else TABLE_SHEETS[table]
+                if sheet not in names:
+                    continue
+                try:
+                    sheets[table] = xls.parse(sheet_name=sheet)
+                except Exception as exc:
+                    failed[table] = f"{type(exc).__name__}: {exc}"
+    except Exception as exc:
+        # Kitap hiç açılamadı (yarım indirme, bozuk revizyon): tüm sayfalar okunamadı sayılır
+        failed = {table: f"{type(exc).__name__}: {exc}" for table in tables}
+    frames = {}
+    for table in tables:
+        df = sheets.get(table)
+        if df is None:
+            df = pd.DataFrame(columns=TABLE_DEFAULT_COLUMNS[table])
+        for col in TABLE_EXTRA_COLUMNS.get(table, []):
+            if col not in df.columns:
+                df[col] = ""
+        frames[table] = df
+    return frames, failed
+
+def _local_file_key(path: str):
+    """Yerel kopyanın sürüm anahtarı; yalnızca indirme veya kendi yazımımızla değişir."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _parse_into_cache(path: str, tables, cache: dict):
+    """Sayfaları parse edip önbelleğe ekle. (tablolar, şema göçü değişti mi, okunamayanlar) döndürür.
+
+    Okunamayan sayfalar önbelleğe alınmaz; bir sonraki erişimde tekrar okunmaya çalışılır.
+    """
+    frames, failed = _parse_workbook(path, tables)
+    # Değişiklik tespiti için referans: diskteki sayfaların içerik parmak izleri
+    baseline = {table: {"fp": frame_fingerprint(df), "xml": None} for table, df in frames.items()}
+    changed = bool(migrate_schema(frames))
+    with cache["lock"]:
+        for table, df in frames.items():
+            if table in failed:
+                cache["failed"][table] = failed[table]
+                continue
+            cache["failed"].pop(table, None)
+            cache["sheets"][table] = baseline[table]
+            cache["frames"][table] = df
+    return frames, changed, failed
+
+def _workbook_frames(path: str, tables=None):
+    """İstenen sayfaları revizyon başına bir kez parse et; sonraki çalıştırmalar önbellekten okur.
+
+    Sayfalar ilk istendiklerinde parse edilir, dokunulmayanlar okunmaz.
+    (tablolar, yerel dosya anahtarı) döndürür; anahtar tabloların revizyonunu temsil eder.
+    """
+    tables = list(TABLE_SHEETS) if tables is None else list(tables)
+    cache = _workbook_cache()
+    with cache["parse_lock"]:
+        key = _local_file_key(path)
+        with cache["lock"]:
+            if cache.get("frames_key") != key:
+                cache["frames"], cache["sheets"], cache["failed"], cache["frames_key"] = {}, {}, {}, key
+            missing = [table for table in tables if table not in cache["frames"]]
+        parsed, changed, failed = _parse_into_cache(path, missing, cache) if missing else ({}, False, {})
+        if changed and not failed:
+            # Şema göçü revizyon başına bir kez yazılır: kitabın tamamı gerekir, ama
+            # yalnızca değişen sayfalar serileşir
+            rest = [table for table in TABLE_SHEETS if table not in cache["frames"]]
+            if rest:
+                failed = _parse_into_cache(path, rest, cache)[2]
+            if not failed:
+                data, _ = build_workbook_bytes(dict(cache["frames"]), cache)
+                if data is not None:
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    enqueue_workbook_upload(data)
+                    key = _local_file_key(path)
+                    with cache["lock"]:
+                        cache["frames_key"] = key
+        if failed:
+            # Okunamayan sayfa boş tabloyla gösterilir; bu revizyon üzerine hiçbir şey yazılmaz
+            st.error(
+                "Çalışma kitabındaki bazı sayfalar okunamadı; kayıt ve şema göçü bu sürüm için "
+                "durduruldu, Drive'daki dosyaya dokunulmadı: "
+                + "; ".join(f"{TABLE_SHEETS[t]}: {e}" for t, e in failed.items())
+            )
+        with cache["lock"]:
+            frames = {table: cache["frames"].get(table, parsed.get(table)) for table in tables}
+    return frames, key
+
+def _remember_workbook_frames(path: str = WORKBOOK_PATH):
+    """Kendi yazdığımız tabloları önbelleğe al; aynı dosya tekrar parse edilmesin."""
+    cache = _workbook_cache()
+    frames = {table: table_frame(table).copy(deep=False) for table in TABLE_SHEETS}
+    with cache["lock"]:
+        cache["frames"] = frames
+        cache["frames_key"] = _local_file_key(path)
+
+def load_dataframes_from_excel(path: str = WORKBOOK_PATH, tables=None):
+    tables = list(TABLE_SHEETS) if tables is None else list(tables)
+    if os.path.exists(path):
+        frames, key = _workbook_frames(path, tables)
+    else:
+        frames, key = {table: pd.DataFrame(columns=TABLE_DEFAULT_COLUMNS[table]) for table in tables}, None
+    # Copy-on-write sığ kopyalar: sayfalardaki değişiklikler önbelleği bozmaz
+    state = _run_state()
+    for table, df in frames.items():
+        state["tables"][table] = df.copy(deep=False)
+        state["revisions"][table] = None if key is None else ("excel", key)
+
+def build_workbook_bytes(frames: dict = None, cache: dict = None, force: bool = False):
+    """Yalnızca değişen sayfaları serileştir. (xlsx bytes | None, değişen tablolar) döndürür.
+
+    frames verilmezse global tablolar kullanılır; force ile değişiklik olmasa da paket üretilir.
+    """
+    frames = frames if frames is not None else {table: table_frame(table) for table in TABLE_SHEETS}
+    cache = cache or _workbook_cache()
+    with cache["lock"]:
+        previous = dict(cache.get("sheets") or {})
+    current, dirty = {}, []
+    for table in TABLE_SHEETS:
+        df = frames[table]
+        fp = frame_fingerprint(df)
+        entry = previous.get(table) or {}
+        if fp is None or fp != entry.get("fp"):
+            dirty.append(table)
+            entry = {"fp": fp, "xml": None}
+        if entry.get("xml") is None:
+            entry = {"fp": fp, "xml": sheet_xml(df)}
+        current[table] = entry
+    if not dirty and not force:
+        return None, []
+    data = workbook_zip([(TABLE_SHEETS[t], current[t]["xml"]) for t in TABLE_SHEETS])
+    with cache["lock"]:
+        cache["sheets"] = current
+    return data, dirty
+
+# ---------------- Drive'a arka planda yükleme (write-behind) ----------------
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Bu süre içindeki ardışık kayıtlar tek yüklemede birleştirilir
+DRIVE_UPLOAD_DELAY = float(st.secrets.get("drive_upload_delay_seconds", 2))
+DRIVE_UPLOAD_MAX_BACKOFF = 300
+
+def _upload_workbook_bytes(data: bytes):
+    """Çalışma kitabı içeriğini Drive'daki dosyanın üzerine yükle (worker thread içinden de güvenli)."""
+    return drive_upload_content(data, {"mimeType": XLSX_MIME}, file_id=EXCEL_FILE_ID)
+
+def _upload_worker(q: dict):
+    """Bekleyen en güncel çalışma kitabını yükler; hata olursa artan beklemeyle tekrar dener."""
+    cond = q["cond"]
+    while True:
+        with cond:
+            while q["data"] is None:
+                cond.wait()
+            # Kısa pencere içindeki yeni kayıtları bekle, sonra yalnızca sonuncusunu yükle
+            while True:
+                remaining = q["queued_at"] + DRIVE_UPLOAD_DELAY - time.monotonic()
+                if remaining <= 0:
+                    break
+                cond.wait(remaining)
+            data, seq = q["data"], q["seq"]
+            q["status"] = "uploading"
+        try:
+            gfile = _upload_workbook_bytes(data)
+        except Exception as exc:
+            with cond:
+                q["attempts"] += 1
+                q["status"] = "retrying"
+                q["error"] = str(exc) if isinstance(exc, ApiRequestError) else f"{type(exc).__name__}: {exc}"
+                backoff = min(DRIVE_UPLOAD_MAX_BACKOFF, 2 ** q["attempts"])
+                q["queued_at"] = time.monotonic() + backoff - DRIVE_UPLOAD_DELAY
+            continue
+        _remember_workbook_revision(gfile, q["workbook"])
+        if q.get("on_uploaded"):
+            try:
+                q["on_uploaded"](gfile)
+            except Exception:
+                pass
+        with cond:
+            q["attempts"] = 0
+            q["error"] = None
+            q["last_synced"] = datetime.datetime.now()
+            if q["seq"] == seq:
+                q["data"] = None
+                q["status"] = "synced"
+                _set_upload_pending(False, q["workbook"])
+                cond.notify_all()
+            else:
+                q["status"] = "pending"
+
+def _set_upload_pending(pending: bool, cache: dict = None):
+    cache = cache or _workbook_cache()
+    with cache["lock"]:
+        cache["upload_pending"] = pending
+
+def flush_uploads(timeout: float = None) -> bool:
+    """Bekleyen yükleme bitene kadar bekle. Zaman aşımında False döner."""
+    q = _upload_queue()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with q["cond"]:
+        q["queued_at"] = 0.0  # birleştirme penceresini bekleme
+        q["cond"].notify_all()
+        while q["data"] is not None:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            q["cond"].wait(remaining)
+    return True
+
+def _flush_uploads_at_exit(q: dict):
+    """Süreç kapanırken bekleyen son kaydı doğrudan yükle."""
+    with q["cond"]:
+        data = q["data"]
+    if data is not None:
+        try:
+            _upload_workbook_bytes(data)
+        except Exception:
+            pass
+
+@st.cache_resource
+def _upload_queue():
+    q = {
+        "cond": threading.Condition(),
+        "data": None,
+        "seq": 0,
+        "queued_at": 0.0,
+        "status": "synced",
+        "attempts": 0,
+        "error": None,
+        "last_synced": None,
+        # Worker thread Streamlit bağlamı dışında çalışır; önbelleği doğrudan tutar
+        "workbook": _workbook_cache(),
+    }
+    threading.Thread(target=_upload_worker, args=(q,), name="drive-upload", daemon=True).start()
+    atexit.register(_flush_uploads_at_exit, q)
+    return q
+
+def enqueue_workbook_upload(data: bytes, q: dict = None):
+    """Çalışma kitabını yükleme kuyruğuna koy; önceki bekleyen sürümün yerini alır."""
+    q = q or _upload_queue()
+    _set_upload_pending(True, q["workbook"])
+    with q["cond"]:
+        q["data"] = data
+        q["seq"] += 1
+        if q["status"] != "retrying":
+            q["status"] = "pending"
+            q["queued_at"] = time.monotonic()
+        q["cond"].notify_all()
+
+def render_upload_status(slot):
+    """Kenar çubuğunda Drive yükleme durumunu göster."""
+    q = _upload_queue()
+    with q["cond"]:
+        status, error, attempts, last = q["status"], q["error"], q["attempts"], q["last_synced"]
+    if status == "retrying":
+        slot.warning(f"Drive yüklemesi başarısız ({attempts}. deneme), tekrar denenecek: {error}")
+    elif status in ("pending", "uploading"):
+        slot.caption("⏳ Değişiklikler Drive'a yükleniyor…")
+    else:
+        slot.caption("✅ Drive ile senkron" + (f" · {last:%H:%M:%S}" if last else ""))
+
+def update_excel():
+    """Değişen sayfaları yerel kopyaya yaz ve Drive yüklemesini arka plana bırak.
+
+    SQLite arka ucunda veri zaten satır bazında kaydedilir; burada yalnızca
+    veritabanından Excel dışa aktarımı yapılır.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        export_sqlite_to_workbook()
+        return
+    load_tables()  # eksik sayfalar tek geçişte okunur
+    frames = {table: table_frame(table) for table in TABLE_SHEETS}
+    with _workbook_cache()["lock"]:
+        failed = dict(_workbook_cache().get("failed") or {})
+    if failed:
+        # Okunamayan sayfanın yerinde boş tablo var: yazmak gerçek veriyi silerdi
+        st.error("Kayıt yapılamadı: çalışma kitabında okunamayan sayfalar var ("
+                 + ", ".join(TABLE_SHEETS[t] for t in failed) + "). Lütfen senkronu tekrar deneyin.")
+        return
+    data, dirty = build_workbook_bytes(frames)
+    if data is None:
+        return
+    with open(WORKBOOK_PATH, "wb") as f:
+        f.write(data)
+    _remember_workbook_frames()
+    enqueue_workbook_upload(data)
+
+# =========================================================
+# ================ DEPOLAMA KATMANI =======================
+# =========================================================
+# "excel": tablolar Drive'daki çalışma kitabında (varsayılan)
+# "sqlite": tablolar yerel SQLite veritabanında; Excel periyodik dışa aktarım olarak Drive'a yüklenir
+STORAGE_BACKEND_SETTING = str(st.secrets.get("storage_backend", "excel")).strip().lower()
+# Bilinmeyen değerde "excel" kullanılır; uyarıyı crm.py gösterir
+STORAGE_BACKEND = STORAGE_BACKEND_SETTING if STORAGE_BACKEND_SETTING in ("excel", "sqlite") else "excel"
+SQLITE_PATH = st.secrets.get("sqlite_path", "crm.db")
+EXCEL_EXPORT_INTERVAL = float(st.secrets.get("excel_export_interval_seconds", 60))
+
+# Tarih/saat hücreleri SQLite'ta ISO metin olarak tutulur ("2024-05-01T00:00:00")
+_ISO_DATETIME = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?$"
+
+def _sql_ident(name) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _sql_table(table: str) -> str:
+    return _sql_ident(table[3:] if table.startswith("df_") else table)
+
+def _sql_value(v):
+    """Hücre değerini SQLite'a uygun hale getir. (değer, kolon türü ipucu) döndürür."""
+    if v is None or v is pd.NaT or v is pd.NA:
+        return None, None
+    if isinstance(v, (bool, np.bool_)):
+        return int(v), "bool"
+    if isinstance(v, np.datetime64):
+        v = pd.Timestamp(v)
+        if v is pd.NaT:
+            return None, None
+    if isinstance(v, datetime.datetime):
+        if v.tzinfo is not None:
+            v = v.replace(tzinfo=None)
+        return pd.Timestamp(v).isoformat(), "datetime"
+    if isinstance(v, datetime.date):
+        return datetime.datetime.combine(v, datetime.time()).isoformat(), "datetime"
+    if isinstance(v, numbers.Integral):
+        return int(v), None
+    if isinstance(v, numbers.Real):
+        f = float(v)
+        return (None if f != f else f), None
+    if isinstance(v, str):
+        return v, None
+    try:
+        if pd.isna(v):
+            return None, None
+    except (TypeError, ValueError):
+        pass
+    return str(v), None
+
+@st.cache_resource
+def _sqlite_store():
+    conn = sqlite3.connect(SQLITE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS _column_kinds (tbl TEXT, name TEXT, kind TEXT, PRIMARY KEY (tbl, name))"
+    )
+    return {
+        "conn": conn,
+        "lock": threading.RLock(),
+        "columns": {},   # tablo -> kolon listesi (SQLite'taki sıra)
+        "kinds": {},     # tablo -> {kolon: "datetime" | "bool"}
+        "versions": {},  # tablo -> değişiklik sayacı
+        "frames": {},    # tablo -> (sürüm, DataFrame)
+        "migrated": False,
+    }
+
+def _sqlite_meta(store: dict, key: str, default=None):
+    row = store["conn"].execute("SELECT value FROM _meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def _sqlite_set_meta(store: dict, **values):
+    store["conn"].executemany(
+        "INSERT OR REPLACE INTO _meta (key, value) VALUES (?, ?)",
+        [(k, None if v is None else str(v)) for k, v in values.items()],
+    )
+
+def _sqlite_columns(store: dict, table: str) -> list:
+    if table not in store["columns"]:
+        conn = store["conn"]
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {_sql_table(table)} (_rowid INTEGER PRIMARY KEY)")
+        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({_sql_table(table)})") if r[1] != "_rowid"]
+        store["columns"][table] = cols
+        store["kinds"][table] = dict(
+            conn.execute("SELECT name, kind FROM _column_kinds WHERE tbl = ?", (table,)).fetchall()
+        )
+    return store["columns"][table]
+
+def _sqlite_ensure_columns(store: dict, table: str, columns, kinds: dict = None):
+    """Eksik kolonları ekle (ID kolonuna index ile) ve tarih/bool kolon türlerini kaydet."""
+    conn = store["conn"]
+    existing = _sqlite_columns(store, table)
+    for col in columns:
+        col = str(col)
+        if col in existing:
+            continue
+        conn.execute(f"ALTER TABLE {_sql_table(table)} ADD COLUMN {_sql_ident(col)}")
+        existing.append(col)
+        if col == "ID":
+            index_name = _sql_ident(f"ix_{table}_ID")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_sql_table(table)} (\"ID\")")
+    known = store["kinds"][table]
+    for col, kind in (kinds or {}).items():
+        if kind and known.get(col) != kind:
+            conn.execute(
+                "INSERT OR REPLACE INTO _column_kinds (tbl, name, kind) VALUES (?, ?, ?)", (table, col, kind)
+            )
+            known[col] = kind
+
+def _sqlite_read_frame(store: dict, table: str) -> pd.DataFrame:
+    """Tabloyu DataFrame olarak oku; index = SQLite rowid."""
+    cols = _sqlite_columns(store, table)
+    df = pd.read_sql_query(
+        f"SELECT * FROM {_sql_table(table)} ORDER BY _rowid", store["conn"], index_col="_rowid"
+    )
+    df.index = df.index.astype("int64")
+    df.index.name = None
+    if not cols:
+        return pd.DataFrame(columns=TABLE_DEFAULT_COLUMNS[table])
+    for col, kind in store["kinds"][table].items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if kind == "datetime":
+            mask = s.map(lambda v: isinstance(v, str)) & s.astype(str).str.match(_ISO_DATETIME)
+            if not mask.any():
+                continue
+            parsed = pd.to_datetime(s[mask], format="ISO8601")
+            if mask.equals(s.notna()):
+                df[col] = pd.to_datetime(s, format="ISO8601")
+            else:
+                # Elle girilmiş metinlerle karışık kolon: yalnızca tarih hücrelerini çevir
+                obj = s.astype(object)
+                obj[mask] = parsed.astype(object)
+                df[col] = obj
+        elif kind == "bool":
+            mask = s.isin([0, 1])
+            if mask.any():
+                obj = s.astype(object)
+                obj[mask] = s[mask] == 1
+                df[col] = obj.astype(bool) if mask.all() else obj
+    return df
+
+def _sqlite_frame(store: dict, table: str) -> pd.DataFrame:
+    """Tabloyu sürüm başına bir kez oku; çağırana copy-on-write sığ kopya ver."""
+    with store["lock"]:
+        version = store["versions"].get(table, 0)
+        cached = store["frames"].get(table)
+        if cached is None or cached[0] != version:
+            cached = (version, _sqlite_read_frame(store, table))
+            store["frames"][table] = cached
+    return cached[1].copy(deep=False)
+
+def _sqlite_has_data(store: dict) -> bool:
+    return _sqlite_meta(store, "imported_at") is not None
+
+def _sqlite_replace_all(store: dict, frames: dict):
+    """Tüm tabloları verilen DataFrame'lerle değiştir (Excel'den içe aktarma)."""
+    conn = store["conn"]
+    with store["lock"]:
+        conn.execute("BEGIN")
+        try:
+            for table, df in frames.items():
+                conn.execute(f"DROP TABLE IF EXISTS {_sql_table(table)}")
+                conn.execute("DELETE FROM _column_kinds WHERE tbl = ?", (table,))
+                store["columns"].pop(table, None)
+                cols = [str(c) for c in df.columns]
+                rows, kinds = [], {}
+                for rec in df.itertuples(index=False, name=None):
+                    row = []
+                    for col, v in zip(cols, rec):
+                        value, kind = _sql_value(v)
+                        if kind:
+                            kinds[col] = kind
+                        row.append(value)
+                    rows.append(row)
+                _sqlite_ensure_columns(store, table, cols, kinds)
+                if cols and rows:
+                    placeholders = ", ".join("?" for _ in cols)
+                    conn.executemany(
+                        f"INSERT INTO {_sql_table(table)} ({', '.join(_sql_ident(c) for c in cols)}) VALUES ({placeholders})",
+                        rows,
+                    )
+            now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            _sqlite_set_meta(store, imported_at=now, changed_at=now, synced_at=now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            store["columns"].clear()
+            store["kinds"].clear()
+            raise
+        for table in frames:
+            store["versions"][table] = store["versions"].get(table, 0) + 1
+
+def _sqlite_touch(store: dict):
+    _sqlite_set_meta(store, changed_at=datetime.datetime.now(datetime.timezone.utc).isoformat())
+
+def import_workbook_into_sqlite(path: str = WORKBOOK_PATH, revision=None):
+    """Çalışma kitabındaki yedi sayfayı SQLite'a aktar (ilk kullanım / Drive daha güncelse)."""
+    frames, failed = _parse_workbook(path) if os.path.exists(path) else ({
+        table: pd.DataFrame(columns=cols) for table, cols in TABLE_DEFAULT_COLUMNS.items()
+    }, {})
+    if failed:
+        # Boş tablolarla içe aktarmak veritabanındaki kayıtları silerdi
+        raise RuntimeError(
+            "Çalışma kitabı okunamadı: " + "; ".join(f"{TABLE_SHEETS[t]}: {e}" for t, e in failed.items())
+        )
+    migrate_schema(frames)
+    store = _sqlite_store()
+    _sqlite_replace_all(store, frames)
+    with store["lock"]:
+        # İçe aktarılan dosya Drive'daki sürümle aynı: dışa aktarmaya gerek yok
+        _sqlite_set_meta(
+            store,
+            synced_revision="|".join(revision) if revision else None,
+            exported_at=_sqlite_meta(store, "changed_at"),
+        )
+
+def export_sqlite_to_workbook(store: dict = None, cache: dict = None, q: dict = None, force: bool = False) -> bool:
+    """SQLite'taki tabloları çalışma kitabına yaz ve Drive yükleme kuyruğuna ver."""
+    store = store or _sqlite_store()
+    with store["lock"]:
+        changed_at = _sqlite_meta(store, "changed_at")
+        frames = {table: _sqlite_frame(store, table) for table in TABLE_SHEETS}
+    data, _ = build_workbook_bytes(frames, cache, force=force)
+    if data is not None:
+        with open(WORKBOOK_PATH, "wb") as f:
+            f.write(data)
+        enqueue_workbook_upload(data, q)
+    with store["lock"]:
+        _sqlite_set_meta(store, exported_at=changed_at)
+    return data is not None
+
+def _export_worker(store: dict, cache: dict, q: dict):
+    """SQLite değiştikçe Excel dışa aktarımını EXCEL_EXPORT_INTERVAL aralıklarla yapar."""
+    while True:
+        time.sleep(EXCEL_EXPORT_INTERVAL)
+        try:
+            with store["lock"]:
+                changed_at = _sqlite_meta(store, "changed_at")
+                exported_at = _sqlite_meta(store, "exported_at")
+            if changed_at and changed_at != exported_at:
+                export_sqlite_to_workbook(store, cache, q)
+        except Exception:
+            # Bir sonraki turda tekrar denenir
+            pass
+
+def _sqlite_note_synced(store: dict, gfile):
+    """Dışa aktarılan dosya Drive'a yüklendiğinde revizyonunu kaydet."""
+    with store["lock"]:
+        _sqlite_set_meta(store, synced_revision="|".join(_drive_revision(gfile)))
+
+@st.cache_resource
+def _export_job():
+    store, q = _sqlite_store(), _upload_queue()
+    q["on_uploaded"] = lambda gfile: _sqlite_note_synced(store, gfile)
+    threading.Thread(
+        target=_export_worker, args=(store, _workbook_cache(), q), name="excel-export", daemon=True
+    ).start()
+    return True
+
+def _sqlite_migrate_schema(store: dict):
+    """Şema göçünü veritabanına süreç başına bir kez uygula; yalnızca değişen hücreler yazılır."""
+    with store["lock"]:
+        if store["migrated"]:
+            return
+        frames = {table: _sqlite_frame(store, table) for table in TABLE_SCHEMA}
+        changes = migrate_schema(frames)
+        if changes:
+            conn = store["conn"]
+            conn.execute("BEGIN")
+            try:
+                for table, (added, id_labels) in changes.items():
+                    df = frames[table]
+                    cols = added + (["ID"] if id_labels else [])
+                    labels = df.index if added else id_labels
+                    rows, kinds = [], {}
+                    for label, rec in zip(labels, df.loc[labels, cols].itertuples(index=False, name=None)):
+                        row = []
+                        for col, v in zip(cols, rec):
+                            value, kind = _sql_value(v)
+                            if kind:
+                                kinds[col] = kind
+                            row.append(value)
+                        rows.append(row + [int(label)])
+                    _sqlite_ensure_columns(store, table, cols, kinds)
+                    if rows:
+                        assignments = ", ".join(f"{_sql_ident(c)} = ?" for c in cols)
+                        conn.executemany(f"UPDATE {_sql_table(table)} SET {assignments} WHERE _rowid = ?", rows)
+                _sqlite_touch(store)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                store["columns"].clear()
+                store["kinds"].clear()
+                raise
+            for table in changes:
+                version = store["versions"].get(table, 0) + 1
+                store["versions"][table] = version
+                store["frames"][table] = (version, frames[table])
+        # Göç için okunup değişmeyen tablolar bellekte tutulmaz; ilk erişimde yeniden okunur
+        for table in TABLE_SCHEMA:
+            if table not in changes:
+                store["frames"].pop(table, None)
+        store["migrated"] = True
+
+def _storage_commit(table: str, df: pd.DataFrame):
+    """Değişen tabloyu bu çalıştırmaya yayınla ve aktif arka uca göre kalıcılaştır.
+
+    SQLite'ta satır zaten yazılmıştır; oturumun tablosu güncelse önbelleğe aynen
+    alınır, değilse önbellek düşürülür ve bir sonraki okumada veritabanından yenilenir.
+    Sheets aynası açıksa tablo ayrıca yazma kuyruğuna konur.
+    """
+    state = _run_state()
+    state["tables"][table] = df
+    # Bu çalıştırmanın geri kalanında tipli kolonlar önbelleksiz hesaplanır
+    state["revisions"][table] = None
+    enqueue_sheet_mirror(table, df)
+    if STORAGE_BACKEND != "sqlite":
+        update_excel()
+        return
+    store = _sqlite_store()
+    with store["lock"]:
+        _sqlite_touch(store)
+        loaded = st.session_state.get("_storage_versions", {}).get(table)
+        version = store["versions"].get(table, 0)
+        store["versions"][table] = version + 1
+        if loaded == version:
+            store["frames"][table] = (version + 1, df.copy(deep=False))
+            st.session_state.setdefault("_storage_versions", {})[table] = version + 1
+            state["revisions"][table] = ("sqlite", version + 1)
+        else:
+            store["frames"].pop(table, None)
+
+def _set_cells(df: pd.DataFrame, labels: list, col: str, value):
+    try:
+        df.loc[labels, col] = value
+    except (TypeError, ValueError):
+        # Uyumsuz tip (ör. datetime64 kolona date): kolonu object'e çevirip yaz
+        df[col] = df[col].astype(object) if col in df.columns else None
+        df.loc[labels, col] = value
+
+def storage_insert_row(table: str, row: dict):
+    """Tabloya tek satır ekle; yeni satırın index etiketini döndür.
+
+    Şemasında ID olan tablolarda ID verilmemiş ya da boşsa uuid4 atanır.
+    """
+    df = table_frame(table)
+    if "ID" in TABLE_SCHEMA.get(table, ()):
+        row_id = row.get("ID")
+        if row_id is None or pd.isna(row_id) or not str(row_id).strip():
+            row = {**row, "ID": str(uuid.uuid4())}
+    if STORAGE_BACKEND == "sqlite":
+        store = _sqlite_store()
+        with store["lock"]:
+            cols, values, kinds = [], [], {}
+            for col, v in row.items():
+                value, kind = _sql_value(v)
+                cols.append(str(col))
+                values.append(value)
+                if kind:
+                    kinds[str(col)] = kind
+            _sqlite_ensure_columns(store, table, cols, kinds)
+            if cols:
+                cur = store["conn"].execute(
+                    f"INSERT INTO {_sql_table(table)} ({', '.join(_sql_ident(c) for c in cols)}) "
+                    f"VALUES ({', '.join('?' for _ in cols)})",
+                    values,
+                )
+            else:
+                cur = store["conn"].execute(f"INSERT INTO {_sql_table(table)} DEFAULT VALUES")
+            label = int(cur.lastrowid)
+    else:
+        label = int(df.index.max()) + 1 if len(df) else 0
+    _storage_commit(table, pd.concat([df, pd.DataFrame([row], index=[label])]))
+    return label
+
+def storage_update_rows(table: str, labels, changes: dict):
+    """Verilen index etiketlerindeki satırları güncelle.
+
+    changes: kolon -> değer; değer tek bir skaler ya da etiket sayısı kadar liste olabilir.
+    """
+    labels = list(labels) if isinstance(labels, (list, tuple, pd.Index, pd.Series, np.ndarray)) else [labels]
+    if not labels or not changes:
+        return
+    df = table_frame(table)
+    for col, value in changes.items():
+        _set_cells(df, labels, col, value)
+    if STORAGE_BACKEND == "sqlite":
+        store = _sqlite_store()
+        with store["lock"]:
+            cols = [str(c) for c in changes]
+            rows, kinds = [], {}
+            for i, label in enumerate(labels):
+                row = []
+                for col, value in changes.items():
+                    if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+                        value = list(value)[i]
+                    v, kind = _sql_value(value)
+                    if kind:
+                        kinds[str(col)] = kind
+                    row.append(v)
+                rows.append(row + [int(label)])
+            _sqlite_ensure_columns(store, table, cols, kinds)
+            assignments = ", ".join(f"{_sql_ident(c)} = ?" for c in cols)
+            store["conn"].executemany(
+                f"UPDATE {_sql_table(table)} SET {assignments} WHERE _rowid = ?", rows
+            )
+    _storage_commit(table, df)
+
+def storage_delete_rows(table: str, labels):
+    """Verilen index etiketlerindeki satırları sil (index yeniden numaralanmaz)."""
+    labels = list(labels) if isinstance(labels, (list, tuple, pd.Index, pd.Series, np.ndarray)) else [labels]
+    if not labels:
+        return
+    if STORAGE_BACKEND == "sqlite":
+        store = _sqlite_store()
+        with store["lock"]:
+            _sqlite_columns(store, table)
+            store["conn"].executemany(
+                f"DELETE FROM {_sql_table(table)} WHERE _rowid = ?", [(int(l),) for l in labels]
+            )
+    _storage_commit(table, table_frame(table).drop(index=labels))
+
+# =========================================================
+# ================ TİPLİ KOLON KATMANI ====================
+# =========================================================
+# Çalıştırma başına durum (oturuma özel): yüklü tablolar, tablo -> revizyon anahtarı (yüklemede
+# atanır, değişiklikte None olur: önbelleksiz) ve depolama hazırlığı yapıldı mı. Modül süreç
+# başına bir kez yüklendiğinden oturumlar arasında paylaşılmasın diye session_state'te durur.
+def _new_run_state() -> dict:
+    return {"tables": {}, "revisions": {}, "prepared": False}
+
+def _run_state() -> dict:
+    if "_run_state" not in st.session_state:
+        st.session_state["_run_state"] = _new_run_state()
+    return st.session_state["_run_state"]
+
+def begin_run():
+    """Çalıştırma başında çağrılır: tablolar ilk erişimde aktif arka uçtan yeniden yüklenir."""
+    st.session_state["_run_state"] = _new_run_state()
+
+def table_revision(table: str):
+    return _run_state()["revisions"].get(table)
+
+# Sayfaların pd.to_datetime / smart_to_num ile tekrar tekrar çevirdiği kolonlar
+TYPED_DATE_COLUMNS = {
+    "df_kayit": ["Tarih"],
+    "df_teklif": ["Tarih"],
+    "df_proforma": ["Tarih", "Termin Tarihi", "Sevk Tarihi", "Ulaşma Tarihi"],
+    "df_evrak": ["Fatura Tarihi", "Vade Tarihi"],
+    "df_eta": ["Sevk Tarihi", "ETA Tarihi"],
+    "df_fuar_musteri": ["Tarih"],
+}
+TYPED_AMOUNT_TABLES = ["df_teklif", "df_proforma", "df_evrak"]  # Tutar -> Tutar_num (float64)
+TYPED_NUMERIC_COLUMNS = {"df_fuar_musteri": ["Görüşme Kalitesi"]}
+# Küçük harfli arama metni ("_arama"); alanlar satır sonuyla ayrılır, tek satırlık arama alan sınırını aşmaz
+TYPED_SEARCH_COLUMNS = {
+    "df_musteri": ["Müşteri Adı", "Telefon", "E-posta", "Adres", "Ülke", "Satış Temsilcisi"],
+}
+TYPED_CATEGORY_COLUMNS = {
+    "df_kayit": ["Tip"],
+    "df_teklif": ["Durum"],
+    "df_proforma": ["Durum", "Sevk Durumu"],
+}
+
+@st.cache_resource
+def _typed_cache():
+    return {"lock": threading.Lock(), "entries": {}}  # (tablo, dayfirst) -> (revizyon, DataFrame)
+
+def _build_typed_frame(table: str, df: pd.DataFrame, dayfirst: bool = False) -> pd.DataFrame:
+    typed = df.copy(deep=False)
+    for col in TYPED_DATE_COLUMNS.get(table, []):
+        if col in typed.columns:
+            typed[col] = pd.to_datetime(typed[col], errors="coerce", dayfirst=dayfirst)
+    if table in TYPED_AMOUNT_TABLES and "Tutar" in typed.columns:
+        typed["Tutar_num"] = smart_to_num_series(typed["Tutar"]).fillna(0.0)
+    if table == "df_evrak":
+        if "Ödenen Tutar" in typed.columns:
+            typed["Ödenen Tutar"] = pd.to_numeric(typed["Ödenen Tutar"], errors="coerce").fillna(0.0)
+        if "Ödendi" in typed.columns:
+            typed["Ödendi"] = typed["Ödendi"].fillna(False).astype(bool)
+    for col in TYPED_NUMERIC_COLUMNS.get(table, []):
+        if col in typed.columns:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce")
+    for col in TYPED_CATEGORY_COLUMNS.get(table, []):
+        if col in typed.columns:
+            typed[col] = typed[col].fillna("").astype(str).astype("category")
+    search_cols = [col for col in TYPED_SEARCH_COLUMNS.get(table, []) if col in typed.columns]
+    if search_cols:
+        # str.lower() Python'da yapılır: arama sorgusuyla aynı kurallar ("İ" -> "i̇")
+        rows = zip(*(typed[col].astype(object).fillna("").tolist() for col in search_cols))
+        typed["_arama"] = pd.Series(
+            ["\n".join(str(v) for v in row).lower() for row in rows], index=typed.index, dtype=str
+        )
+    return typed
+
+def typed_table(table: str, dayfirst: bool = False) -> pd.DataFrame:
+    """Tablonun tipli görünümü: tarihler datetime64, Tutar_num float64, durumlar category.
+
+    Revizyon başına bir kez hesaplanır ve oturumlar arasında paylaşılır; çağırana
+    copy-on-write sığ kopya verilir. Ham tablo değişmez. dayfirst=True tarihleri
+    gün/ay/yıl önceliğiyle çözer (ETA sayfası); iki çözüm ayrı önbelleğe alınır.
+    """
+    key = (table, dayfirst)
+    df = table_frame(table)
+    revision = table_revision(table)
+    cache = _typed_cache()
+    if revision is not None:
+        with cache["lock"]:
+            entry = cache["entries"].get(key)
+        if entry is not None and entry[0] == revision:
+            return entry[1].copy(deep=False)
+    typed = _build_typed_frame(table, df, dayfirst)
+    if revision is not None:
+        with cache["lock"]:
+            cache["entries"][key] = (revision, typed)
+    return typed.copy(deep=False)
+
+# ---------------- E-posta → ülke indeksi ----------------
+EMAIL_UNKNOWN_COUNTRY = "(Belirtilmedi)"
+EMAIL_COUNTRY_SOURCES = [("df_musteri", "E-posta"), ("df_fuar_musteri", "E-mail")]
+
+def _build_email_country_index() -> dict:
+    parts = []
+    for table, email_col in EMAIL_COUNTRY_SOURCES:
+        df = table_frame(table)
+        if df.empty or email_col not in df.columns:
+            continue
+        mails = split_emails(df[email_col])
+        if "Ülke" in df.columns:
+            ulke = df["Ülke"].loc[mails.index].fillna("").astype(str).str.strip()
+            ulke = ulke.mask(ulke.str.lower().isin(["", "nan", "none"]), EMAIL_UNKNOWN_COUNTRY)
+        else:
+            ulke = pd.Series(EMAIL_UNKNOWN_COUNTRY, index=mails.index)
+        parts.append(pd.DataFrame({"E-posta": mails.to_numpy(), "Ülke": ulke.to_numpy()}))
+    pairs = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame({"E-posta": [], "Ülke": []}, dtype=str)
+    pairs["_key"] = pairs["E-posta"].str.lower()
+    # Aynı adresin farklı yazılışları tek kayıtta birleşir (ilk görülen yazılış)
+    yazilis = pairs.drop_duplicates("_key").set_index("_key")["E-posta"]
+    pairs["E-posta"] = pairs["_key"].map(yazilis)
+    pairs = pairs.drop_duplicates(["_key", "Ülke"]).sort_values(["_key", "Ülke"], kind="stable")
+    # Adres başına ülke metni: sıralı diziler üzerinde tek geçiş (groupby.agg grup başına çok yavaş)
+    ulkeler = {}
+    for mail, ulke in zip(pairs["E-posta"].tolist(), pairs["Ülke"].tolist()):
+        ulkeler.setdefault(mail, []).append(ulke)
+    return {
+        "pairs": pairs[["E-posta", "Ülke"]].reset_index(drop=True),
+        "emails": list(ulkeler),
+        "countries": sorted(pairs["Ülke"].unique().tolist()),
+        "ulkeler": pd.Series({mail: ", ".join(u) for mail, u in ulkeler.items()}, dtype=object),
+    }
+
+def email_country_index() -> dict:
+    """Müşteri + fuar kayıtlarından e-posta → ülke indeksi; kaynak tabloların revizyonu başına bir kez kurulur.
+
+    pairs: benzersiz (E-posta, Ülke) çiftleri (adrese göre sıralı), emails: sıralı benzersiz adresler,
+    countries: sıralı ülkeler, ulkeler: adres -> "Ülke1, Ülke2".
+    """
+    for table, _ in EMAIL_COUNTRY_SOURCES:
+        table_frame(table)  # revizyonlar yüklemede atanır
+    revision = tuple(table_revision(table) for table, _ in EMAIL_COUNTRY_SOURCES)
+    cache = _typed_cache()
+    cacheable = None not in revision
+    if cacheable:
+        with cache["lock"]:
+            entry = cache["entries"].get("email_country")
+        if entry is not None and entry[0] == revision:
+            return entry[1]
+    index = _build_email_country_index()
+    if cacheable:
+        with cache["lock"]:
+            cache["entries"]["email_country"] = (revision, index)
+    return index
+
+def _prepare_storage():
+    """İlk tablo erişiminden önce çalıştırma başına bir kez: yerel kopyayı/veritabanını hazırla."""
+    state = _run_state()
+    if state["prepared"]:
+        return
+    if STORAGE_BACKEND != "sqlite":
+        ensure_workbook()
+    else:
+        store = _sqlite_store()
+        if not _sqlite_has_data(store):
+            # İlk kullanım: mevcut çalışma kitabını Drive'dan alıp içe aktar
+            _, revision = ensure_workbook(force=True)
+            import_workbook_into_sqlite(revision=revision)
+        _sqlite_migrate_schema(store)
+        _export_job()
+    state["prepared"] = True
+
+def unload_tables():
+    """Tabloları boşalt; bir sonraki erişimde aktif arka uçtan yeniden yüklenirler."""
+    state = _run_state()
+    state["tables"].clear()
+    state["revisions"].clear()
+
+def load_tables(tables=None):
+    """Verilen CRM tablolarını (varsayılan: yedisi) bu çalıştırma için yükle.
+
+    Bu çalıştırmada zaten yüklenmiş tablolar atlanır.
+    """
+    loaded = _run_state()["tables"]
+    tables = [t for t in (TABLE_SHEETS if tables is None else tables) if loaded.get(t) is None]
+    if not tables:
+        return
+    _prepare_storage()
+    if STORAGE_BACKEND != "sqlite":
+        load_dataframes_from_excel(tables=tables)
+        return
+    store = _sqlite_store()
+    revisions = _run_state()["revisions"]
+    with store["lock"]:
+        for table in tables:
+            loaded[table] = _sqlite_frame(store, table)
+            version = store["versions"].get(table, 0)
+            revisions[table] = ("sqlite", version)
+            st.session_state.setdefault("_storage_versions", {})[table] = version
+
+def table_frame(table: str) -> pd.DataFrame:
+    """Tabloyu ilk erişimde yükle (tembel); bu çalıştırmada yüklenmişse aynısını döndür."""
+    loaded = _run_state()["tables"]
+    if loaded.get(table) is None:
+        load_tables([table])
+    return loaded[table]
+
+def sync_excel_bidirectional():
+    downloaded = workbook_file()
+    # Bekleyen arka plan yüklemesi bitmeden karşılaştırma yapma
+    if not flush_uploads(timeout=60):
+        st.session_state.sync_status = ("warning", "Bekleyen Drive yüklemesi henüz tamamlanmadı; lütfen biraz sonra tekrar deneyin.")
+        return
+    try:
+        downloaded.FetchMetadata(fetch_all=True)
+        remote_raw = downloaded.get('modifiedDate') or downloaded.get('modifiedTime')
+        remote_ts = None
+        if remote_raw:
+            remote_ts = pd.to_datetime(remote_raw, utc=True).tz_convert(None).to_pydatetime()
+    except Exception as e:
+        st.session_state.sync_status = ("error", f"Drive meta verisi alınamadı: {e}")
+        return
+
+    if STORAGE_BACKEND == "sqlite":
+        sync_sqlite_with_drive(remote_ts)
+        return
+
+    local_exists = os.path.exists(WORKBOOK_PATH)
+    local_ts = None
+    if local_exists:
+        try:
+            local_ts = datetime.datetime.fromtimestamp(os.path.getmtime(WORKBOOK_PATH))
+        except Exception:
+            local_ts = None
+
+    tolerance = datetime.timedelta(seconds=2)
+
+    if not local_exists or (remote_ts and (local_ts is None or remote_ts - local_ts > tolerance)):
+        try:
+            downloaded.GetContentFile(WORKBOOK_PATH)
+            _remember_workbook_revision(downloaded)
+            unload_tables()
+            st.session_state.sync_status = ("success", "Google Drive dosyası daha güncel bulundu; yerel kopya yenilendi.")
+        except Exception as e:
+            st.session_state.sync_status = ("error", f"Drive'dan dosya indirilirken hata oluştu: {e}")
+        return
+
+    if remote_ts and local_ts and (local_ts - remote_ts > tolerance):
+        try:
+            downloaded.SetContentFile(WORKBOOK_PATH)
+            downloaded.Upload(param={"supportsAllDrives": True})
+            _remember_workbook_revision(downloaded)
+            st.session_state.sync_status = ("success", "Yerel dosya daha güncel bulundu; Drive üzerindeki dosya güncellendi.")
+        except Exception as e:
+            st.session_state.sync_status = ("error", f"Drive'a dosya yüklenirken hata oluştu: {e}")
+    else:
+        st.session_state.sync_status = ("info", "Dosyalar zaten senkron görünüyor.")
+
+def sync_sqlite_with_drive(remote_ts):
+    """SQLite arka ucunda manuel senkron: Drive'daki dosya dışarıdan değiştiyse ve daha
+    yeniyse içe aktar, aksi halde yerel veritabanını dışa aktarıp Drive'a yükle."""
+    store = _sqlite_store()
+    downloaded = workbook_file()
+    remote_rev = "|".join(_drive_revision(downloaded))
+    with store["lock"]:
+        synced_rev = _sqlite_meta(store, "synced_revision")
+        changed_raw = _sqlite_meta(store, "changed_at")
+        exported_at = _sqlite_meta(store, "exported_at")
+    local_ts = pd.to_datetime(changed_raw, utc=True).tz_convert(None).to_pydatetime() if changed_raw else None
+    drive_changed = remote_rev != synced_rev
+    tolerance = datetime.timedelta(seconds=2)
+
+    if drive_changed and remote_ts and (local_ts is None or remote_ts - local_ts > tolerance):
+        try:
+            downloaded.GetContentFile(WORKBOOK_PATH)
+            _remember_workbook_revision(downloaded)
+            import_workbook_into_sqlite(revision=_drive_revision(downloaded))
+            unload_tables()
+            st.session_state.sync_status = ("success", "Google Drive dosyası daha güncel bulundu; yerel veritabanı yenilendi.")
+        except Exception as e:
+            st.session_state.sync_status = ("error", f"Drive'dan dosya içe aktarılırken hata oluştu: {e}")
+        return
+
+    if drive_changed or changed_raw != exported_at:
+        try:
+            export_sqlite_to_workbook(force=True)
+            if not flush_uploads(timeout=120):
+                st.session_state.sync_status = ("warning", "Dışa aktarım kuyruğa alındı; Drive yüklemesi arka planda sürüyor.")
+                return
+            st.session_state.sync_status = ("success", "Yerel veritabanı daha güncel bulundu; Drive üzerindeki dosya güncellendi.")
+        except Exception as e:
+            st.session_state.sync_status = ("error", f"Drive'a dosya yüklenirken hata oluştu: {e}")
+    else:
+        st.session_state.sync_status = ("info", "Dosyalar zaten senkron görünüyor.")
+
+# =========================================================
+# ================ GOOGLE SHEETS SENKRON ==================
+# =========================================================
+# Yedi tablo Sheets'te aynalanır. Yalnızca değişen satırlar yazılır: her kaydın (ID; ID'siz
+# tablolarda satır etiketi) son gönderilen satır özeti ve sayfadaki satır numarası yerel
+# SQLite'ta tutulur. Kayıtlar kuyrukta birleştirilir; her yazma penceresinde tüm tabloların
+# silmeleri tek spreadsheets.batchUpdate, değerleri tek values.batchUpdate ile gider.
+# Başlık değişirse ya da durum kaydı yoksa o sayfa bir kez baştan yazılır.
+SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+SHEET_ID = GOOGLE_SHEETS_ID
+MUSTERI_SHEET_NAME = st.secrets.get("google_sheets_musteri_sheet", "Müşteriler")
+# Tablo -> Sheets sayfası (secrets ile tablo bazında değiştirilebilir)
+SHEETS_MIRROR_NAMES = {
+    **TABLE_SHEETS,
+    "df_musteri": MUSTERI_SHEET_NAME,
+    **dict(st.secrets.get("google_sheets_sheet_names", {})),
+}
+SHEETS_STATE_PATH = st.secrets.get("sheets_state_path", "sheets_sync.db")
+# Bu süre içindeki kayıtlar tek yazmada birleştirilir
+SHEETS_FLUSH_DELAY = float(st.secrets.get("sheets_flush_seconds", 5))
+SHEETS_MAX_RETRIES = 5
+SHEETS_MAX_BACKOFF = 300
+
+@st.cache_resource
+def get_sheets_service():
+    """Yetkili Sheets v4 istemcisi; kimlik bilgisi ya da tablo ID'si yoksa None.
+
+    İstemci yalnızca aynalama worker'ı tarafından kullanılır (httplib2 thread-safe değildir).
+    """
+    if not SHEET_ID:
+        return None
+    creds = _load_service_account_credentials(SHEETS_SCOPES)
+    if creds is None:
+        return None
+    return build_google_service("sheets", "v4", http=creds.authorize(httplib2.Http()), cache_discovery=False)
+
+sheets_svc = get_sheets_service()
+SHEETS_MIRROR = sheets_svc is not None and bool(st.secrets.get("sheets_mirror", True))
+
+def execute_with_retry(request, tries: int = SHEETS_MAX_RETRIES):
+    """İsteği çalıştır; kota (429) ve sunucu (5xx) hatalarında tekrar dene.
+
+    Sunucu Retry-After bildirirse ona uyulur, yoksa rastgele sapmalı artan bekleme kullanılır.
+    """
+    for attempt in range(tries):
+        try:
+            return request.execute()
+        except HttpError as exc:
+            if exc.resp.status not in (429, 500, 502, 503, 504) or attempt == tries - 1:
+                raise
+            try:
+                delay = float(exc.resp.get("retry-after"))
+            except (TypeError, ValueError):
+                delay = min(64, 2 ** attempt) + random.random()
+            time.sleep(delay)
+
+def _cell(v):
+    if isinstance(v, (pd.Timestamp, datetime.date, datetime.datetime)):
+        try: return pd.to_datetime(v).date().isoformat()
+        except: return str(v)
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+def _df_to_rows(df: pd.DataFrame) -> list:
+    """DataFrame'i Sheets hücre değerlerine çevir (başlıksız). Kolon tipine göre toplu dönüşüm."""
+    cols = []
+    for col in df.columns:
+        s = df[col]
+        na = s.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(s):
+            vals = s.dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+        elif pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+            vals = np.array(s.tolist(), dtype=object)
+        else:
+            vals = np.array([_cell(v) for v in s.tolist()], dtype=object)
+        vals[na] = ""
+        cols.append(vals)
+    if not cols:
+        return [[] for _ in range(len(df))]
+    return np.column_stack(cols).tolist() if len(df) else []
+
+def _row_fingerprints(rows: list) -> list:
+    return [hashlib.md5(json.dumps(r, ensure_ascii=False, default=str).encode("utf-8")).hexdigest() for r in rows]
+
+def _mirror_keys(df: pd.DataFrame) -> list:
+    """Satır anahtarları: ID kolonu varsa ID, yoksa satır etiketi (SQLite'ta _rowid)."""
+    if "ID" in df.columns:
+        return df["ID"].fillna("").astype(str).str.strip().tolist()
+    return [f"#{label}" for label in df.index]
+
+def _sheets_state_db(path: str = None):
+    conn = sqlite3.connect(path or SHEETS_STATE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sheet_rows ("
+        "sheet TEXT NOT NULL, key TEXT NOT NULL, row_no INTEGER NOT NULL, fp TEXT, PRIMARY KEY (sheet, key))"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS sheet_meta (sheet TEXT PRIMARY KEY, header_fp TEXT, gid INTEGER)")
+    return conn
+
+def _a1(sheet_name: str, row_no: int = None) -> str:
+    quoted = "'" + sheet_name.replace("'", "''") + "'"
+    return f"{quoted}!A{row_no}" if row_no else f"{quoted}!A:ZZ"
+
+def _row_blocks(items):
+    """[(satır no, değerler)] -> ardışık satırları birleştirilmiş [(ilk satır, [değerler...])]."""
+    blocks = []
+    for row_no, values in sorted(items, key=lambda x: x[0]):
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == row_no:
+            blocks[-1][1].append(values)
+        else:
+            blocks.append((row_no, [values]))
+    return blocks
+
+def _delete_ranges(row_nos) -> list:
+    """Silinecek satır numaraları -> alttan yukarı sıralı, birleştirilmiş [(ilk, son)] aralıkları."""
+    ranges = []
+    for r in sorted(row_nos, reverse=True):
+        if ranges and ranges[-1][0] == r + 1:
+            ranges[-1][0] = r
+        else:
+            ranges.append([r, r])
+    return [tuple(x) for x in ranges]
+
+def _plan_sheet_sync(df: pd.DataFrame, state: dict, header_fp_old, force: bool = False) -> dict:
+    """Tablo ile son gönderilen durum arasındaki farkı çıkar (API çağrısı yapmaz).
+
+    state: anahtar -> (satır no, özet). Dönen plan: full, data [(ilk satır, satırlar)],
+    deletes [(ilk, son)], kept (silmelerden sonra sayfada kalan satırlar, eski özetleriyle),
+    yeni durum, başlık özeti ve özet sayılar.
+    """
+    header = [str(c) for c in df.columns]
+    header_fp = _row_fingerprints([header])[0]
+    rows = _df_to_rows(df)
+    fps = _row_fingerprints(rows)
+    keys = _mirror_keys(df)
+    keys_ok = "" not in keys and len(set(keys)) == len(keys)
+
+    if force or not keys_ok or header_fp_old != header_fp:
+        return {
+            "full": True,
+            "data": [(1, [header] + rows)],
+            "deletes": [],
+            "kept": {},
+            "state": {k: (i + 2, fp) for i, (k, fp) in enumerate(zip(keys, fps))} if keys_ok else {},
+            "header_fp": header_fp if keys_ok else None,
+            "summary": {"mode": "full", "updated": len(rows), "appended": 0, "deleted": 0},
+        }
+
+    current = dict(zip(keys, zip(rows, fps)))
+    silinen = sorted(state[k][0] for k in state if k not in current)
+    kalan = {
+        k: (row_no - bisect.bisect_left(silinen, row_no), fp)
+        for k, (row_no, fp) in state.items() if k in current
+    }
+    son_satir = 1 + len(kalan)
+    yazilacak, new_state, guncellenen, eklenen = [], {}, 0, 0
+    for key, (values, fp) in current.items():
+        if key in kalan:
+            row_no, eski_fp = kalan[key]
+            if eski_fp != fp:
+                yazilacak.append((row_no, values))
+                guncellenen += 1
+        else:
+            son_satir += 1
+            row_no = son_satir
+            yazilacak.append((row_no, values))
+            eklenen += 1
+        new_state[key] = (row_no, fp)
+    return {
+        "full": False,
+        "data": _row_blocks(yazilacak),
+        "deletes": _delete_ranges(silinen),
+        "kept": kalan,
+        "state": new_state,
+        "header_fp": header_fp,
+        "summary": {"mode": "delta", "updated": guncellenen, "appended": eklenen, "deleted": len(silinen)},
+    }
+
+def _flush_sheet_changes(svc, conn, pending: dict) -> dict:
+    """Bekleyen tabloları aynala: en fazla bir yapı, bir temizleme ve bir değer isteği.
+
+    pending: sayfa adı -> (DataFrame, force). Sayfa adı -> özet döndürür.
+    """
+    metas = {
+        sheet: (header_fp, gid)
+        for sheet, header_fp, gid in conn.execute("SELECT sheet, header_fp, gid FROM sheet_meta")
+    }
+    plans, gids = {}, {}
+    for sheet, (df, force) in pending.items():
+        state = {
+            key: (row_no, fp)
+            for key, row_no, fp in conn.execute(
+                "SELECT key, row_no, fp FROM sheet_rows WHERE sheet = ?", (sheet,)
+            )
+        }
+        header_fp, gid = metas.get(sheet, (None, None))
+        plans[sheet] = _plan_sheet_sync(df, state, header_fp, force)
+        if gid is not None:
+            gids[sheet] = gid
+
+    missing = [sheet for sheet in plans if sheet not in gids]
+    if missing:
+        meta = execute_with_retry(svc.spreadsheets().get(spreadsheetId=SHEET_ID, fields="sheets.properties"))
+        titles = {sh["properties"]["title"]: sh["properties"]["sheetId"] for sh in meta.get("sheets", [])}
+        for sheet in missing:
+            if sheet in titles:
+                gids[sheet] = titles[sheet]
+
+    requests_, added = [], []
+    for sheet in plans:
+        if sheet not in gids:
+            requests_.append({"addSheet": {"properties": {"title": sheet}}})
+            added.append(sheet)
+    for sheet, plan in plans.items():
+        for start, end in plan["deletes"]:
+            requests_.append({"deleteDimension": {"range": {
+                "sheetId": gids[sheet], "dimension": "ROWS", "startIndex": start - 1, "endIndex": end,
+            }}})
+    if requests_:
+        try:
+            reply = execute_with_retry(svc.spreadsheets().batchUpdate(
+                spreadsheetId=SHEET_ID, body={"requests": requests_}
+            ))
+        except HttpError as exc:
+            if exc.resp.status >= 500:
+                # Sonucu bilinmiyor: silmeler uygulanmış olabilir, sayfalar baştan yazılsın
+                _forget_sheet_state(conn, plans)
+            raise
+        except Exception:
+            _forget_sheet_state(conn, plans)
+            raise
+        new_ids = [r["addSheet"]["properties"]["sheetId"] for r in reply.get("replies", []) if "addSheet" in r]
+        gids.update(zip(added, new_ids))
+
+    # Değer yazımından önce sayfanın şu anki halini kaydet: silmeler uygulandı, baştan
+    # yazılacak sayfalar temizlenecek. Sonraki adım başarısız olursa tekrar deneme bu
+    # durumdan planlanır; aynı satırlar ikinci kez silinmez.
+    conn.execute("BEGIN")
+    for sheet, plan in plans.items():
+        _save_sheet_state(conn, sheet, plan["kept"], None if plan["full"] else plan["header_fp"], gids.get(sheet))
+    conn.execute("COMMIT")
+
+    clear = [_a1(sheet) for sheet, plan in plans.items() if plan["full"] and sheet not in added]
+    if clear:
+        execute_with_retry(svc.spreadsheets().values().batchClear(
+            spreadsheetId=SHEET_ID, body={"ranges": clear}
+        ))
+    data = [
+        {"range": _a1(sheet, start), "values": values}
+        for sheet, plan in plans.items() for start, values in plan["data"]
+    ]
+    if data:
+        execute_with_retry(svc.spreadsheets().values().batchUpdate(
+            spreadsheetId=SHEET_ID, body={"valueInputOption": "RAW", "data": data}
+        ))
+
+    conn.execute("BEGIN")
+    for sheet, plan in plans.items():
+        _save_sheet_state(conn, sheet, plan["state"], plan["header_fp"], gids.get(sheet))
+    conn.execute("COMMIT")
+    return {sheet: plan["summary"] for sheet, plan in plans.items()}
+
+def _save_sheet_state(conn, sheet: str, state: dict, header_fp, gid):
+    """Sayfanın satır durumunu ve başlık/kimlik bilgisini yaz (açık işlem içinde çağrılır)."""
+    conn.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet,))
+    conn.executemany(
+        "INSERT INTO sheet_rows (sheet, key, row_no, fp) VALUES (?, ?, ?, ?)",
+        [(sheet, k, r, fp) for k, (r, fp) in state.items()],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO sheet_meta (sheet, header_fp, gid) VALUES (?, ?, ?)",
+        (sheet, header_fp, gid),
+    )
+
+def _forget_sheet_state(conn, sheets):
+    """Sayfaların durumunu sil; bir sonraki yazma sayfa kimliğini yeniden alıp baştan yazar."""
+    for sheet in sheets:
+        conn.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet,))
+        conn.execute("DELETE FROM sheet_meta WHERE sheet = ?", (sheet,))
+
+def _sheets_worker(q: dict):
+    """Bekleyen tablo değişikliklerini pencere sonunda tek seferde Sheets'e yazar."""
+    cond = q["cond"]
+    conn = _sheets_state_db(q["state_path"])
+    while True:
+        with cond:
+            while not q["pending"]:
+                cond.wait()
+            while True:
+                remaining = q["queued_at"] + SHEETS_FLUSH_DELAY - time.monotonic()
+                if remaining <= 0:
+                    break
+                cond.wait(remaining)
+            pending, q["pending"] = q["pending"], {}
+            q["busy"] = True
+            q["status"] = "syncing"
+        try:
+            summary = _flush_sheet_changes(q["svc"], conn, pending)
+        except Exception as exc:
+            if isinstance(exc, HttpError) and exc.resp.status in (400, 404):
+                # Sayfa elle silinmiş/yeniden adlandırılmış olabilir: sıfırdan kur
+                _forget_sheet_state(conn, pending)
+            with cond:
+                for sheet, (df, force) in pending.items():
+                    # Bu arada gelen daha yeni tablo öncelikli
+                    if sheet in q["pending"]:
+                        newer, newer_force = q["pending"][sheet]
+                        q["pending"][sheet] = (newer, newer_force or force)
+                    else:
+                        q["pending"][sheet] = (df, force)
+                q["busy"] = False
+                q["attempts"] += 1
+                q["status"] = "retrying"
+                q["error"] = f"{type(exc).__name__}: {exc}"
+                backoff = min(SHEETS_MAX_BACKOFF, 2 ** q["attempts"])
+                q["queued_at"] = time.monotonic() + backoff - SHEETS_FLUSH_DELAY
+                cond.notify_all()
+            continue
+        with cond:
+            q["busy"] = False
+            q["attempts"] = 0
+            q["error"] = None
+            q["last_synced"] = datetime.datetime.now()
+            q["last_summary"].update(summary)
+            q["status"] = "pending" if q["pending"] else "synced"
+            cond.notify_all()
+
+@st.cache_resource
+def _sheets_mirror():
+    q = {
+        "cond": threading.Condition(),
+        "pending": {},
+        "busy": False,
+        "queued_at": 0.0,
+        "status": "synced",
+        "attempts": 0,
+        "error": None,
+        "last_synced": None,
+        "last_summary": {},
+        # Worker thread Streamlit bağlamı dışında çalışır; istemci ve ayarlar burada verilir
+        "svc": sheets_svc,
+        "state_path": SHEETS_STATE_PATH,
+    }
+    threading.Thread(target=_sheets_worker, args=(q,), name="sheets-mirror", daemon=True).start()
+    return q
+
+def enqueue_sheet_mirror(table: str, df: pd.DataFrame = None, force: bool = False):
+    """Tablonun güncel halini Sheets kuyruğuna koy; aynı tablonun bekleyen eski hali düşer."""
+    if not SHEETS_MIRROR:
+        return
+    sheet = SHEETS_MIRROR_NAMES[table]
+    snapshot = (table_frame(table) if df is None else df).copy()
+    q = _sheets_mirror()
+    with q["cond"]:
+        force = force or q["pending"].get(sheet, (None, False))[1]
+        q["pending"][sheet] = (snapshot, force)
+        if q["status"] != "retrying":
+            q["status"] = "pending"
+            q["queued_at"] = time.monotonic()
+        q["cond"].notify_all()
+
+def flush_sheet_mirror(timeout: float = None) -> bool:
+    """Bekleyen Sheets yazmaları bitene kadar bekle. Zaman aşımında False döner."""
+    q = _sheets_mirror()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with q["cond"]:
+        if q["status"] != "retrying":
+            q["queued_at"] = 0.0  # birleştirme penceresini bekleme
+        q["cond"].notify_all()
+        while q["pending"] or q["busy"]:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            q["cond"].wait(remaining)
+    return True
+
+def push_tables_to_sheets(force: bool = False) -> bool:
+    """Tüm tabloları Sheets'e aynala (değişmeyen satırlar yazılmaz) ve sonucu göster."""
+    if not SHEETS_MIRROR:
+        st.error("Sheets servisi hazır değil! (google_sheets_id ve servis hesabı gerekli)")
+        return False
+    for table in TABLE_SHEETS:
+        enqueue_sheet_mirror(table, force=force)
+    with st.spinner("Sheets’e yazılıyor…"):
+        done = flush_sheet_mirror(timeout=60)
+    q = _sheets_mirror()
+    with q["cond"]:
+        error, summary = q["error"], dict(q["last_summary"])
+    if not done:
+        st.warning(f"Sheets yazması tamamlanamadı, arka planda tekrar denenecek: {error or 'zaman aşımı'}")
+        return False
+    satirlar = []
+    for table in TABLE_SHEETS:
+        sheet = SHEETS_MIRROR_NAMES[table]
+        ozet = summary.get(sheet)
+        if not ozet:
+            continue
+        if ozet["mode"] == "full":
+            satirlar.append(f"{sheet}: {ozet['updated']} satır baştan yazıldı")
+        elif ozet["updated"] or ozet["appended"] or ozet["deleted"]:
+            satirlar.append(
+                f"{sheet}: {ozet['updated']} güncellendi, {ozet['appended']} eklendi, {ozet['deleted']} silindi"
+            )
+    st.info("\n\n".join(satirlar) if satirlar else "Sheets zaten güncel.")
+    return True
+
+def render_sheets_status(slot):
+    """Kenar çubuğunda Sheets aynalama durumunu göster."""
+    if not SHEETS_MIRROR:
+        slot.caption("Sheets aynalama kapalı.")
+        return
+    q = _sheets_mirror()
+    with q["cond"]:
+        status, error, attempts, last = q["status"], q["error"], q["attempts"], q["last_synced"]
+    if status == "retrying":
+        slot.warning(f"Sheets yazması başarısız ({attempts}. deneme), tekrar denenecek: {error}")
+    elif status in ("pending", "syncing"):
+        slot.caption("⏳ Değişiklikler Sheets'e yazılıyor…")
+    else:
+        slot.caption("✅ Sheets ile senkron" + (f" · {last:%H:%M:%S}" if last else ""))
+
+# =========================================================
+# ================ E-POSTA / İMZA =========================
+# =========================================================
+SIGNATURE_PROFILES = {
+    "admin": {
+        "full_name": "KEMAL İLKER ÇELİKKALKAN",
+        "title": "Export Manager",
+    },
+    "export1": {
+        "full_name": "HÜSEYİN POLAT",
+        "title": "Export Area Sales Manager",
+    },
+    "Boss": {
+        "full_name": "FERHAT ŞEKEROĞLU",
+        "title": "MEMBER OF BOARD",
+    },
+}
+
+SIGNATURE_BASE_INFO = {
+    "company": "EXPO-CRM GROUP",
+    "department": "International Sales & Export",
+    "phone": "+90 (342) 337 09 09",
+    # (YENİ) e-posta adresini secrets'tan oku; yoksa eski varsayılana düş
+    "email": st.secrets.get("mail", {}).get("from_email", "todo@sekeroglugroup.com"),
+    "website": "https://www.sekeroglugroup.com",
+    "address": "Sanayi mah. 60129 No'lu Cad. No : 7 Şehitkamil / Gaziantep",
+}
+
+def _active_signature_info():
+    user = st.session_state.get("user") if "user" in st.session_state else None
+    info = SIGNATURE_PROFILES.get(user)
+    if not info:
+        info = {
+            "full_name": "EXPO-CRM EXPORT TEAM",
+            "title": "International Sales Representative",
+        }
+    return info
+
+def text_signature() -> str:
+    info = _active_signature_info()
+    base = SIGNATURE_BASE_INFO
+    lines = [
+        info["full_name"],
+        info["title"],
+        f"{base['company']} | {base['department']}",
+        f"Telefon: {base['phone']}",
+        f"E-posta: {base['email']}",
+        f"Web: {base['website']}",
+        f"Adres: {base['address']}",
+    ]
+    return "\n".join(lines)
+
+def html_signature() -> str:
+    info = _active_signature_info()
+    base = SIGNATURE_BASE_INFO
+    name = html.escape(info["full_name"])
+    title = html.escape(info["title"])
+    company = html.escape(base["company"])
+    department = html.escape(base["department"])
+    phone = html.escape(base["phone"])
+    email = html.escape(base["email"])
+    website = html.escape(base["website"])
+    address = html.escape(base["address"])
+
+    return (
+        "<table cellpadding=\"0\" cellspacing=\"0\" style=\"font-family:Arial,sans-serif;color:#333333;\">"
+        f"<tr><td style='font-size:16px;font-weight:bold;color:#219A41;'>{name}</td></tr>"
+        f"<tr><td style='font-size:13px;color:#555555;'>{title}</td></tr>"
+        "<tr><td style='padding-top:10px;font-size:13px;color:#333333;'>"
+        f"<div style='font-weight:bold;color:#219A41;'>{company}</div>"
+        f"<div>{department}</div>"
+        f"<div>Telefon: {phone}</div>"
+        f"<div>E-posta: <a href='mailto:{email}' style='color:#219A41;text-decoration:none;'>{email}</a></div>"
+        f"<div>Web: <a href='{website}' style='color:#219A41;text-decoration:none;'>{website}</a></div>"
+        f"<div>{address}</div>"
+        "</td></tr>"
+        "</table>"
+    )
+
+def _smtp_credentials():
+    from_email = st.secrets.get("mail", {}).get("from_email", "todo@sekeroglugroup.com")
+    app_password = st.secrets.get("mail", {}).get("app_password", None)
+    if not app_password:
+        st.warning("Uyarı: SMTP app_password secrets'ta tanımlı değil. Gmail SMTP girişinde hata alabilirsiniz.")
+    return from_email, app_password
+
+# ---------------- SMTP bağlantı havuzu ----------------
+# Oturum açılmış SMTP_SSL bağlantıları işlem boyunca yeniden kullanılır; ardışık gönderimlerde
+# TLS el sıkışması ve AUTH tekrarlanmaz. Bir süre boşta kalan bağlantı NOOP ile yoklanır,
+# sunucunun kapattığı bağlantı atılıp yenisi açılır.
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+SMTP_POOL_SIZE = int(st.secrets.get("mail", {}).get("pool_size", 2))         # boşta tutulan en fazla bağlantı
+SMTP_IDLE_TIMEOUT = float(st.secrets.get("mail", {}).get("idle_seconds", 240))  # daha uzun boşta kalan kapatılır
+SMTP_NOOP_AFTER = 15  # bu kadar saniyeden uzun boşta kalan bağlantı kullanılmadan önce yoklanır
+
+def _close_smtp(smtp):
+    try:
+        smtp.quit()
+    except Exception:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+def _close_smtp_pool(pool: dict):
+    with pool["lock"]:
+        idle, pool["idle"] = pool["idle"], []
+    for _user, smtp, _ts in idle:
+        _close_smtp(smtp)
+
+@st.cache_resource
+def _smtp_pool():
+    pool = {"lock": threading.Lock(), "idle": []}  # idle: [(kullanıcı, bağlantı, son kullanım)]
+    atexit.register(_close_smtp_pool, pool)
+    return pool
+
+def _checkout_smtp(pool: dict, from_email: str, password: str):
+    """Havuzdan sağlam bir bağlantı al; yoksa yenisini aç ve oturum aç."""
+    now = time.monotonic()
+    while True:
+        with pool["lock"]:
+            idx = next((i for i, (user, _s, _t) in enumerate(pool["idle"]) if user == from_email), None)
+            entry = pool["idle"].pop(idx) if idx is not None else None
+        if entry is None:
+            break
+        _user, smtp, last_used = entry
+        if now - last_used > SMTP_IDLE_TIMEOUT:
+            _close_smtp(smtp)
+            continue
+        if now - last_used > SMTP_NOOP_AFTER:
+            try:
+                if smtp.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP başarısız")
+            except Exception:
+                _close_smtp(smtp)
+                continue
+        return smtp
+    smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=60)
+    try:
+        smtp.login(from_email, password)
+    except Exception:
+        _close_smtp(smtp)
+        raise
+    return smtp
+
+def _checkin_smtp(pool: dict, from_email: str, smtp):
+    with pool["lock"]:
+        if len(pool["idle"]) < SMTP_POOL_SIZE:
+            pool["idle"].append((from_email, smtp, time.monotonic()))
+            return
+    _close_smtp(smtp)
+
+def smtp_send_message(msg, from_email: str, password: str, to_addrs=None, pool: dict = None):
+    """Mesajı havuzdaki bir bağlantıyla gönder; kopmuş bağlantıda bir kez yeni bağlantıyla dener.
+
+    msg bir EmailMessage ya da önceden serileştirilmiş bytes olabilir (bytes için to_addrs zorunlu).
+    Reddedilen alıcıları {adres: (kod, yanıt)} olarak döndürür.
+    """
+    if not password:
+        raise RuntimeError("SMTP app_password secrets'ta yok. Lütfen [mail].app_password giriniz.")
+    pool = pool or _smtp_pool()
+    for deneme in range(2):
+        smtp = _checkout_smtp(pool, from_email, password)
+        try:
+            if isinstance(msg, (bytes, bytearray)):
+                result = smtp.sendmail(from_email, to_addrs, msg)
+            else:
+                result = smtp.send_message(msg, to_addrs=to_addrs)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+            _close_smtp(smtp)
+            if deneme:
+                raise
+            continue
+        except smtplib.SMTPException:
+            # Sunucu yanıt verdi: bağlantı sağlam, RSET ile temizleyip havuza geri koy
+            try:
+                smtp.rset()
+                _checkin_smtp(pool, from_email, smtp)
+            except Exception:
+                _close_smtp(smtp)
+            raise
+        except Exception:
+            _close_smtp(smtp)
+            raise
+        _checkin_smtp(pool, from_email, smtp)
+        return result
+
+def build_email_message(from_email, subject, body, attachments=None, fallback_txt_path=None):
+    """Düz metin gövdeli, ekli mesaj. Alıcılar zarfta verilir; To başlığı gönderenin kendisidir."""
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = from_email
+    msg["To"] = from_email
+    msg.set_content(body)
+
+    prepared_attachments = attachments or []
+    for attachment in prepared_attachments:
+        if not isinstance(attachment, (tuple, list)) or len(attachment) != 3:
+            continue
+        filename, content_bytes, mime_type = attachment
+        if isinstance(content_bytes, memoryview):
+            content_bytes = content_bytes.tobytes()
+        if not isinstance(content_bytes, (bytes, bytearray)):
+            content_bytes = bytes(content_bytes)
+        mime = (mime_type or "application/octet-stream").strip()
+        if "/" in mime:
+            maintype, subtype = mime.split("/", 1)
+        else:
+            maintype, subtype = mime, "octet-stream"
+        msg.add_attachment(
+           bytes(content_bytes),
+            maintype=maintype,
+            subtype=subtype,
+            filename=filename,
+        )
+
+    if not prepared_attachments and fallback_txt_path:
+        try:
+            with open(fallback_txt_path, "rb") as f:
+                msg.add_attachment(
+                    f.read(),
+                    maintype="text",
+                    subtype="plain",
+                    filename=os.path.basename(fallback_txt_path) or "yeni_cari.txt",
+                )
+        except FileNotFoundError:
+            pass
+    return msg
+
+def send_email(to_email, subject, body, attachments=None, fallback_txt_path=None):
+    from_email, password = _smtp_credentials()
+
+    if isinstance(to_email, (str, bytes)):
+        recipients = [to_email.decode() if isinstance(to_email, bytes) else to_email]
+    else:
+        recipients = [addr for addr in to_email if addr]
+
+    if not recipients:
+        raise ValueError("En az bir geçerli alıcı e-posta adresi sağlanmalıdır.")
+
+    msg = build_email_message(from_email, subject, body, attachments, fallback_txt_path)
+    msg["Bcc"] = ", ".join(recipients)
+    smtp_send_message(msg, from_email, password)
+
+def split_emails(email_series: pd.Series) -> pd.Series:
+    """Hücrelerdeki ayraçlı adresleri satır başına bir adres olacak şekilde aç (kaynak index korunur)."""
+    mails = email_series.dropna().astype(str).str.split(r"[;,\s]+", regex=True).explode().str.strip()
+    return mails[mails.notna() & (mails != "")]
+
+def extract_unique_emails(email_series: pd.Series) -> list:
+    if email_series is None:
+        return []
+    mails = split_emails(email_series)
+    keys = mails.str.lower()
+    # Büyük/küçük harf farkı olan tekrarlar: ilk yazılış korunur, küçük harfe göre sıralanır
+    unique = pd.DataFrame({"mail": mails.to_numpy(), "key": keys.to_numpy()}).drop_duplicates("key")
+    return unique.sort_values("key", kind="stable")["mail"].tolist()
+
+def build_fair_bulk_message(from_email, subject, body, attachments=None, embed_images=None, inline_cid_map=None):
+    """İmzalı, HTML alternatifli (isteğe bağlı gömülü görselli) toplu mail gövdesi."""
+    embed_images = EMBED_IMAGES if embed_images is None else bool(embed_images)
+    inline_cid_map = inline_cid_map or {}
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = from_email
+    msg["To"] = from_email
+
+    body_text = (body or "").strip()
+    if body_text:
+        plain_body = f"{body_text}\n\n{text_signature()}"
+    else:
+        plain_body = text_signature()
+    msg.set_content(plain_body)
+
+    escaped_body = html.escape(body_text).replace("\n", "<br>") if body_text else ""
+
+    attachments = attachments or []
+    inline_images = []
+    download_errors = []
+    other_attachments = []
+
+    for uploaded_file in attachments:
+        if uploaded_file is None:
+            continue
+        try:
+            file_bytes = uploaded_file.getvalue()
+        except Exception as exc:
+            download_errors.append(f"{getattr(uploaded_file, 'name', 'Dosya')} okunamadı: {exc}")
+            continue
+
+        maintype, subtype = "application", "octet-stream"
+        mime_type = getattr(uploaded_file, "type", "") or ""
+        if mime_type:
+            try:
+                maintype, subtype = mime_type.split("/", 1)
+            except ValueError:
+                maintype, subtype = mime_type, "octet-stream"
+
+        attachment_key = f"{uploaded_file.name}:{len(file_bytes)}"
+
+        if embed_images and maintype == "image":
+            cid = make_msgid()
+            cid = inline_cid_map.get(attachment_key, cid)
+            inline_images.append({
+                "data": file_bytes,
+                "maintype": maintype,
+                "subtype": subtype,
+                "filename": uploaded_file.name,
+                "cid": cid,
+                "key": attachment_key,
+            })
+        else:
+            other_attachments.append({
+                "data": file_bytes,
+                "maintype": maintype,
+                "subtype": subtype,
+                "filename": uploaded_file.name,
+            })
+
+    if download_errors:
+        raise RuntimeError("; ".join(download_errors))
+
+    image_blocks = []
+    if embed_images and inline_images:
+        for image in inline_images:
+            cid_clean = image["cid"].strip("<>")
+            alt_text = html.escape(image["filename"]) if image["filename"] else "Görsel"
+            image_blocks.append(
+                "<div style='margin-top:12px; text-align:center;'>"
+                f"<img src=\"cid:{cid_clean}\" alt=\"{alt_text}\" style='max-width:100%; height:auto;'>"
+                "</div>"
+            )
+
+    html_sections = ["<div style='font-family:Arial,sans-serif;color:#333333;'>"]
+    if escaped_body:
+        html_sections.append(escaped_body)
+    if image_blocks:
+        html_sections.extend(image_blocks)
+    html_sections.append("</div>")
+    html_sections.append(f"<div style='margin-top:16px;'>{html_signature()}</div>")
+    html_body = "".join(html_sections)
+
+    html_part = msg.add_alternative(html_body, subtype="html")
+
+    for image in inline_images:
+        html_part.add_related(
+            image["data"],
+            maintype=image["maintype"],
+            subtype=image["subtype"],
+            cid=image["cid"],
+            filename=image["filename"] or None,
+        )
+
+    for attachment in other_attachments:
+        msg.add_attachment(
+            attachment["data"],
+            maintype=attachment["maintype"],
+            subtype=attachment["subtype"],
+            filename=attachment["filename"],
+        )
+    return msg
+
+# ---------------- Toplu gönderim motoru ----------------
+# Alıcılar MAIL_BULK_CHUNK_SIZE'lık gruplara bölünür; her grup aynı (bir kez serileştirilmiş)
+# MIME gövdesiyle ayrı bir SMTP zarfı olarak gider. Dakikadaki alıcı sayısı
+# MAIL_BULK_PER_MINUTE'u aşmayacak şekilde beklenir. Bir grubun hatası diğerlerini durdurmaz.
+# Gönderimi aşağıdaki kalıcı mail kuyruğunun worker'ı yapar.
+MAIL_BULK_CHUNK_SIZE = max(1, int(st.secrets.get("mail", {}).get("bulk_chunk_size", 50)))
+MAIL_BULK_PER_MINUTE = max(1, int(st.secrets.get("mail", {}).get("bulk_recipients_per_minute", 300)))
+
+def serialize_message(msg) -> bytes:
+    """Mesajı SMTP'ye hazır bytes'a çevir (Bcc başlığı zarfta kalır, gövdeye yazılmaz)."""
+    msg = copy.copy(msg)
+    del msg["Bcc"]
+    return msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+
+def _wait_for_rate(window: list, count: int, per_minute: int):
+    """Son 60 sn'de gönderilen alıcı sayısı + count sınırı aşmayana kadar bekle."""
+    while True:
+        now = time.monotonic()
+        while window and now - window[0][0] >= 60:
+            window.pop(0)
+        if not window or sum(n for _t, n in window) + count <= per_minute:
+            return
+        time.sleep(60 - (now - window[0][0]))
+
+def _send_chunk(data: bytes, chunk, from_email: str, password: str, pool: dict = None):
+    """Bir alıcı grubunu gönder ve alıcıları sınıflandır: {"sent": [...], "failed": {...}, "retry": {...}}.
+
+    5xx yanıtlar kalıcı hata sayılır; 4xx yanıtlar ve bağlantı hataları tekrar denenir.
+    """
+    result = {"sent": [], "failed": {}, "retry": {}}
+
+    def _refused(refused: dict):
+        for addr, (code, resp) in refused.items():
+            hedef = result["failed"] if code >= 500 else result["retry"]
+            hedef[addr] = f"{code} {resp!r}"
+
+    try:
+        refused = smtp_send_message(data, from_email, password, to_addrs=chunk, pool=pool) or {}
+        _refused(refused)
+        result["sent"] = [addr for addr in chunk if addr not in refused]
+    except smtplib.SMTPRecipientsRefused as exc:
+        _refused(exc.recipients)
+    except smtplib.SMTPResponseException as exc:
+        hedef = result["failed"] if exc.smtp_code >= 500 else result["retry"]
+        hedef.update({addr: f"{exc.smtp_code} {exc.smtp_error!r}" for addr in chunk})
+    except Exception as exc:
+        result["retry"].update({addr: f"{type(exc).__name__}: {exc}" for addr in chunk})
+    return result
+
+# ---------------- Kalıcı mail kuyruğu ----------------
+# Toplu gönderimler SQLite'taki kuyruğa yazılır ve arka plandaki tek bir worker thread tarafından
+# gruplar halinde gönderilir; sayfa hemen döner. Her alıcının durumu (queued/sent/failed/retrying)
+# kalıcıdır, süreç yeniden başlarsa gönderim kaldığı yerden sürer. Gönderim ile durum kaydı
+# arasında süreç düşerse o grup bir kez daha gidebilir.
+MAIL_QUEUE_PATH = st.secrets.get("mail", {}).get("queue_path", "mail_queue.db")
+MAIL_MAX_ATTEMPTS = 5
+MAIL_RETRY_MAX_BACKOFF = 300
+MAIL_QUEUE_KEEP_DAYS = 30
+MAIL_WORKER_MAX_BACKOFF = 60  # worker hatasından sonra en fazla bu kadar beklenir (sn)
+
+def _next_mail_chunk(mq: dict):
+    """Sıradaki işin gönderime hazır ilk grubu: (iş, adresler) ya da (None, bekleme süresi)."""
+    now = time.time()
+    with mq["lock"]:
+        conn = mq["conn"]
+        row = conn.execute(
+            "SELECT j.id, j.from_email, j.message FROM mail_recipients r JOIN mail_jobs j ON j.id = r.job_id "
+            "WHERE r.state IN ('queued', 'retrying') AND r.next_at <= ? ORDER BY j.created_at LIMIT 1",
+            (now,),
+        ).fetchone()
+        if row is None:
+            nxt = conn.execute(
+                "SELECT MIN(next_at) FROM mail_recipients WHERE state IN ('queued', 'retrying')"
+            ).fetchone()[0]
+            return None, (max(1.0, nxt - now) if nxt else None)
+        chunk = [a for (a,) in conn.execute(
+            "SELECT address FROM mail_recipients WHERE job_id = ? AND state IN ('queued', 'retrying') "
+            "AND next_at <= ? ORDER BY seq LIMIT ?",
+            (row[0], now, min(MAIL_BULK_CHUNK_SIZE, MAIL_BULK_PER_MINUTE)),
+        )]
+    return row, chunk
+
+def _record_mail_chunk(mq: dict, job_id: str, result: dict):
+    now = time.time()
+    with mq["lock"]:
+        conn = mq["conn"]
+        conn.execute("BEGIN")
+        conn.executemany(
+            "UPDATE mail_recipients SET state = 'sent', error = NULL, attempts = attempts + 1, updated_at = ? "
+            "WHERE job_id = ? AND address = ?",
+            [(now, job_id, a) for a in result["sent"]],
+        )
+        conn.executemany(
+            "UPDATE mail_recipients SET state = 'failed', error = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE job_id = ? AND address = ?",
+            [(err, now, job_id, a) for a, err in result["failed"].items()],
+        )
+        for a, err in result["retry"].items():
+            attempts = conn.execute(
+                "SELECT attempts FROM mail_recipients WHERE job_id = ? AND address = ?", (job_id, a)
+            ).fetchone()[0] + 1
+            if attempts >= MAIL_MAX_ATTEMPTS:
+                state, next_at = "failed", now
+            else:
+                state, next_at = "retrying", now + min(MAIL_RETRY_MAX_BACKOFF, 5 * 2 ** attempts)
+            conn.execute(
+                "UPDATE mail_recipients SET state = ?, error = ?, attempts = ?, next_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND address = ?",
+                (state, err, attempts, next_at, now, job_id, a),
+            )
+        conn.execute("COMMIT")
+
+def _mail_worker_step(mq: dict, window: list):
+    """Sıradaki grubu gönderip sonucunu kaydet; iş yoksa yenisi gelene kadar bekle."""
+    job, chunk = _next_mail_chunk(mq)
+    if job is None:
+        with mq["cond"]:
+            if not mq["wakeup"]:
+                mq["cond"].wait(chunk)
+            mq["wakeup"] = False
+        return
+    job_id, from_email, data = job
+    from_email_cfg, password = mq["credentials"]
+    if not password:
+        result = {"sent": [], "retry": {},
+                  "failed": {a: "SMTP app_password secrets'ta yok." for a in chunk}}
+    else:
+        _wait_for_rate(window, len(chunk), MAIL_BULK_PER_MINUTE)
+        result = _send_chunk(bytes(data), chunk, from_email or from_email_cfg, password, mq["smtp"])
+        window.append((time.monotonic(), len(chunk)))
+    _record_mail_chunk(mq, job_id, result)
+
+def _mail_worker(mq: dict):
+    """Kuyruktaki alıcıları gruplar halinde, dakika sınırına uyarak gönderir.
+
+    Bir turdaki hata thread'i durdurmaz: kaydedilir, beklenir ve döngü sürer.
+    """
+    window, errors = [], 0
+    while True:
+        try:
+            _mail_worker_step(mq, window)
+        except Exception as exc:
+            traceback.print_exc()
+            with mq["lock"]:
+                try:
+                    if mq["conn"].in_transaction:
+                        mq["conn"].execute("ROLLBACK")
+                except Exception:
+                    pass
+            errors += 1
+            with mq["cond"]:
+                mq["error"] = (datetime.datetime.now(), f"{type(exc).__name__}: {exc}")
+                mq["cond"].wait(min(MAIL_WORKER_MAX_BACKOFF, 2 ** errors))
+            continue
+        if errors:
+            errors = 0
+            with mq["cond"]:
+                mq["error"] = None
+
+@st.cache_resource
+def _mail_queue():
+    conn = sqlite3.connect(MAIL_QUEUE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS mail_jobs ("
+        "id TEXT PRIMARY KEY, created_at REAL, label TEXT, user TEXT, from_email TEXT, message BLOB)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS mail_recipients ("
+        "job_id TEXT NOT NULL, seq INTEGER, address TEXT NOT NULL, state TEXT NOT NULL, "
+        "attempts INTEGER DEFAULT 0, error TEXT, next_at REAL DEFAULT 0, updated_at REAL, "
+        "PRIMARY KEY (job_id, address))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_mail_recipients_state ON mail_recipients (state, next_at)")
+    # Eski, tamamlanmış işleri temizle
+    eski = time.time() - MAIL_QUEUE_KEEP_DAYS * 86400
+    conn.execute(
+        "DELETE FROM mail_recipients WHERE job_id IN (SELECT id FROM mail_jobs WHERE created_at < ?) "
+        "AND job_id NOT IN (SELECT job_id FROM mail_recipients WHERE state IN ('queued', 'retrying'))",
+        (eski,),
+    )
+    conn.execute("DELETE FROM mail_jobs WHERE id NOT IN (SELECT DISTINCT job_id FROM mail_recipients)")
+    mail_cfg = st.secrets.get("mail", {})
+    mq = {
+        "conn": conn,
+        "lock": threading.Lock(),
+        "cond": threading.Condition(),
+        "wakeup": False,  # bekleme başlamadan gelen yeni işler kaçmasın
+        "error": None,  # worker'ın son hatası: (zaman, mesaj); başarılı turda temizlenir
+        # Worker thread Streamlit bağlamı dışında çalışır; bağımlılıkları doğrudan tutar
+        "smtp": _smtp_pool(),
+        "credentials": (mail_cfg.get("from_email", "todo@sekeroglugroup.com"), mail_cfg.get("app_password")),
+    }
+    threading.Thread(target=_mail_worker, args=(mq,), name="mail-queue", daemon=True).start()
+    return mq
+
+def enqueue_mail_job(msg, recipients, label: str) -> str:
+    """Mesajı alıcılarıyla kuyruğa yaz ve worker'ı uyandır; iş ID'sini döndürür."""
+    benzersiz = {}
+    for adres in recipients:
+        adres = str(adres).strip()
+        if adres:
+            benzersiz.setdefault(adres.lower(), adres)  # ilk yazılış korunur
+    benzersiz = list(benzersiz.values())
+    if not benzersiz:
+        raise ValueError("E-posta alıcı listesi boş olamaz.")
+    mq = _mail_queue()
+    job_id = str(uuid.uuid4())
+    now = time.time()
+    with mq["lock"]:
+        conn = mq["conn"]
+        conn.execute("BEGIN")
+        conn.execute(
+            "INSERT INTO mail_jobs (id, created_at, label, user, from_email, message) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, now, label, st.session_state.get("user") or "", msg["From"], serialize_message(msg)),
+        )
+        conn.executemany(
+            "INSERT INTO mail_recipients (job_id, seq, address, state, next_at, updated_at) "
+            "VALUES (?, ?, ?, 'queued', 0, ?)",
+            [(job_id, i, a, now) for i, a in enumerate(benzersiz)],
+        )
+        conn.execute("COMMIT")
+    with mq["cond"]:
+        mq["wakeup"] = True
+        mq["cond"].notify_all()
+    return job_id
+
+def retry_failed_mail(job_id: str):
+    """İşin başarısız alıcılarını yeniden kuyruğa al."""
+    mq = _mail_queue()
+    with mq["lock"]:
+        mq["conn"].execute(
+            "UPDATE mail_recipients SET state = 'queued', attempts = 0, next_at = 0, error = NULL "
+            "WHERE job_id = ? AND state = 'failed'",
+            (job_id,),
+        )
+    with mq["cond"]:
+        mq["wakeup"] = True
+        mq["cond"].notify_all()
+
+def mail_queue_summary(limit: int = 10) -> pd.DataFrame:
+    """Son işler ve alıcı durum sayıları."""
+    mq = _mail_queue()
+    with mq["lock"]:
+        return pd.read_sql_query(
+            "SELECT j.id, j.created_at, j.label, j.user, COUNT(*) AS toplam, "
+            "SUM(r.state = 'sent') AS sent, SUM(r.state = 'failed') AS failed, "
+            "SUM(r.state = 'queued') AS queued, SUM(r.state = 'retrying') AS retrying "
+            "FROM mail_jobs j JOIN mail_recipients r ON r.job_id = j.id "
+            "GROUP BY j.id ORDER BY j.created_at DESC LIMIT ?",
+            mq["conn"], params=(limit,),
+        )
+
+def mail_job_failures(job_id: str) -> pd.DataFrame:
+    mq = _mail_queue()
+    with mq["lock"]:
+        return pd.read_sql_query(
+            "SELECT address AS 'E-posta', attempts AS 'Deneme', error AS 'Hata' FROM mail_recipients "
+            "WHERE job_id = ? AND state = 'failed' ORDER BY seq",
+            mq["conn"], params=(job_id,),
+        )
+
+def render_mail_queue_status():
+    """Kenar çubuğunda mail kuyruğu durum paneli."""
+    mq = _mail_queue()
+    with mq["cond"]:
+        hata = mq["error"]
+    ozet = mail_queue_summary()
+    aktif = ozet[(ozet["queued"] + ozet["retrying"]) > 0] if not ozet.empty else ozet
+    baslik = f"📨 Mail Kuyruğu ({len(aktif)} aktif)" if len(aktif) else "📨 Mail Kuyruğu"
+    if hata:
+        baslik += " · ⚠️"
+    with st.sidebar.expander(baslik, expanded=bool(len(aktif)) or bool(hata)):
+        if hata:
+            st.error(f"Gönderim durdu, tekrar denenecek · {hata[0]:%H:%M:%S}: {hata[1]}")
+        if ozet.empty:
+            st.caption("Kuyrukta iş yok.")
+            return
+        st.button("Durumu yenile", key="mail_kuyruk_yenile")
+        for row in ozet.itertuples(index=False):
+            zaman = datetime.datetime.fromtimestamp(row.created_at).strftime("%d.%m %H:%M")
+            st.markdown(f"**{html.escape(str(row.label))}** · {zaman}")
+            st.progress(
+                (row.sent + row.failed) / row.toplam,
+                text=f"{row.sent}/{row.toplam} gönderildi"
+                     + (f" · {row.queued + row.retrying} bekliyor" if row.queued + row.retrying else "")
+                     + (f" · {row.failed} hata" if row.failed else ""),
+            )
+            if row.failed:
+                if st.button("Başarısızları yeniden dene", key=f"mail_retry_{row.id}"):
+                    retry_failed_mail(row.id)
+                    st.rerun()
+                with st.popover("Hatalar"):
+                    st.dataframe(mail_job_failures(row.id), use_container_width=True, hide_index=True)
+
+def send_fair_bulk_email(to_emails, subject, body, attachments=None, embed_images=None, inline_cid_map=None,
+                         label="Toplu mail"):
+    """Toplu maili kuyruğa al; gönderim arka planda yapılır. İş ID'sini döndürür."""
+    if not to_emails:
+        raise ValueError("E-posta alıcı listesi boş olamaz.")
+    from_email, _password = _smtp_credentials()
+    msg = build_fair_bulk_message(from_email, subject, body, attachments, embed_images, inline_cid_map)
+    return enqueue_mail_job(msg, to_emails, f"{label}: {subject}")
+
+# =========================================================
+# ================ SAĞLIK KONTROLÜ ========================
+# =========================================================
+# Drive ve SMTP erişimi arka planda, HEALTH_CHECK_INTERVAL aralıklarla ya da arayüzden
+# istenince yoklanır. Sonuçlar gecikme geçmişiyle bellekte tutulur; paneli çizmek ağ
+# isteği yapmaz.
+HEALTH_CHECK_INTERVAL = float(st.secrets.get("health_check_interval_seconds", 600))  # 0: yalnızca istenince
+HEALTH_HISTORY_SIZE = 50
+HEALTH_WAIT_SECONDS = 20  # "Şimdi kontrol et" sonucu en fazla bu kadar beklenir
+
+def _probe_drive(hc: dict) -> str:
+    """Çalışma kitabının yalnızca başlığını çek (tam metadata yerine tek alan)."""
+    gfile = hc["drive"].CreateFile({"id": hc["file_id"], "supportsAllDrives": True})
+    gfile.FetchMetadata(fields="id,title")
+    return gfile.get("title") or ""
+
+def _probe_smtp(hc: dict) -> str:
+    """Havuzdan bir bağlantı alıp NOOP gönder; gerekirse yeni bağlantı açılır ve oturum açılır."""
+    from_email, password = hc["credentials"]
+    if not password:
+        raise RuntimeError("SMTP app_password secrets'ta yok.")
+    smtp = _checkout_smtp(hc["smtp"], from_email, password)
+    try:
+        code, resp = smtp.noop()
+        if code != 250:
+            raise smtplib.SMTPResponseException(code, resp)
+    except Exception:
+        _close_smtp(smtp)
+        raise
+    _checkin_smtp(hc["smtp"], from_email, smtp)
+    return f"{SMTP_HOST}:{SMTP_PORT} · {from_email}"
+
+HEALTH_PROBES = {"Drive": _probe_drive, "SMTP": _probe_smtp}
+
+def _health_worker(hc: dict):
+    """Yoklamaları zamanlamaya göre ya da istek gelince sırayla çalıştırır."""
+    cond = hc["cond"]
+    while True:
+        with cond:
+            if not hc["wakeup"]:
+                cond.wait(HEALTH_CHECK_INTERVAL if HEALTH_CHECK_INTERVAL > 0 else None)
+            if not hc["wakeup"] and HEALTH_CHECK_INTERVAL <= 0:
+                continue
+            hc["wakeup"] = False
+            hc["running"] = True
+        for name, probe in HEALTH_PROBES.items():
+            started = time.monotonic()
+            try:
+                ok, detail, error = True, probe(hc), None
+            except Exception as exc:
+                ok, detail, error = False, "", f"{type(exc).__name__}: {exc}"
+            sonuc = {
+                "ok": ok,
+                "latency_ms": (time.monotonic() - started) * 1000,
+                "checked_at": datetime.datetime.now(),
+                "detail": detail,
+                "error": error,
+            }
+            with cond:
+                hc["results"][name] = sonuc
+                hc["history"][name].append(sonuc)
+        with cond:
+            hc["running"] = False
+            hc["runs"] += 1
+            cond.notify_all()
+
+@st.cache_resource
+def _health_checker():
+    mail_cfg = st.secrets.get("mail", {})
+    hc = {
+        "cond": threading.Condition(),
+        "wakeup": True,  # ilk yoklama açılışta arka planda yapılır
+        "running": False,
+        "runs": 0,
+        "results": {},
+        "history": {name: deque(maxlen=HEALTH_HISTORY_SIZE) for name in HEALTH_PROBES},
+        # Worker thread Streamlit bağlamı dışında çalışır; bağımlılıkları doğrudan tutar
+        "drive": drive,
+        "file_id": EXCEL_FILE_ID,
+        "smtp": _smtp_pool(),
+        "credentials": (mail_cfg.get("from_email", "todo@sekeroglugroup.com"), mail_cfg.get("app_password")),
+    }
+    threading.Thread(target=_health_worker, args=(hc,), name="health-check", daemon=True).start()
+    return hc
+
+def request_health_check(timeout: float = None) -> bool:
+    """Yoklamayı hemen başlat; timeout verilirse bitmesini bekle (bitmediyse False)."""
+    hc = _health_checker()
+    with hc["cond"]:
+        hedef = hc["runs"] + (2 if hc["running"] else 1)  # süren tur, istekten önce başlamış olabilir
+        hc["wakeup"] = True
+        hc["cond"].notify_all()
+        if timeout is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while hc["runs"] < hedef:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            hc["cond"].wait(remaining)
+    return True
+
+def health_status():
+    """Son yoklama sonuçları ve gecikme geçmişi: ({ad: sonuç}, {ad: [sonuçlar]}, sürüyor mu)."""
+    hc = _health_checker()
+    with hc["cond"]:
+        return dict(hc["results"]), {name: list(h) for name, h in hc["history"].items()}, hc["running"]
+
+def render_health_status():
+    """Drive / SMTP durum paneli; yalnızca bellekteki sonuçları gösterir."""
+    sonuclar, gecmis, suruyor = health_status()
+    hatali = [name for name, r in sonuclar.items() if not r["ok"]]
+    baslik = "🔎 Sistem Durumu" + (f" · ⚠️ {', '.join(hatali)}" if hatali else "")
+    with st.expander(baslik):
+        if st.button("Şimdi kontrol et", key="health_check_now"):
+            with st.spinner("Drive ve SMTP yoklanıyor…"):
+                if not request_health_check(timeout=HEALTH_WAIT_SECONDS):
+                    st.warning("Kontrol sürüyor; sonuç birazdan burada görünecek.")
+            sonuclar, gecmis, suruyor = health_status()
+        elif suruyor:
+            st.caption("⏳ Kontrol sürüyor…")
+        now = datetime.datetime.now()
+        for name in HEALTH_PROBES:
+            r = sonuclar.get(name)
+            if r is None:
+                st.caption(f"{name}: henüz kontrol edilmedi.")
+                continue
+            yas = int((now - r["checked_at"]).total_seconds())
+            zaman = f"{r['checked_at']:%H:%M:%S} ({yas} sn önce)"
+            if r["ok"]:
+                st.success(f"{name} erişimi OK · {r['latency_ms']:.0f} ms · {zaman}" + (f" · {r['detail']}" if r["detail"] else ""))
+            else:
+                st.error(f"{name} erişimi HATA · {zaman}: {r['error']}")
+        if any(len(h) > 1 for h in gecmis.values()) and st.toggle("Gecikme geçmişi", key="health_history"):
+            seriler = {
+                name: pd.Series(
+                    [h["latency_ms"] if h["ok"] else None for h in hist],
+                    index=[h["checked_at"] for h in hist],
+                )
+                for name, hist in gecmis.items() if hist
+            }
+            st.line_chart(pd.DataFrame(seriler))
+            st.caption(f"Gecikme (ms), son {HEALTH_HISTORY_SIZE} yoklama; boşluklar başarısız denemelerdir.")
@@ -0,0 +1,398 @@
+# ETA İzleme sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import os
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    ETA_COLUMNS,
+    drive_get_or_create_folder_by_name,
+    drive_safe_name,
+    list_drive_folder,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+    upload_or_reuse_drive_file,
+)
+
+def render():
+    df_proforma = table_frame("df_proforma")
+    df_eta = table_frame("df_eta")
+
+    ### ===========================
+    ### --- ETA İZLEME MENÜSÜ ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>ETA İzleme</h2>", unsafe_allow_html=True)
+
+    # ---- Sabitler ----
+    ROOT_EXPORT_FOLDER_ID = "14FTE1oSeIeJ6Y_7C0oQyZPKC8dK8hr1J"  # İhracat Evrakları ana klasör ID (MY DRIVE)
+
+    # ---- Kolon sırası: ETA kolonları önde ----
+    extra_eta_cols = [col for col in df_eta.columns if col not in ETA_COLUMNS]
+    df_eta = df_eta.reindex(columns=ETA_COLUMNS + extra_eta_cols, fill_value="")            
+
+    # ---- Yardımcılar ----
+    def resolve_folder_date(musteri: str, proforma_no: str) -> datetime.date:
+        """
+        Klasör adı için kullanılacak tarihi belirler:
+        1) Proforma 'Sevk Tarihi' varsa o,
+        2) yoksa ETA kaydındaki 'Sevk Tarihi',
+        3) yoksa ilgili ETA kaydındaki 'ETA Tarihi',
+        4) o da yoksa bugün.
+        """
+        # Sevk Tarihi
+        pr_mask = (df_proforma["Müşteri Adı"] == musteri) & (df_proforma["Proforma No"] == proforma_no)
+        sevk_ts = None
+        if pr_mask.any():
+            try:
+                sevk_ts = pd.to_datetime(df_proforma.loc[pr_mask, "Sevk Tarihi"].values[0], errors="coerce")
+            except Exception:
+                sevk_ts = None
+        if pd.notnull(sevk_ts):
+            try:
+                return sevk_ts.date()
+            except Exception:
+                pass
+
+        # ETA Sevk Tarihi
+        eta_mask = (df_eta["Müşteri Adı"] == musteri) & (df_eta["Proforma No"] == proforma_no)
+        eta_sevk_ts = None
+        if eta_mask.any():
+            try:
+                eta_sevk_ts = pd.to_datetime(df_eta.loc[eta_mask, "Sevk Tarihi"].values[0], errors="coerce")
+            except Exception:
+                eta_sevk_ts = None
+        if pd.notnull(eta_sevk_ts):
+            try:
+                return eta_sevk_ts.date()
+            except Exception:
+                pass
+
+        # ETA Tarihi        
+        eta_ts = None
+        if eta_mask.any():
+            try:
+                eta_ts = pd.to_datetime(df_eta.loc[eta_mask, "ETA Tarihi"].values[0], errors="coerce")
+            except Exception:
+                eta_ts = None
+        if pd.notnull(eta_ts):
+            try:
+                return eta_ts.date()
+            except Exception:
+                pass
+
+        # Default: bugün
+        return datetime.date.today()
+
+    def get_loading_photos_folder(musteri_adi: str, proforma_no: str, fallback_date: datetime.date) -> str:
+        """
+        Ana klasör altında <Müşteri_Adi>_<Proforma_No> / Yükleme Resimleri hiyerarşisini hazırlar ve döndürür.
+        Proforma numarası yoksa tarih tabanlı bir isimlendirmeye geri döner.
+        """
+        if not ROOT_EXPORT_FOLDER_ID:
+            return ""
+
+        musteri_parca = drive_safe_name(musteri_adi)
+        proforma_parca = drive_safe_name(proforma_no)
+        if not proforma_parca:
+            proforma_parca = fallback_date.strftime('%Y-%m-%d')
+
+        folder_name = f"{musteri_parca}_{proforma_parca}" if musteri_parca else proforma_parca
+        parent = drive_get_or_create_folder_by_name(folder_name, ROOT_EXPORT_FOLDER_ID)
+        if not parent:
+            return ""
+        yukleme = drive_get_or_create_folder_by_name("Yükleme Resimleri", parent)
+        return yukleme
+
+    # ==== SEVKEDİLENLER (Yolda) ====
+    sevkedilenler = df_proforma[df_proforma["Sevk Durumu"] == "Sevkedildi"].copy()
+    if sevkedilenler.empty:
+        st.info("Sevkedilmiş sipariş bulunmuyor.")
+    else:
+        # Seçim
+        secenekler = sevkedilenler[["Müşteri Adı", "Proforma No"]].drop_duplicates()
+        secenekler["sec_text"] = secenekler["Müşteri Adı"] + " - " + secenekler["Proforma No"]
+        selected = st.selectbox("Sevkedilen Sipariş Seç", secenekler["sec_text"])
+        selected_row = secenekler[secenekler["sec_text"] == selected].iloc[0]
+        sec_musteri = selected_row["Müşteri Adı"]
+        sec_proforma = selected_row["Proforma No"]
+
+        # === Klasör bilgisi (Sevk/ETA/bugün) + Müşteri adı ===
+        klasor_tarih = resolve_folder_date(sec_musteri, sec_proforma)
+        proforma_gosterim = ""
+        if pd.notna(sec_proforma):
+            proforma_gosterim = str(sec_proforma).strip()
+        if not proforma_gosterim:
+            proforma_gosterim = klasor_tarih.strftime('%Y-%m-%d')
+
+        # ========== YÜKLEME FOTOĞRAFLARI (Müşteri_Adi + Proforma → “Yükleme Resimleri”) ==========
+        st.markdown("#### Yükleme Fotoğrafları (Müşteri + Proforma bazlı)")
+
+        hedef_klasor = get_loading_photos_folder(sec_musteri, sec_proforma, klasor_tarih)
+        if not hedef_klasor:
+            st.error("Klasör hiyerarşisi oluşturulamadı.")
+        else:
+            # 1) Klasörü yeni sekmede aç butonu
+            drive_link = f"https://drive.google.com/drive/folders/{hedef_klasor}?usp=sharing"
+            st.markdown(f"[Klasörü yeni sekmede aç]({drive_link})")
+
+            # 2) Panel içinde gömülü görüntüleme – sadece gezinme
+            with st.expander(f"Panelde klasörü görüntüle – {sec_musteri} / {proforma_gosterim}"):
+                embed = f"https://drive.google.com/embeddedfolderview?id={hedef_klasor}#grid"
+                st.markdown(
+                    f'<iframe src="{embed}" width="100%" height="520" frameborder="0" '
+                    f'style="border:1px solid #eee; border-radius:12px;"></iframe>',
+                    unsafe_allow_html=True
+                )
+
+            # 3) Mevcut dosyaları say ve özetle (ilk 10 isim) – liste önbellekten, artımlı tazelenir
+            try:
+                mevcut_dosyalar = list_drive_folder(hedef_klasor)
+            except Exception as e:
+                mevcut_dosyalar = []
+                st.warning(f"Dosyalar listelenemedi: {e}")
+
+            if mevcut_dosyalar:
+                st.caption(f"Bu klasörde {len(mevcut_dosyalar)} dosya var.")
+                names = [f"- {f['title']}" for f in mevcut_dosyalar[:10]]
+                st.write("\n".join(names) if names else "")
+                if len(mevcut_dosyalar) > 10:
+                    st.write("…")
+
+            # 4) (OPSİYONEL) Dosya Ekle – duplike önleme (aynı isim ya da içerik SKIP)
+            with st.expander("Dosya Ekle (opsiyonel, duplike önleme)"):
+                files = st.file_uploader(
+                    "Yüklenecek dosyaları seçin",
+                    type=["pdf", "jpg", "jpeg", "png", "webp"],
+                    accept_multiple_files=True,
+                    key=f"yuk_resimleri_dedupe_{drive_safe_name(sec_musteri)}_{drive_safe_name(proforma_gosterim)}"
+                )
+
+                if files:
+                    var_olan_isimler = set(f["title"] for f in mevcut_dosyalar)
+                    yuklenen_say = 0
+                    atlanan = []
+                    for up in files:
+                        suffix = os.path.splitext(up.name)[1].lower() or ""
+                        base = os.path.splitext(up.name)[0]
+                        fname = drive_safe_name(base) + suffix
+
+                        if fname in var_olan_isimler:
+                            atlanan.append(f"{up.name}: aynı isimde dosya var")
+                            continue
+
+                        link, kopya_id = upload_or_reuse_drive_file(hedef_klasor, fname, up, f"{up.name} dosyası")
+                        if kopya_id:
+                            atlanan.append(f"{up.name}: atlandı, {kopya_id} ID'li dosyanın kopyası")
+                        elif link:
+                            yuklenen_say += 1
+                            var_olan_isimler.add(fname)
+
+                    if yuklenen_say:
+                        # Toast'lar yeniden çalıştırmadan sonra da görünür kalır
+                        st.toast(f"{yuklenen_say} yeni dosya yüklendi.")
+                        for a in atlanan:
+                            st.toast(a)
+                        st.rerun()
+                    elif atlanan:
+                        st.warning("Tüm dosyalar klasörde zaten mevcut (aynı isim ya da içerik).")
+                        st.info("\n".join(f"- {a}" for a in atlanan))
+
+        st.markdown("---")
+
+        # ========== ETA Düzenleme ==========
+        # Önceden ETA girilmiş mi?
+        filtre = (df_eta["Müşteri Adı"] == sec_musteri) & (df_eta["Proforma No"] == sec_proforma)
+        if filtre.any():
+            mevcut_eta = df_eta.loc[filtre, "ETA Tarihi"].values[0]
+            mevcut_aciklama = df_eta.loc[filtre, "Açıklama"].values[0],
+            mevcut_sevk = df_eta.loc[filtre, "Sevk Tarihi"].values[0]            
+        else:
+            mevcut_eta = ""
+            mevcut_aciklama = ""
+            mevcut_sevk = ""
+        proforma_mask = (df_proforma["Müşteri Adı"] == sec_musteri) & (df_proforma["Proforma No"] == sec_proforma)
+        mevcut_proforma_sevk = df_proforma.loc[proforma_mask, "Sevk Tarihi"].values[0] if proforma_mask.any() else ""
+
+        def _safe_date(value):
+            if value is None:
+                return None
+            if isinstance(value, str) and not value.strip():
+                return None
+            try:
+                ts = pd.to_datetime(value, errors="coerce")
+
+            except Exception:
+                return None
+            if pd.isna(ts):
+                return None
+            try:
+                return ts.date()
+            except Exception:
+                return None
+
+        with st.form("edit_eta"):
+            varsayilan_eta = _safe_date(mevcut_eta) or datetime.date.today()
+            varsayilan_sevk = _safe_date(mevcut_sevk) or _safe_date(mevcut_proforma_sevk) or datetime.date.today()
+            sevk_tarih = st.date_input("Sevk Tarihi", value=varsayilan_sevk)          
+            eta_tarih = st.date_input("ETA Tarihi", value=varsayilan_eta)
+            aciklama = st.text_area("Açıklama", value=mevcut_aciklama)
+            guncelle = st.form_submit_button("ETA'yı Kaydet/Güncelle")
+            ulasti = st.form_submit_button("Ulaştı")
+            geri_al = st.form_submit_button("Sevki Geri Al")
+
+            if guncelle:
+                if filtre.any():
+                    storage_update_rows("df_eta", df_eta.index[filtre], {
+                        "Sevk Tarihi": sevk_tarih,
+                        "ETA Tarihi": eta_tarih,
+                        "Açıklama": aciklama,
+                    })
+                else:
+                    new_row = {
+                        "Müşteri Adı": sec_musteri,
+                        "Proforma No": sec_proforma,
+                        "Sevk Tarihi": sevk_tarih,                        
+                        "ETA Tarihi": eta_tarih,
+                        "Açıklama": aciklama
+                    }
+                    storage_insert_row("df_eta", new_row)
+                if proforma_mask.any():
+                    storage_update_rows("df_proforma", df_proforma.index[proforma_mask], {"Sevk Tarihi": sevk_tarih})
+                st.success("ETA kaydedildi/güncellendi!")
+                st.rerun()
+
+            if ulasti:
+                # Ulaşıldı: ETA listesinden çıkar, proforma'da Sevk Durumu "Ulaşıldı" ve bugünün tarihi "Ulaşma Tarihi" olarak kaydet
+                storage_delete_rows("df_eta", df_eta.index[(df_eta["Müşteri Adı"] == sec_musteri) & (df_eta["Proforma No"] == sec_proforma)])
+                idx = df_proforma[(df_proforma["Müşteri Adı"] == sec_musteri) & (df_proforma["Proforma No"] == sec_proforma)].index
+                if len(idx) > 0:
+                    storage_update_rows("df_proforma", idx[0], {
+                        "Sevk Durumu": "Ulaşıldı",
+                        "Ulaşma Tarihi": datetime.date.today(),
+                    })
+                st.success("Sipariş 'Ulaşıldı' olarak işaretlendi ve ETA takibinden çıkarıldı!")
+                st.rerun()
+
+            if geri_al:
+                # Siparişi geri al: ETA'dan çıkar, proforma'da sevk durumunu boş yap (Sipariş Operasyonları'na döner)
+                storage_delete_rows("df_eta", df_eta.index[(df_eta["Müşteri Adı"] == sec_musteri) & (df_eta["Proforma No"] == sec_proforma)])
+                idx = df_proforma[(df_proforma["Müşteri Adı"] == sec_musteri) & (df_proforma["Proforma No"] == sec_proforma)].index
+                if len(idx) > 0:
+                    storage_update_rows("df_proforma", idx[0], {"Sevk Durumu": ""})
+                st.success("Sevkiyat geri alındı! Sipariş tekrar Sipariş Operasyonları'na gönderildi.")
+                st.rerun()
+
+    # ==== ETA TAKİP LİSTESİ ====
+    st.markdown("#### ETA Takip Listesi")
+    if not df_eta.empty:
+        df_eta_display = typed_table("df_eta", dayfirst=True)
+        df_eta_display["ETA Tarihi"] = df_eta_display["ETA Tarihi"].dt.normalize()
+        df_eta_display["Sevk Tarihi"] = df_eta_display["Sevk Tarihi"].dt.normalize()
+        today = pd.Timestamp.today().normalize()
+        df_eta_display["Kalan Gün"] = (df_eta_display["ETA Tarihi"] - today).dt.days
+        df_eta_display = df_eta_display.sort_values(["ETA Tarihi", "Müşteri Adı", "Proforma No"], ascending=[True, True, True])
+        tablo = df_eta_display[["Müşteri Adı", "Proforma No", "Sevk Tarihi", "ETA Tarihi", "Kalan Gün", "Açıklama"]].copy()
+        tablo["ETA Tarihi"] = tablo["ETA Tarihi"].dt.strftime("%d/%m/%Y")
+        tablo["Sevk Tarihi"] = tablo["Sevk Tarihi"].dt.strftime("%d/%m/%Y")
+        tablo["ETA Tarihi"] = tablo["ETA Tarihi"].fillna("").replace({"NaT": ""})
+        tablo["Sevk Tarihi"] = tablo["Sevk Tarihi"].fillna("").replace({"NaT": ""})
+        st.dataframe(tablo, use_container_width=True)
+
+        st.markdown("##### ETA Kaydı Sil")
+        silinecekler = df_eta.index.tolist()
+        sil_sec = st.selectbox("Silinecek Kaydı Seçin", options=silinecekler,
+            format_func=lambda i: f"{df_eta.at[i, 'Müşteri Adı']} - {df_eta.at[i, 'Proforma No']}")
+        if st.button("KAYDI SİL"):
+            storage_delete_rows("df_eta", sil_sec)
+            st.success("Seçilen ETA kaydı silindi!")
+            st.rerun()
+    else:
+        st.info("Henüz ETA kaydı yok.")
+
+    # ==== ULAŞANLAR (TESLİM EDİLENLER) ====
+    ulasanlar = typed_table("df_proforma")
+    ulasanlar = ulasanlar[ulasanlar["Sevk Durumu"] == "Ulaşıldı"]
+
+    if not ulasanlar.empty:
+        ulasanlar["sec_text"] = ulasanlar["Müşteri Adı"] + " - " + ulasanlar["Proforma No"]
+        st.markdown("#### Teslim Edilen Siparişlerde İşlemler")
+        selected_ulasan = st.selectbox("Sipariş Seçiniz", ulasanlar["sec_text"])
+        row = ulasanlar[ulasanlar["sec_text"] == selected_ulasan].iloc[0]
+
+        # Ulaşma tarihi düzenleme
+        try:
+            current_ulasma = pd.to_datetime(row.get("Ulaşma Tarihi", None)).date()
+            if pd.isnull(current_ulasma) or str(current_ulasma) == "NaT":
+                current_ulasma = datetime.date.today()
+        except Exception:
+            current_ulasma = datetime.date.today()
+
+        new_ulasma_tarih = st.date_input("Ulaşma Tarihi", value=current_ulasma, key="ulasan_guncelle")
+        if st.button("Ulaşma Tarihini Kaydet"):
+            idx = df_proforma[(df_proforma["Müşteri Adı"] == row["Müşteri Adı"]) & 
+                              (df_proforma["Proforma No"] == row["Proforma No"])].index
+            if len(idx) > 0:
+                storage_update_rows("df_proforma", idx[0], {"Ulaşma Tarihi": new_ulasma_tarih})
+                st.success("Ulaşma Tarihi güncellendi!")
+                st.rerun()
+
+        st.markdown("---")
+        # Ulaşanlardan YOLA GERİ AL (yeniden Sevkedildi + ETA’ya ekle/güncelle)
+        with st.form("ulasan_geri_al_form"):
+            st.markdown("##### 🔄 Ulaşan siparişi yeniden **Yolda Olanlar (ETA)** listesine al")
+            yeni_eta = st.date_input("Yeni ETA (opsiyonel)", value=datetime.date.today() + datetime.timedelta(days=7))
+            aciklama_geri = st.text_input("Açıklama (opsiyonel)", value="Geri alındı - tekrar yolda")
+            onay = st.form_submit_button("Yola Geri Al")
+
+        if onay:
+            musteri = row["Müşteri Adı"]
+            pno = row["Proforma No"]
+
+            # Proforma statüsü
+            idx = df_proforma[(df_proforma["Müşteri Adı"] == musteri) & (df_proforma["Proforma No"] == pno)].index
+            if len(idx) > 0:
+                storage_update_rows("df_proforma", idx[0], {"Sevk Durumu": "Sevkedildi", "Ulaşma Tarihi": ""})
+
+            # ETA ekle/güncelle
+            filtre_eta = (df_eta["Müşteri Adı"] == musteri) & (df_eta["Proforma No"] == pno)
+            eta_deger = pd.to_datetime(yeni_eta) if yeni_eta else ""
+            sevk_kaydi = df_proforma.at[idx[0], "Sevk Tarihi"] if len(idx) > 0 and "Sevk Tarihi" in df_proforma.columns else ""            
+            if filtre_eta.any():
+                eta_degisiklik = {"Sevk Tarihi": sevk_kaydi}
+                if yeni_eta:
+                    eta_degisiklik["ETA Tarihi"] = eta_deger
+                if aciklama_geri:
+                    eta_degisiklik["Açıklama"] = aciklama_geri
+                storage_update_rows("df_eta", df_eta.index[filtre_eta], eta_degisiklik)
+            else:
+                yeni_satir = {
+                    "Müşteri Adı": musteri,
+                    "Proforma No": pno,
+                    "Sevk Tarihi": sevk_kaydi,                    
+                    "ETA Tarihi": eta_deger if yeni_eta else "",
+                    "Açıklama": aciklama_geri,
+                }
+                storage_insert_row("df_eta", yeni_satir)
+
+            st.success("Sipariş, Ulaşanlar'dan geri alındı ve ETA listesine taşındı (Sevkedildi).")
+            st.rerun()
+
+        # Ulaşanlar Tablosu
+        st.markdown("#### Ulaşan (Teslim Edilmiş) Siparişler")
+        ulasanlar["Proforma Tarihi"] = ulasanlar["Tarih"]
+        ulasanlar["Gün Farkı"] = (ulasanlar["Sevk Tarihi"] - ulasanlar["Proforma Tarihi"]).dt.days
+        ulasanlar["Proforma Tarihi"] = ulasanlar["Proforma Tarihi"].dt.strftime("%d/%m/%Y")
+        ulasanlar["Sevk Tarihi"] = ulasanlar["Sevk Tarihi"].dt.strftime("%d/%m/%Y")
+        ulasanlar["Termin Tarihi"] = ulasanlar["Termin Tarihi"].dt.strftime("%d/%m/%Y")
+        ulasanlar["Ulaşma Tarihi"] = ulasanlar["Ulaşma Tarihi"].dt.strftime("%d/%m/%Y")
+
+        tablo = ulasanlar[["Müşteri Adı", "Proforma No", "Proforma Tarihi", "Termin Tarihi", "Sevk Tarihi", "Ulaşma Tarihi", "Gün Farkı", "Tutar", "Açıklama"]]
+        st.dataframe(tablo, use_container_width=True)
+    else:
+        st.info("Henüz ulaşan sipariş yok.")
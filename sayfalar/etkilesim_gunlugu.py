@@ -0,0 +1,169 @@
+# Etkileşim Günlüğü sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    id_label_map,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+)
+
+def render():
+    df_musteri = table_frame("df_musteri")
+    df_kayit = table_frame("df_kayit")
+
+    ### ===========================
+    ### === ETKİLEŞİM GÜNLÜĞÜ (Cloud-Sağlam) ===
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Etkileşim Günlüğü</h2>", unsafe_allow_html=True)
+
+    st.subheader("Kayıt Ekranı")
+    secim = st.radio("Lütfen işlem seçin:", ["Yeni Kayıt", "Eski Kayıt", "Tarih Aralığı ile Kayıtlar"], horizontal=False)
+
+    # --- Ortak: müşteri listesi (boş hariç, alfabetik) ---
+    musteri_options = [""] + sorted([
+        m for m in df_musteri["Müşteri Adı"].dropna().unique()
+        if isinstance(m, str) and m.strip() != ""
+    ])
+
+    # === YENİ KAYIT ===
+    if secim == "Yeni Kayıt":
+        with st.form("add_kayit"):
+            musteri_sec = st.selectbox("Müşteri Seç", musteri_options, index=0)
+            tarih = st.date_input("Tarih", value=datetime.date.today(), format="DD/MM/YYYY")
+            tip = st.selectbox("Tip", ["Arama", "Görüşme", "Ziyaret"])
+            aciklama = st.text_area("Açıklama")
+            submitted = st.form_submit_button("Kaydet")
+            if submitted:
+                if not musteri_sec:
+                    st.error("Lütfen bir müşteri seçiniz.")
+                else:
+                    new_row = {
+                        "ID": str(uuid.uuid4()),
+                        "Müşteri Adı": musteri_sec,
+                        "Tarih": tarih,
+                        "Tip": tip,
+                        "Açıklama": aciklama
+                    }
+                    storage_insert_row("df_kayit", new_row)
+                    st.success("Kayıt eklendi!")
+                    st.rerun()
+
+    # === ESKİ KAYIT (Listele / Ara / Düzenle / Sil) ===
+    elif secim == "Eski Kayıt":
+        colf1, colf2, colf3 = st.columns([2, 1, 1])
+        musteri_f = colf1.selectbox("Müşteri Filtresi", ["(Hepsi)"] + sorted(df_kayit["Müşteri Adı"].dropna().unique().tolist()))
+        tip_f = colf2.multiselect("Tip Filtresi", ["Arama", "Görüşme", "Ziyaret"], default=[])
+        aranacak = colf3.text_input("Ara (açıklama)", value="")
+
+        view = typed_table("df_kayit")
+        # Filtreler
+        if musteri_f and musteri_f != "(Hepsi)":
+            view = view[view["Müşteri Adı"] == musteri_f]
+        if tip_f:
+            view = view[view["Tip"].isin(tip_f)]
+        if aranacak.strip():
+            s = aranacak.lower().strip()
+            view = view[view["Açıklama"].astype(str).str.lower().str.contains(s, na=False)]
+
+        # Görünüm tablosu
+        if not view.empty:
+            goster = view.sort_values("Tarih", ascending=False)
+            goster["Tarih"] = goster["Tarih"].dt.strftime("%d/%m/%Y")
+            st.dataframe(goster[["Müşteri Adı", "Tarih", "Tip", "Açıklama"]], use_container_width=True)
+
+            # Dışa aktar
+            st.download_button(
+                "CSV indir",
+                data=goster.to_csv(index=False).encode("utf-8"),
+                file_name="gorusme_kayitlari.csv",
+                mime="text/csv"
+            )
+        else:
+            st.info("Seçilen filtrelere uygun kayıt bulunamadı.")
+
+        # Düzenleme / Silme
+        st.markdown("#### Kayıt Düzenle / Sil")
+        if view.empty:
+            st.caption("Önce filtreleriyle bir kayıt listeleyin.")
+        else:
+            # Seçim ID ile (en son ekleneni üste almak için tarihe göre sıralayalım)
+            view_sorted = view.sort_values("Tarih", ascending=False).reset_index(drop=True)
+            kayit_etiketleri = id_label_map(
+                view_sorted["ID"],
+                [f"{ad} | {tip}" for ad, tip in zip(view_sorted["Müşteri Adı"], view_sorted["Tip"])],
+            )
+            sec_id = st.selectbox(
+                "Kayıt Seçin",
+                options=view_sorted["ID"].tolist(),
+                format_func=kayit_etiketleri.get
+            )
+
+            # Orijinal index
+            orj_mask = (df_kayit["ID"] == sec_id)
+            if not orj_mask.any():
+                st.warning("Beklenmeyen hata: Kayıt ana tabloda bulunamadı.")
+            else:
+                orj_idx = df_kayit.index[orj_mask][0]
+                with st.form("edit_kayit"):
+                    musteri_g = st.selectbox("Müşteri", musteri_options, index=(musteri_options.index(df_kayit.at[orj_idx, "Müşteri Adı"]) if df_kayit.at[orj_idx, "Müşteri Adı"] in musteri_options else 0))
+                    try:
+                        tarih_g = pd.to_datetime(df_kayit.at[orj_idx, "Tarih"]).date()
+                    except Exception:
+                        tarih_g = datetime.date.today()
+                    tarih_g = st.date_input("Tarih", value=tarih_g, format="DD/MM/YYYY")
+                    tip_g = st.selectbox("Tip", ["Arama", "Görüşme", "Ziyaret"], index=["Arama","Görüşme","Ziyaret"].index(df_kayit.at[orj_idx,"Tip"]) if df_kayit.at[orj_idx,"Tip"] in ["Arama","Görüşme","Ziyaret"] else 0)
+                    aciklama_g = st.text_area("Açıklama", value=str(df_kayit.at[orj_idx, "Açıklama"]))
+                    colu, cols = st.columns(2)
+                    guncelle = colu.form_submit_button("Güncelle")
+                    sil = cols.form_submit_button("Sil")
+
+                if guncelle:
+                    storage_update_rows("df_kayit", orj_idx, {
+                        "Müşteri Adı": musteri_g,
+                        "Tarih": tarih_g,
+                        "Tip": tip_g,
+                        "Açıklama": aciklama_g,
+                    })
+                    st.success("Kayıt güncellendi!")
+                    st.rerun()
+
+                if sil:
+                    storage_delete_rows("df_kayit", orj_idx)
+                    st.success("Kayıt silindi!")
+                    st.rerun()
+
+    # === TARİH ARALIĞI İLE KAYITLAR ===
+    elif secim == "Tarih Aralığı ile Kayıtlar":
+        col1, col2 = st.columns(2)
+        with col1:
+            baslangic = st.date_input("Başlangıç Tarihi", value=datetime.date.today() - datetime.timedelta(days=7), format="DD/MM/YYYY")
+        with col2:
+            bitis = st.date_input("Bitiş Tarihi", value=datetime.date.today(), format="DD/MM/YYYY")
+
+        # Sağlam tarih filtrelemesi
+        kayit_t = typed_table("df_kayit")
+        start_ts = pd.to_datetime(baslangic)
+        end_ts = pd.to_datetime(bitis) + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)
+        tarih_arasi = kayit_t[kayit_t["Tarih"].between(start_ts, end_ts, inclusive="both")]
+
+        if not tarih_arasi.empty:
+            goster = tarih_arasi.sort_values("Tarih", ascending=False)
+            goster["Tarih"] = goster["Tarih"].dt.strftime('%d/%m/%Y')
+            st.dataframe(goster, use_container_width=True)
+            st.download_button(
+                "CSV indir",
+                data=goster.to_csv(index=False).encode("utf-8"),
+                file_name="gorusme_kayitlari_tarih_araligi.csv",
+                mime="text/csv"
+            )
+        else:
+            st.info("Bu tarihler arasında kayıt yok.")
@@ -0,0 +1,447 @@
+# Fatura işlemleri sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import re
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    EVRAK_KLASOR_ID,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+    upload_documents_parallel,
+)
+from sayilar import smart_to_num
+
+def file_link_html(label, url):
+    return f'<div style="margin-top:-6px;"><a href="{url}" target="_blank" style="color:#219A41;">[Daha önce yüklenmiş {label}]</a></div>' if url else \
+           '<div style="margin-top:-6px; color:#b00020; font-size:0.95em;">(Daha önce yüklenmemiş)</div>'
+
+def render():
+    df_musteri = table_frame("df_musteri")
+    df_proforma = table_frame("df_proforma")
+    df_evrak = table_frame("df_evrak")
+
+    ### ===========================
+    ### --- İHRACAT EVRAKLARI MENÜSÜ ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Fatura işlemleri</h2>", unsafe_allow_html=True)
+
+        # ---- Otomatik seçim için session state anahtarları ----
+    musteri_key = "invoice_customer_select"
+    proforma_key = "invoice_proforma_select"
+    pending_select_key = "pending_invoice_select"
+    pending_reset_flag_key = "pending_invoice_select_reset"
+    st.session_state.setdefault(musteri_key, "")
+    st.session_state.setdefault(proforma_key, "")
+    st.session_state.setdefault("invoice_last_customer", "")
+    st.session_state.setdefault(pending_select_key, "")
+    st.session_state.setdefault(pending_reset_flag_key, False)
+
+    # ---- Sevk edilmiş fakat faturası kesilmemiş siparişler ----
+    st.markdown("### Faturası Kesilmemiş Sevkli Siparişler")
+    proforma_t = typed_table("df_proforma")
+    sevkedilen_mask = proforma_t["Sevk Durumu"] == "Sevkedildi"
+    sevkedilen_mask &= proforma_t["Durum"].astype(str).str.strip().eq("Siparişe Dönüştü")
+    pending_orders = proforma_t[sevkedilen_mask]
+
+    if not pending_orders.empty:
+        pending_orders = pending_orders.sort_values(
+            ["Termin Tarihi", "Tarih"], ascending=[True, True]
+        )
+
+    if not pending_orders.empty:
+        pending_orders["ID"] = pending_orders["ID"].astype(str)
+        pending_orders["Müşteri Adı"] = pending_orders["Müşteri Adı"].astype(str)
+        pending_orders["Proforma No"] = pending_orders["Proforma No"].astype(str)
+
+        pending_orders = pending_orders[
+            pending_orders["ID"].str.strip() != ""
+        ]
+
+        if not df_evrak.empty:
+            invoice_pairs = set(
+                (
+                    str(m).strip().lower(),
+                    str(p).strip().lower(),
+                )
+                for m, p in zip(df_evrak.get("Müşteri Adı", []), df_evrak.get("Proforma No", []))
+                if str(m).strip() or str(p).strip()
+            )
+            pending_orders = pending_orders[
+                ~pending_orders.apply(
+                    lambda r: (
+                        str(r.get("Müşteri Adı", "")).strip().lower(),
+                        str(r.get("Proforma No", "")).strip().lower(),
+                    )
+                    in invoice_pairs,
+                    axis=1,
+                )
+            ]
+
+        pending_orders = pending_orders[
+            pending_orders["Proforma No"].astype(str).str.strip() != ""
+        ]
+
+    if pending_orders.empty:
+        st.info("Sevk edilip henüz faturası kaydedilmemiş sipariş bulunmuyor.")
+    else:
+        display_cols = [
+            "ID",
+            "Müşteri Adı",
+            "Proforma No",
+            "Termin Tarihi",
+            "Tutar",
+            "Açıklama",
+        ]
+        table = pending_orders[display_cols].copy()
+        table["Termin Tarihi"] = table["Termin Tarihi"].dt.strftime("%d/%m/%Y")
+        tutar_dolu = table["Tutar"].astype(str).str.strip() != ""
+        table["Tutar"] = pending_orders["Tutar_num"].map(lambda v: f"{v:,.2f} USD").where(tutar_dolu, "")
+        st.dataframe(table.drop(columns=["ID"]), use_container_width=True)
+
+        option_labels = {"": "— Sipariş Seç —"}
+        for _, row in pending_orders.iterrows():
+            label = f"{row['Müşteri Adı']} - {row['Proforma No']}"
+            termin_dt = row["Termin Tarihi"]
+            if pd.notnull(termin_dt):
+                label += f" | Termin: {termin_dt.strftime('%d/%m/%Y')}"
+            if str(row["Tutar"]).strip():
+                label += f" | Tutar: {row['Tutar_num']:,.2f} USD"
+            option_labels[row["ID"]] = label
+
+        pending_options = [""] + pending_orders["ID"].tolist()
+        if st.session_state.get(pending_reset_flag_key):
+            st.session_state[pending_select_key] = ""
+            st.session_state[pending_reset_flag_key] = False
+
+        if st.session_state[pending_select_key] not in pending_options:
+            st.session_state[pending_select_key] = ""
+
+        selected_pending = st.selectbox(
+            "Fatura kaydı açmak istediğiniz siparişi seçin",
+            options=pending_options,
+            key=pending_select_key,
+            format_func=lambda oid: option_labels.get(oid, "— Sipariş Seç —"),
+        )
+
+        if st.button("Seçimi Fatura Formuna Aktar", disabled=(selected_pending == "")):
+            row = pending_orders[pending_orders["ID"] == selected_pending]
+            if not row.empty:
+                hedef = row.iloc[0]
+                st.session_state[musteri_key] = str(hedef.get("Müşteri Adı", ""))
+                st.session_state[proforma_key] = str(hedef.get("Proforma No", ""))
+                st.session_state[pending_reset_flag_key] = True
+                st.rerun()
+
+    st.markdown("### Kayıtlı Fatura Tarihlerini Güncelle")
+
+    invoice_mask = df_evrak["Fatura No"].astype(str).str.strip() != ""
+    existing_invoices = df_evrak[invoice_mask].copy()
+
+    if existing_invoices.empty:
+        st.info("Güncellenebilecek kayıtlı fatura bulunmuyor.")
+    else:
+        def _safe_date(value, fallback=None):
+            if isinstance(value, datetime.datetime):
+                return value.date()
+            if isinstance(value, datetime.date):
+                return value
+            try:
+                ts = pd.to_datetime(value, errors="coerce")
+            except Exception:
+                ts = pd.NaT
+            if pd.isna(ts):
+                return fallback
+            return ts.date()
+
+        def _format_invoice(idx):
+            row = existing_invoices.loc[idx]
+            musteri = str(row.get("Müşteri Adı", "")).strip() or "Müşteri Yok"
+            fatura_no = str(row.get("Fatura No", "")).strip() or "Numara Yok"
+            proforma = str(row.get("Proforma No", "")).strip()
+            invoice_date = _safe_date(row.get("Fatura Tarihi"))
+            due_date = _safe_date(row.get("Vade Tarihi"))
+
+            parts = [f"{musteri}", f"Fatura: {fatura_no}"]
+            if proforma:
+                parts.append(f"Proforma: {proforma}")
+            if invoice_date:
+                parts.append(f"Fatura Tarihi: {invoice_date.strftime('%d/%m/%Y')}")
+            if due_date:
+                parts.append(f"Vade Tarihi: {due_date.strftime('%d/%m/%Y')}")
+            return " | ".join(parts)
+
+        invoice_indices = existing_invoices.index.tolist()
+        selected_invoice = st.selectbox(
+            "Güncellemek istediğiniz faturayı seçin",
+            options=invoice_indices,
+            format_func=_format_invoice,
+            key="invoice_edit_select",
+        )
+
+        if invoice_indices:
+            secili_satir = existing_invoices.loc[selected_invoice]
+            default_invoice_date = _safe_date(secili_satir.get("Fatura Tarihi"), fallback=datetime.date.today())
+            default_due_date = _safe_date(secili_satir.get("Vade Tarihi"), fallback=default_invoice_date)
+
+            with st.form("update_invoice_dates"):
+                yeni_fatura_tarihi = st.date_input("Yeni Fatura Tarihi", value=default_invoice_date)
+                yeni_vade_tarihi = st.date_input("Yeni Vade Tarihi", value=default_due_date)
+                update_submitted = st.form_submit_button("Tarihleri Güncelle")
+
+            if update_submitted:
+                try:
+                    gun_farki = (pd.Timestamp(yeni_vade_tarihi) - pd.Timestamp(yeni_fatura_tarihi)).days
+                    vade_gun_yeni = str(gun_farki)
+                except Exception:
+                    vade_gun_yeni = ""
+
+                storage_update_rows("df_evrak", selected_invoice, {
+                    "Fatura Tarihi": yeni_fatura_tarihi,
+                    "Vade Tarihi": yeni_vade_tarihi,
+                    "Vade (gün)": vade_gun_yeni,
+                })
+                st.success("Fatura tarihleri güncellendi!")
+                st.rerun()
+
+    st.markdown("### Fatura Kaydı Sil")
+
+    if df_evrak.empty:
+        st.info("Silinecek fatura kaydı bulunmuyor.")
+    else:
+        delete_options = df_evrak.index.tolist()
+
+        def _format_delete_option(idx):
+            row = df_evrak.loc[idx]
+            musteri = str(row.get("Müşteri Adı", "")).strip() or "Müşteri Yok"
+            fatura_no = str(row.get("Fatura No", "")).strip() or "Numara Yok"
+            proforma_no = str(row.get("Proforma No", "")).strip()
+
+            invoice_date = row.get("Fatura Tarihi", "")
+            invoice_date_str = ""
+            if pd.notna(invoice_date):
+                invoice_ts = pd.to_datetime(invoice_date, errors="coerce")
+                if pd.notna(invoice_ts):
+                    invoice_date_str = invoice_ts.strftime("%d/%m/%Y")
+
+            tutar_raw = row.get("Tutar", "")
+            tutar_str = ""
+            if str(tutar_raw).strip():
+                tutar_str = f"{smart_to_num(tutar_raw):,.2f} USD"
+
+            parts = [f"{musteri}", f"Fatura: {fatura_no}"]
+            if proforma_no:
+                parts.append(f"Proforma: {proforma_no}")
+            if invoice_date_str:
+                parts.append(f"Tarih: {invoice_date_str}")
+            if tutar_str:
+                parts.append(f"Tutar: {tutar_str}")
+            return " | ".join(parts)
+
+        with st.form("delete_invoice_form"):
+            silinecek_fatura = st.selectbox(
+                "Silmek istediğiniz faturayı seçin",
+                options=delete_options,
+                format_func=_format_delete_option,
+                key="invoice_delete_select",
+            )
+            confirm_delete = st.checkbox("Silme işlemini onaylıyorum")
+            delete_submitted = st.form_submit_button("Seçili Faturayı Sil")
+
+        if delete_submitted:
+            if confirm_delete:
+                storage_delete_rows("df_evrak", silinecek_fatura)
+                st.success("Seçilen fatura kaydı silindi.")
+                st.rerun()
+            else:
+                st.warning("Silme işlemini onaylamak için kutucuğu işaretleyin.")
+
+    # ---- Müşteri / Proforma seçimleri ----
+    st.markdown("### Fatura Ekle")
+
+    musteri_secenek = sorted(df_proforma["Müşteri Adı"].dropna().astype(str).unique().tolist())
+    musteri_options = [""] + musteri_secenek
+    if st.session_state[musteri_key] not in musteri_options:
+        st.session_state[musteri_key] = ""
+    secilen_musteri = st.selectbox("Müşteri Seç", musteri_options, key=musteri_key)
+
+    if st.session_state.get("invoice_last_customer") != secilen_musteri:
+        st.session_state["invoice_last_customer"] = secilen_musteri
+        st.session_state[proforma_key] = ""
+
+    if secilen_musteri:
+        p_list = (
+            df_proforma.loc[
+                df_proforma["Müşteri Adı"].astype(str) == secilen_musteri,
+                "Proforma No",
+            ]
+            .dropna()
+            .astype(str)
+            .unique()
+            .tolist()
+        )
+        proforma_options = [""] + sorted(p_list)
+    else:
+        proforma_options = [""]
+
+    if st.session_state[proforma_key] not in proforma_options:
+        st.session_state[proforma_key] = ""
+
+    proforma_no_sec = st.selectbox("Proforma No Seç", proforma_options, key=proforma_key)
+
+    # ---- Müşteri varsayılanları (ülke/temsilci/ödeme) ----
+    musteri_info = df_musteri[
+        df_musteri["Müşteri Adı"].astype(str) == secilen_musteri
+    ]
+    ulke = musteri_info["Ülke"].values[0] if not musteri_info.empty else ""
+    temsilci = musteri_info["Satış Temsilcisi"].values[0] if not musteri_info.empty else ""
+    odeme = musteri_info["Ödeme Şekli"].values[0] if not musteri_info.empty else ""
+
+    # ---- Proforma'dan Vade (gün) çek ve Vade Tarihi hesapla ----
+    vade_gun = ""
+    if secilen_musteri and proforma_no_sec:
+        pr = df_proforma[
+            (df_proforma["Müşteri Adı"].astype(str) == secilen_musteri)
+            & (df_proforma["Proforma No"].astype(str) == proforma_no_sec)
+        ]
+        if not pr.empty:
+            vade_gun = pr.iloc[0].get("Vade (gün)", "")
+
+    # ---- Eski evrak linkleri (aynı müşteri+proforma altında son satır) ----
+    onceki_evrak = df_evrak[
+        (df_evrak["Müşteri Adı"].astype(str) == secilen_musteri)
+        & (df_evrak["Proforma No"].astype(str) == proforma_no_sec)
+    ].tail(1)
+
+    evrak_tipleri = [
+        ("Commercial Invoice",  "Commercial Invoice PDF"),
+        ("Sağlık Sertifikası",  "Sağlık Sertifikası PDF"),
+        ("Packing List",        "Packing List PDF"),
+        ("Konşimento",          "Konşimento PDF"),
+        ("İhracat Beyannamesi", "İhracat Beyannamesi PDF"),
+        ("Fatura PDF",          "Fatura PDF")  # eklendi
+    ]
+
+    # ---- Form ----
+    with st.form("add_evrak"):
+        fatura_no = st.text_input("Fatura No")
+        fatura_tarih = st.date_input("Fatura Tarihi", value=datetime.date.today())
+        tutar = st.text_input("Fatura Tutarı (USD)")
+        # Vade (gün) & vade tarihi gösterimi
+        st.text_input("Vade (gün)", value=str(vade_gun), key="vade_gun", disabled=True)
+
+        try:
+            vade_int = int(vade_gun)
+            vade_tarihi_hesap = fatura_tarih + datetime.timedelta(days=vade_int)
+        except:
+            vade_tarihi_hesap = None
+        st.date_input("Vade Tarihi", value=(vade_tarihi_hesap or fatura_tarih), key="vade_tarihi", disabled=True)
+
+        st.text_input("Ülke", value=ulke, disabled=True)
+        st.text_input("Satış Temsilcisi", value=temsilci, disabled=True)
+        st.text_input("Ödeme Şekli", value=odeme, disabled=True)
+
+        # Evrak yüklemeleri + eski link gösterimleri
+        uploaded_files = {}
+        for col, label in evrak_tipleri:
+            uploaded_files[col] = st.file_uploader(label, type="pdf", key=f"{col}_upload")
+            prev_url = onceki_evrak.iloc[0][col] if not onceki_evrak.empty else ""
+            st.markdown(file_link_html(label, prev_url), unsafe_allow_html=True)
+
+        submitted = st.form_submit_button("Kaydet")
+
+    if submitted:
+        if not (secilen_musteri and proforma_no_sec and fatura_no.strip() and tutar.strip()):
+            st.error("Müşteri, Proforma No, Fatura No ve Tutar zorunludur.")
+            st.stop()
+
+        tutar_num = smart_to_num(tutar)
+
+        # 1) Seçilen dosyaları Drive'a paralel yükle. Yüklenmeyen/başarısız olanlarda eski link korunur.
+        zaman_damgasi = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+        yuklemeler = []
+        for col, _label in evrak_tipleri:
+            upfile = uploaded_files[col]
+            if upfile:
+                clean_name = re.sub(r'[\\/*?:"<>|]+', "_", f"{secilen_musteri}__{proforma_no_sec}__{col}__{zaman_damgasi}.pdf")
+                yuklemeler.append((col, EVRAK_KLASOR_ID, clean_name, upfile.getvalue()))
+        yuklenen = upload_documents_parallel(yuklemeler, "Evraklar Drive'a yükleniyor")
+
+        file_urls = {}
+        for col, _label in evrak_tipleri:
+            if col in yuklenen:
+                file_urls[col] = yuklenen[col]
+            else:
+                file_urls[col] = onceki_evrak.iloc[0][col] if not onceki_evrak.empty else ""
+
+        # 2) Tekilleştirme: aynı (Müşteri, Proforma, Fatura No) varsa GÜNCELLE; yoksa EKLE
+        key_mask = (
+            (df_evrak["Müşteri Adı"].astype(str) == secilen_musteri) &
+            (df_evrak["Proforma No"].astype(str) == proforma_no_sec) &
+            (df_evrak["Fatura No"].astype(str) == fatura_no)
+        )
+
+        # Vade Tarihi yazımı
+        vade_tarihi_yaz = vade_tarihi_hesap if vade_tarihi_hesap else ""
+
+        if key_mask.any():
+            idx = df_evrak[key_mask].index[0]
+            mevcut_odeme = pd.to_numeric(
+                pd.Series(df_evrak.at[idx, "Ödenen Tutar"]), errors="coerce"
+            ).fillna(0.0).iloc[0]
+            tutar_float = float(tutar_num) if pd.notnull(tutar_num) else 0.0
+            odenen = min(max(mevcut_odeme, 0.0), tutar_float)
+            degisiklikler = {
+                "Fatura Tarihi":    fatura_tarih,
+                "Tutar":            tutar,
+                "Tutar_num":        tutar_num,
+                "Vade (gün)":       vade_gun,
+                "Vade Tarihi":      vade_tarihi_yaz,
+                "Ülke":             ulke,
+                "Satış Temsilcisi": temsilci,
+                "Ödeme Şekli":      odeme,
+                "Ödenen Tutar":     odenen,
+                **{col: file_urls.get(col, "") for col, _ in evrak_tipleri},
+            }
+            if tutar_float > 0 and odenen >= tutar_float - 0.01:
+                degisiklikler["Ödendi"] = True
+            storage_update_rows("df_evrak", idx, degisiklikler)
+            islem = "güncellendi"
+        else:
+            new_row = {
+                "ID": str(uuid.uuid4()),
+                "Müşteri Adı": secilen_musteri,
+                "Proforma No": proforma_no_sec,
+                "Fatura No": fatura_no,
+                "Fatura Tarihi": fatura_tarih,
+                "Tutar": tutar,
+                "Tutar_num": tutar_num,
+                "Vade (gün)": vade_gun,
+                "Vade Tarihi": vade_tarihi_yaz,
+                "Ülke": ulke,
+                "Satış Temsilcisi": temsilci,
+                "Ödeme Şekli": odeme,
+                "Ödenen Tutar": 0.0,                
+                "Ödendi": False,
+                **{col: file_urls.get(col, "") for col, _ in evrak_tipleri},
+                "Sipariş Formu": "",
+                "Yük Resimleri": "",
+                "EK Belgeler": "",
+            }
+            storage_insert_row("df_evrak", new_row)
+            islem = "eklendi"
+
+        st.success(f"Evrak {islem}!")
+        eksik = [filename for col, _pid, filename, _data in yuklemeler if col not in yuklenen]
+        if eksik:
+            # Hata mesajları görünür kalsın diye yeniden çalıştırma yapılmaz
+            st.warning(f"{len(eksik)} dosya yüklenemedi, önceki linkleri korundu: " + ", ".join(eksik))
+        else:
+            st.rerun()
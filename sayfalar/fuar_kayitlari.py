@@ -0,0 +1,325 @@
+# Fuar Kayıtları sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+from email.utils import make_msgid
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    COUNTRY_LANGUAGE_MAP,
+    EMBED_IMAGES,
+    FAIR_MAIL_TEMPLATES,
+    extract_unique_emails,
+    send_fair_bulk_email,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    temsilci_listesi,
+    typed_table,
+    ulke_listesi,
+)
+
+def render():
+    df_fuar_musteri = table_frame("df_fuar_musteri")
+
+    # ==============================
+    # FUAR KAYITLARI MENÜSÜ
+    # ==============================
+
+    st.markdown("<h2 style='color:#8e54e9; font-weight:bold; text-align:center;'>Fuar Kayıtları</h2>", unsafe_allow_html=True)
+    st.info("Fuarlarda müşteri görüşmelerinizi hızlıca buraya ekleyin. Yeni kayıt oluşturun, mevcutları düzenleyin.")
+
+    # --- Fuar seçimi / oluşturma ---
+    mevcut_fuarlar = sorted([f for f in df_fuar_musteri["Fuar Adı"].dropna().unique() if str(f).strip() != ""])
+    col_f1, col_f2 = st.columns([2, 1])
+    with col_f1:
+        fuar_adi = st.selectbox("Fuar Seçiniz", ["— Fuar Seçiniz —"] + mevcut_fuarlar, index=0)
+        fuar_adi = "" if fuar_adi == "— Fuar Seçiniz —" else fuar_adi
+    with col_f2:
+        yeni_fuar = st.text_input("Yeni Fuar Adı (opsiyonel)")
+        if st.button("Fuar Ekle"):
+            y = yeni_fuar.strip()
+            if not y:
+                st.warning("Fuar adı boş olamaz.")
+            elif y in mevcut_fuarlar:
+                st.info("Bu fuar zaten mevcut.")
+                fuar_adi = y
+            else:
+                fuar_adi = y
+                st.success(f"Fuar eklendi: {y}")
+
+    secim = st.radio("İşlem Seçiniz:", ["Yeni Kayıt", "Eski Kayıt"], horizontal=True)
+
+    # --- YENİ KAYIT ---
+    if secim == "Yeni Kayıt":
+        st.markdown("#### Yeni Fuar Müşteri Kaydı")
+        with st.form("fuar_musteri_ekle"):
+            musteri_adi = st.text_input("Müşteri Adı")
+            ulke = st.selectbox("Ülke Seçin", ulke_listesi)  # global listeden
+            tel = st.text_input("Telefon")
+            email = st.text_input("E-mail")
+            temsilci = st.selectbox("Satış Temsilcisi", temsilci_listesi)  # global listeden
+            aciklama = st.text_area("Açıklamalar")
+            gorusme_kalitesi = st.slider("Görüşme Kalitesi (1=Kötü, 5=Çok İyi)", 1, 5, 3)
+            tarih = st.date_input("Tarih", value=datetime.date.today())
+
+            kaydet = st.form_submit_button("Kaydet")
+            if kaydet:
+                if not fuar_adi:
+                    st.warning("Lütfen bir fuar seçin veya ekleyin.")
+                elif not musteri_adi.strip():
+                    st.warning("Müşteri adı gerekli.")
+                else:
+                    yeni = {
+                        "Fuar Adı": fuar_adi,
+                        "Müşteri Adı": musteri_adi.strip(),
+                        "Ülke": ulke,
+                        "Telefon": tel.strip(),
+                        "E-mail": email.strip(),
+                        "Satış Temsilcisi": temsilci,
+                        "Açıklamalar": aciklama.strip(),
+                        "Görüşme Kalitesi": int(gorusme_kalitesi),
+                        "Tarih": tarih,
+                    }
+                    storage_insert_row("df_fuar_musteri", yeni)
+                    st.success("Fuar müşterisi eklendi!")
+                    st.rerun()
+
+    # --- ESKİ KAYIT: listele / filtrele / düzenle / sil ---
+    elif secim == "Eski Kayıt":
+        if not fuar_adi:
+            st.info("Önce bir fuar seçin.")
+        else:
+            st.markdown(f"<h4 style='color:#4776e6;'>{fuar_adi} – Kayıtlar</h4>", unsafe_allow_html=True)
+
+            fuar_df = typed_table("df_fuar_musteri")
+            fuar_df = fuar_df[fuar_df["Fuar Adı"] == fuar_adi]
+
+            with st.expander("Toplu E-posta Gönderimi", expanded=False):
+                email_list = extract_unique_emails(fuar_df.get("E-mail"))
+                if not email_list:
+                    st.info("Bu fuara ait kayıtlı e-posta adresi bulunamadı.")
+                else:
+                    multiselect_options = ["Tümünü seç"] + email_list
+                    selected_options = st.multiselect(
+                        "E-posta Adresleri",
+                        multiselect_options,
+                        key=f"bulk_mail_recipients_{fuar_adi}"
+                    )
+
+                    attachments_key = f"bulk_mail_files_{fuar_adi}"
+                    attachments = st.session_state.get(attachments_key)
+
+                    image_previews = []
+                    inline_cid_map = {}
+                    if attachments:
+                        image_cid_state = st.session_state.setdefault("bulk_mail_image_cids", {})
+                        for uploaded_file in attachments:
+                            if uploaded_file is None:
+                                continue
+                            mime_type = uploaded_file.type or ""
+                            if not mime_type.startswith("image/"):
+                                continue
+                            try:
+                                file_bytes = uploaded_file.getvalue()
+                            except Exception as exc:
+                                st.error(f"{uploaded_file.name} okunurken hata oluştu: {exc}")
+                                continue
+                            attachment_key = f"{uploaded_file.name}:{len(file_bytes)}"
+                            cid = image_cid_state.get(attachment_key)
+                            if not cid:
+                                cid = make_msgid()
+                                image_cid_state[attachment_key] = cid
+                            image_previews.append((uploaded_file.name, cid, attachment_key))
+                            inline_cid_map[attachment_key] = cid
+
+                    if image_previews:
+                        st.markdown("**HTML gövdesine eklenecek görseller:**")
+                        for file_name, cid, _ in image_previews:
+                            cid_value = cid.strip("<>")
+
+                            st.code(
+                                f'<img src="cid:{cid_value}" alt="{file_name}">',
+                                language="html"
+                            )                            
+
+                    if "Tümünü seç" in selected_options:
+                        selected_recipients = email_list
+                    else:
+                        selected_recipients = selected_options
+
+                    available_countries = sorted({
+                        str(country).strip()
+                        for country in fuar_df.get("Ülke", [])
+                        if str(country).strip()
+                    })
+                    country_options = ["— Ülke Seçiniz —"] + available_countries
+                    selected_country = st.selectbox(
+                        "Ülke Seçiniz",
+                        country_options,
+                        key=f"bulk_mail_country_{fuar_adi}"
+                    )
+                    selected_country = (
+                        "" if selected_country == "— Ülke Seçiniz —" else selected_country
+                    )
+
+                    subject_key = f"bulk_mail_subject_{fuar_adi}"
+                    body_key = f"bulk_mail_body_{fuar_adi}"
+                    template_key = f"{subject_key}_last_template"
+                    language_key = f"{subject_key}_language"
+
+                    st.session_state.setdefault(subject_key, "")
+                    st.session_state.setdefault(body_key, "")
+
+                    prev_language = st.session_state.get(language_key)
+                    last_template = st.session_state.get(template_key)
+
+                    language = COUNTRY_LANGUAGE_MAP.get(selected_country) if selected_country else None
+                    template = FAIR_MAIL_TEMPLATES.get(language) if language else None
+
+                    if prev_language != language and template:
+                        last_template_subject = ""
+                        last_template_body = ""
+                        if isinstance(last_template, tuple) and len(last_template) == 3:
+                            last_template_subject = last_template[1] or ""
+                            last_template_body = last_template[2] or ""
+
+                        current_subject = st.session_state.get(subject_key, "")
+                        current_body = st.session_state.get(body_key, "")
+
+                        if (not current_subject) or (current_subject == last_template_subject):
+                            st.session_state[subject_key] = template.get("subject", "")
+
+                        if (not current_body) or (current_body == last_template_body):
+                            st.session_state[body_key] = template.get("body", "")
+
+                        st.session_state[template_key] = (
+                            language,
+                            template.get("subject", ""),
+                            template.get("body", ""),
+                        )
+
+                    if prev_language != language:
+                        st.session_state[language_key] = language
+
+                    subject = st.text_input("Konu", key=subject_key)
+                    body = st.text_area("E-posta İçeriği", key=body_key)
+
+                    st.file_uploader(
+                        "Ek Dosyalar",
+                        accept_multiple_files=True,
+                        key=attachments_key,
+                    )
+
+                    attachments = st.session_state.get(attachments_key)
+
+                    if st.button("Gönder", key=f"bulk_mail_send_{fuar_adi}"):
+                        if not selected_recipients:
+                            st.warning("Lütfen en az bir e-posta adresi seçin.")
+                        elif not subject.strip():
+                            st.warning("Lütfen e-posta konusu girin.")
+                        elif not body.strip():
+                            st.warning("Lütfen e-posta içeriği girin.")
+                        else:
+
+                            try:
+                                send_fair_bulk_email(
+                                    selected_recipients,
+                                    subject.strip(),
+                                    body,
+                                    attachments or [],
+                                    embed_images=EMBED_IMAGES,
+                                    inline_cid_map=inline_cid_map,
+                                    label=f"Fuar ({fuar_adi})",
+                                )
+                                st.success(
+                                    f"E-posta {len(selected_recipients)} alıcı için kuyruğa alındı. "
+                                    "Durumu kenar çubuğundaki Mail Kuyruğu panelinden izleyebilirsiniz."
+                                )
+                            except Exception as exc:
+                                st.error(f"E-posta gönderilirken hata oluştu: {exc}")
+
+            # Hızlı filtreler
+            col_fa, col_fb, col_fc = st.columns([1, 1, 1])
+            with col_fa:
+                min_puan = st.slider("Min. Görüşme Kalitesi", 1, 5, 1)
+            with col_fb:
+                tarih_bas = st.date_input("Başlangıç Tarihi", value=datetime.date.today() - datetime.timedelta(days=30))
+            with col_fc:
+                tarih_bit = st.date_input("Bitiş Tarihi", value=datetime.date.today())
+
+            # Filtre uygula
+            fuar_df["Tarih"] = fuar_df["Tarih"].dt.normalize()
+
+            tarih_bas_ts = pd.Timestamp(tarih_bas).normalize()
+            tarih_bit_ts = pd.Timestamp(tarih_bit).normalize()
+
+            mask = (
+                (fuar_df["Görüşme Kalitesi"].fillna(0) >= min_puan) &
+                (fuar_df["Tarih"] >= tarih_bas_ts) &
+                (fuar_df["Tarih"] <= tarih_bit_ts)
+            )
+            fuar_df = fuar_df[mask].copy().sort_values("Tarih", ascending=False)
+
+            if fuar_df.empty:
+                st.info("Filtrelere uyan kayıt yok.")
+            else:
+                # Seçim
+                secili_index = st.selectbox(
+                    "Düzenlemek/Silmek istediğiniz kaydı seçin:",
+                    fuar_df.index,
+                    format_func=lambda i: f"{fuar_df.at[i, 'Müşteri Adı']} ({fuar_df.at[i, 'Tarih'].date() if pd.notnull(fuar_df.at[i, 'Tarih']) else ''})"
+                )
+
+                # Detay formu
+                with st.form("kayit_duzenle"):
+                    musteri_adi = st.text_input("Müşteri Adı", value=str(fuar_df.at[secili_index, "Müşteri Adı"]))
+                    u_val = fuar_df.at[secili_index, "Ülke"]
+                    ulke = st.selectbox("Ülke", ulke_listesi, index=ulke_listesi.index(u_val) if u_val in ulke_listesi else ulke_listesi.index("Diğer"))
+                    t_val = fuar_df.at[secili_index, "Satış Temsilcisi"]
+                    temsilci = st.selectbox("Satış Temsilcisi", temsilci_listesi, index=temsilci_listesi.index(t_val) if t_val in temsilci_listesi else 0)
+                    tel = st.text_input("Telefon", value=str(fuar_df.at[secili_index, "Telefon"] or ""))
+                    email = st.text_input("E-mail", value=str(fuar_df.at[secili_index, "E-mail"] or ""))
+                    aciklama = st.text_area("Açıklamalar", value=str(fuar_df.at[secili_index, "Açıklamalar"] or ""))
+                    gk_raw = fuar_df.at[secili_index, "Görüşme Kalitesi"]
+                    gk_default = int(gk_raw) if pd.notnull(gk_raw) and str(gk_raw).isdigit() else 3
+                    gorusme_kalitesi = st.slider("Görüşme Kalitesi (1-5)", 1, 5, gk_default)
+                    t_raw = fuar_df.at[secili_index, "Tarih"]
+                    tarih = st.date_input("Tarih", value=(pd.to_datetime(t_raw).date() if pd.notnull(t_raw) else datetime.date.today()))
+
+                    col_b1, col_b2 = st.columns(2)
+                    with col_b1:
+                        guncelle = st.form_submit_button("Kaydı Güncelle")
+                    with col_b2:
+                        sil = st.form_submit_button("Kaydı Sil")
+
+                # Güncelle
+                if guncelle:
+                    storage_update_rows("df_fuar_musteri", secili_index, {
+                        "Müşteri Adı": musteri_adi.strip(),
+                        "Ülke": ulke,
+                        "Telefon": tel.strip(),
+                        "E-mail": email.strip(),
+                        "Satış Temsilcisi": temsilci,
+                        "Açıklamalar": aciklama.strip(),
+                        "Görüşme Kalitesi": int(gorusme_kalitesi),
+                        "Tarih": tarih,
+                    })
+                    st.success("Kayıt güncellendi!")
+                    st.rerun()
+
+                # Sil
+                if sil:
+                    storage_delete_rows("df_fuar_musteri", secili_index)
+                    st.success("Kayıt silindi!")
+                    st.rerun()
+
+                # Görsel tablo
+                tablo = fuar_df.copy()
+                tablo["Tarih"] = tablo["Tarih"].dt.strftime("%d/%m/%Y")
+                st.dataframe(tablo[[
+                    "Müşteri Adı", "Ülke", "Telefon", "E-mail",
+                    "Satış Temsilcisi", "Açıklamalar", "Görüşme Kalitesi", "Tarih"
+                ]], use_container_width=True)
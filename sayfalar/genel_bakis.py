@@ -0,0 +1,363 @@
+# Genel Bakış sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ortak import table_frame, typed_table
+
+def render():
+    df_teklif = table_frame("df_teklif")
+    df_proforma = table_frame("df_proforma")
+    df_eta = table_frame("df_eta")
+
+    ### ===========================
+    ### === GENEL BAKIŞ (Vade Durumu Dahil) ===
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>EXPO CRM - Genel Bakış</h2>", unsafe_allow_html=True)
+
+    invoices_df = typed_table("df_evrak")
+    proforma_t = typed_table("df_proforma")
+    toplam_fatura_tutar = float(invoices_df["Tutar_num"].sum())
+
+    date_col = "Fatura Tarihi"
+    today_norm = pd.Timestamp.today().normalize()
+
+    # ---- Bekleyen Teklifler ----
+    st.markdown("### Bekleyen Teklifler")
+    bekleyen_teklifler = df_teklif[df_teklif["Durum"] == "Açık"] if "Durum" in df_teklif.columns else pd.DataFrame()
+    try:
+        toplam_teklif = pd.to_numeric(bekleyen_teklifler["Tutar"], errors="coerce").sum()
+    except:
+        toplam_teklif = 0
+    st.markdown(f"<div style='font-size:1.3em; color:#11998e; font-weight:bold;'>Toplam: {toplam_teklif:,.2f} USD</div>", unsafe_allow_html=True)
+    if bekleyen_teklifler.empty:
+        st.info("Bekleyen teklif yok.")
+    else:
+        st.dataframe(bekleyen_teklifler[["Müşteri Adı", "Tarih", "Teklif No", "Tutar", "Ürün/Hizmet", "Açıklama"]], use_container_width=True)
+
+    # ---- Bekleyen Proformalar ----
+    st.markdown("### Bekleyen Proformalar")
+    bekleyen_proformalar = df_proforma[df_proforma["Durum"] == "Beklemede"] if "Durum" in df_proforma.columns else pd.DataFrame()
+    try:
+        toplam_proforma = pd.to_numeric(bekleyen_proformalar["Tutar"], errors="coerce").sum()
+    except:
+        toplam_proforma = 0
+    st.markdown(f"<div style='font-size:1.3em; color:#f7971e; font-weight:bold;'>Toplam: {toplam_proforma:,.2f} USD</div>", unsafe_allow_html=True)
+    if bekleyen_proformalar.empty:
+        st.info("Bekleyen proforma yok.")
+    else:
+        st.dataframe(bekleyen_proformalar[["Müşteri Adı", "Proforma No", "Tarih", "Tutar", "Vade (gün)", "Açıklama"]], use_container_width=True)
+
+    # ---- Sevk Bekleyen Siparişler ----
+    sevk_bekleyenler = proforma_t[(proforma_t["Durum"] == "Siparişe Dönüştü") & (~proforma_t["Sevk Durumu"].isin(["Sevkedildi", "Ulaşıldı"]))]
+    sevk_bekleyen_sayisi = len(sevk_bekleyenler)
+    st.markdown(f"### Sevk Bekleyen Siparişler ({sevk_bekleyen_sayisi} Adet)")
+    try:
+        toplam_siparis = pd.to_numeric(sevk_bekleyenler["Tutar"], errors="coerce").sum()
+    except:
+        toplam_siparis = 0
+    st.markdown(f"<div style='font-size:1.3em; color:#185a9d; font-weight:bold;'>Toplam: {toplam_siparis:,.2f} USD</div>", unsafe_allow_html=True)
+    if sevk_bekleyenler.empty:
+        st.info("Sevk bekleyen sipariş yok.")
+    else:
+        sevk_bekleyenler = sevk_bekleyenler.copy()
+        sevk_bekleyenler["Proforma Tarihi"] = sevk_bekleyenler["Tarih"]
+        sevk_bekleyenler = sevk_bekleyenler.sort_values(
+            by="Termin Tarihi", ascending=True, na_position="last"
+        )
+
+        display_df = sevk_bekleyenler.copy()
+        display_df["Termin - Bugün Farkı (Gün)"] = (
+            display_df["Termin Tarihi"] - today_norm
+        ).dt.days
+        display_df["Sipariş Üzerinden Geçen Gün"] = (
+            display_df["Termin Tarihi"] - display_df["Proforma Tarihi"]
+        ).dt.days
+
+        for tarih_kolon in ["Termin Tarihi", "Proforma Tarihi"]:
+            display_df[tarih_kolon] = (
+                display_df[tarih_kolon]
+                .dt.strftime("%d/%m/%Y")
+                .fillna("")
+                .replace({"NaT": ""})
+            )
+
+        for gun_kolon in ["Termin - Bugün Farkı (Gün)", "Sipariş Üzerinden Geçen Gün"]:
+            display_df[gun_kolon] = display_df[gun_kolon].apply(
+                lambda x: "" if pd.isna(x) else int(x)
+            )
+
+        st.dataframe(
+            display_df[
+                [
+                    "Müşteri Adı",
+                    "Ülke",
+                    "Proforma No",
+                    "Proforma Tarihi",
+                    "Termin Tarihi",
+                    "Termin - Bugün Farkı (Gün)",
+                    "Sipariş Üzerinden Geçen Gün",                   
+                    "Tutar",
+                    "Açıklama",
+                ]
+            ],
+            use_container_width=True,
+        )
+
+    # ---- Yolda Olan Siparişler ----
+    st.markdown("### ETA Takibindeki Siparişler")
+    eta_yolda = df_proforma[(df_proforma["Sevk Durumu"] == "Sevkedildi") & (~df_proforma["Sevk Durumu"].isin(["Ulaşıldı"]))] if "Sevk Durumu" in df_proforma.columns else pd.DataFrame()
+    sevkiyat_sayisi = len(eta_yolda)
+    st.markdown(
+        f"<div style='font-size:1.3em; color:#c471f5; font-weight:bold;'>Sevkiyat Sayısı: {sevkiyat_sayisi}</div>",
+        unsafe_allow_html=True,
+    )
+    if eta_yolda.empty:
+        st.info("Yolda olan (sevk edilmiş) sipariş yok.")
+    else:
+        eta_display = eta_yolda.copy()
+        eta_display["Proforma No"] = eta_display["Proforma No"].astype(str)
+
+        if not df_eta.empty:
+            eta_lookup = typed_table("df_eta")
+            eta_lookup["Proforma No"] = eta_lookup["Proforma No"].astype(str)
+            eta_lookup = eta_lookup.sort_values(by="ETA Tarihi", kind="stable")
+            eta_lookup = eta_lookup.drop_duplicates(subset=["Proforma No"], keep="last")
+            eta_display = eta_display.merge(
+                eta_lookup[["Proforma No", "ETA Tarihi"]],
+                on="Proforma No",
+                how="left",
+            )
+        else:
+            eta_display["ETA Tarihi"] = pd.NaT
+
+        eta_display["Kalan Gün"] = (
+            eta_display["ETA Tarihi"] - today_norm
+        ).dt.days
+        eta_display["Kalan Gün"] = eta_display["Kalan Gün"].apply(
+            lambda x: "" if pd.isna(x) else int(x)
+        )        
+        eta_display = eta_display.sort_values(
+            by="ETA Tarihi",
+            ascending=True,
+            na_position="last",
+            kind="stable",
+        )
+        eta_display["ETA Tarihi"] = eta_display["ETA Tarihi"].dt.strftime("%d/%m/%Y")
+        eta_display["ETA Tarihi"] = eta_display["ETA Tarihi"].fillna("").replace({"NaT": ""})
+
+        st.dataframe(
+            eta_display[[
+                "Müşteri Adı",
+                "Ülke",
+                "Proforma No",
+                "Tarih",
+                "ETA Tarihi",
+                "Tutar",
+                "Kalan Gün",
+                "Açıklama",
+            ]],
+            use_container_width=True,
+        )
+    # ---- Son Teslim Edilen Siparişler ----
+    st.markdown("### Son Teslim Edilen 5 Sipariş")
+    if "Sevk Durumu" in proforma_t.columns:
+        teslim_edilenler = proforma_t[proforma_t["Sevk Durumu"] == "Ulaşıldı"].copy()
+        if not teslim_edilenler.empty:
+            # Ana kolonları normalize et
+            for text_col in ["Proforma No", "Müşteri Adı", "Ülke"]:
+                if text_col in teslim_edilenler.columns:
+                    teslim_edilenler[text_col] = (
+                        teslim_edilenler[text_col]
+                        .astype(str)
+                        .str.strip()
+                    )
+
+            if "Proforma Tarihi" not in teslim_edilenler.columns and "Tarih" in teslim_edilenler.columns:
+                teslim_edilenler["Proforma Tarihi"] = teslim_edilenler["Tarih"]
+
+            # Son teslim edilenleri sıralayıp tekrarlayan proformaları ele
+            sort_candidates = ["Ulaşma Tarihi", "Sevk Tarihi", "Proforma Tarihi"]
+            sort_col = next(
+                (col for col in sort_candidates if col in teslim_edilenler.columns),
+                None,
+            )
+
+            if sort_col is not None:
+                teslim_edilenler = teslim_edilenler.sort_values(
+                    by=sort_col, ascending=False, na_position="last"
+                )
+
+            if "Proforma No" in teslim_edilenler.columns:
+                teslim_edilenler = teslim_edilenler.drop_duplicates(
+                    subset=["Proforma No"], keep="first"
+                )
+
+            teslim_edilenler = teslim_edilenler.head(5).reset_index(drop=True)
+
+            if {
+                "Sevk Tarihi",
+                "Proforma Tarihi",
+            }.issubset(teslim_edilenler.columns):
+                teslim_edilenler["Gün Farkı"] = (
+                    teslim_edilenler["Sevk Tarihi"]
+                    - teslim_edilenler["Proforma Tarihi"]
+                ).dt.days
+
+            for kolon in [
+                "Proforma Tarihi",
+                "Termin Tarihi",
+                "Sevk Tarihi",
+                "Ulaşma Tarihi",
+            ]:
+                if kolon in teslim_edilenler.columns:
+                    teslim_edilenler[kolon] = (
+                        teslim_edilenler[kolon]
+                        .dt.strftime("%d/%m/%Y")
+                        .fillna("")
+                        .replace({"NaT": ""})
+                    )
+            if "Gün Farkı" in teslim_edilenler.columns:
+                teslim_edilenler["Gün Farkı"] = teslim_edilenler["Gün Farkı"].apply(
+                    lambda x: "" if pd.isna(x) else int(x)
+                )
+
+            display_columns = [
+                "Müşteri Adı",
+                "Ülke",
+                "Proforma No",
+                "Proforma Tarihi",
+                "Termin Tarihi",
+                "Sevk Tarihi",
+                "Ulaşma Tarihi",
+                "Gün Farkı",
+                "Tutar",
+                "Açıklama",
+            ]
+
+            mevcut_kolonlar = [
+                kolon for kolon in display_columns if kolon in teslim_edilenler.columns
+            ]
+
+            st.dataframe(
+                teslim_edilenler[mevcut_kolonlar],
+                use_container_width=True,
+            )
+        else:
+            st.info("Teslim edilmiş sipariş yok.")
+    else:
+        st.info("Teslim edilmiş sipariş yok.")
+
+    # ---- Vade Takibi Tablosu (HERKES GÖRÜR) ----
+    st.markdown("### Vadeli Fatura ve Tahsilat Takibi")
+
+    kalan_serisi = (
+        invoices_df["Tutar_num"] - invoices_df["Ödenen Tutar"]
+    ).clip(lower=0.0)
+
+    vade_ts = invoices_df["Vade Tarihi"]
+    outstanding_mask = kalan_serisi > 0.01
+    vadesi_gelmemis_m = (vade_ts > today_norm) & outstanding_mask
+    vadesi_bugun_m = (vade_ts.dt.date == today_norm.date()) & outstanding_mask
+    gecikmis_m = (vade_ts < today_norm) & outstanding_mask
+
+    tg_sum = float(kalan_serisi.loc[vadesi_gelmemis_m].sum())
+    tb_sum = float(kalan_serisi.loc[vadesi_bugun_m].sum())
+    gec_sum = float(kalan_serisi.loc[gecikmis_m].sum())
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Vadeleri Gelmeyen", f"{tg_sum:,.2f} USD", f"{int(vadesi_gelmemis_m.sum())} Fatura")
+    c2.metric("Bugün Vadesi Dolan", f"{tb_sum:,.2f} USD", f"{int(vadesi_bugun_m.sum())} Fatura")
+    c3.metric("Geciken Ödemeler", f"{gec_sum:,.2f} USD", f"{int(gecikmis_m.sum())} Fatura")
+
+    vade_df = invoices_df[
+        invoices_df["Vade Tarihi"].notna() & outstanding_mask
+    ].copy()
+    gecikmis_df = pd.DataFrame()
+    if vade_df.empty:
+        st.info("Açık vade kaydı yok.")
+    else:
+        vade_df["Kalan Gün"] = (vade_df["Vade Tarihi"] - pd.to_datetime(datetime.date.today())).dt.days
+        vade_df = vade_df.sort_values("Kalan Gün", ascending=True)
+        gecikmis_df = vade_df[vade_df["Kalan Gün"] < 0].copy()
+        vade_df_display = vade_df.copy()
+        vade_df_display["Kalan Bakiye"] = vade_df_display.index.map(kalan_serisi.get)
+        vade_df_display["Kalan Bakiye"] = vade_df_display["Kalan Bakiye"].fillna(0.0).map(lambda x: f"{x:,.2f} USD")
+        st.dataframe(
+            vade_df_display[["Müşteri Adı", "Ülke", "Fatura No", "Vade Tarihi", "Tutar", "Kalan Gün", "Kalan Bakiye"]],
+            use_container_width=True,
+        )
+
+    st.markdown("#### Gecikmiş Ödemeler")
+    if not gecikmis_df.empty:
+        gecikmis_display = gecikmis_df.copy()
+        gecikmis_display["Kalan Bakiye"] = gecikmis_display.index.map(kalan_serisi.get)
+        gecikmis_display["Kalan Bakiye"] = gecikmis_display["Kalan Bakiye"].fillna(0.0).map(lambda x: f"{x:,.2f} USD")
+        st.dataframe(
+            gecikmis_display[["Müşteri Adı", "Ülke", "Fatura No", "Vade Tarihi", "Tutar", "Kalan Gün", "Kalan Bakiye"]],
+            use_container_width=True,
+        )
+    else:
+        st.info("Gecikmiş ödeme bulunmuyor.")
+    st.markdown("### Satış Analitiği Özeti")
+
+    summary_cols = st.columns(4)
+    summary_cols[0].metric("Toplam Fatura Tutarı", f"{toplam_fatura_tutar:,.2f} USD")
+
+    if invoices_df[date_col].notna().any():
+        last_30_start = today_norm - pd.Timedelta(days=29)
+        last_30_end = today_norm + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)
+        mask_last_30 = invoices_df[date_col].between(last_30_start, last_30_end, inclusive="both")
+        last_30_total = float(invoices_df.loc[mask_last_30, "Tutar_num"].sum())
+        summary_cols[1].metric("Son 30 Gün Cirosu", f"{last_30_total:,.2f} USD", f"{int(mask_last_30.sum())} Fatura")
+
+        current_year = today_norm.year
+        mask_year = invoices_df[date_col].dt.year == current_year
+        year_total = float(invoices_df.loc[mask_year, "Tutar_num"].sum())
+        summary_cols[2].metric(f"{current_year} Toplamı", f"{year_total:,.2f} USD", f"{int(mask_year.sum())} Fatura")
+    else:
+        summary_cols[1].metric("Son 30 Gün Cirosu", "0.00 USD")
+        summary_cols[2].metric(f"{today_norm.year} Toplamı", "0.00 USD")
+
+    if "Müşteri Adı" in invoices_df.columns:
+        active_customers = (
+            invoices_df["Müşteri Adı"]
+            .fillna("")
+            .astype(str)
+            .str.strip()
+            .replace("", np.nan)
+            .dropna()
+            .nunique()
+        )
+    else:
+        active_customers = 0
+    summary_cols[3].metric("Aktif Müşteri", str(active_customers))
+
+    if invoices_df.empty:
+        st.info("Satış analitiği için fatura kaydı bulunmuyor.")
+    elif "Müşteri Adı" in invoices_df.columns:
+        top_df = invoices_df[invoices_df["Tutar_num"] > 0].copy()
+        top_df["Müşteri Adı"] = top_df["Müşteri Adı"].fillna("Bilinmeyen Müşteri").astype(str).str.strip()
+        top_customers = (
+            top_df.groupby("Müşteri Adı")["Tutar_num"]
+            .sum()
+            .sort_values(ascending=False)
+            .head(5)
+            .reset_index()
+        )
+        if not top_customers.empty:
+            st.markdown("#### En Yüksek Ciroya Sahip İlk 5 Müşteri")
+            display_df = top_customers.copy()
+            display_df["Toplam Ciro"] = display_df["Tutar_num"].map(lambda x: f"{x:,.2f} USD")
+            st.dataframe(display_df[["Müşteri Adı", "Toplam Ciro"]], use_container_width=True)
+        else:
+            st.info("Müşteri bazında ciro hesaplanacak veri bulunamadı.")
+    else:
+        st.info("Satış analitiği için müşteri bilgisi bulunmuyor.")
+
+    st.markdown("<hr>", unsafe_allow_html=True)
+    st.info("Daha detaylı işlem yapmak için sol menüden ilgili bölüme geçebilirsiniz.")
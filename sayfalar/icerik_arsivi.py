@@ -0,0 +1,75 @@
+# İçerik Arşivi sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import streamlit as st
+
+from ortak import DRIVE_FOLDER_IDS, archive_catalog, archive_status, request_archive_refresh
+
+def open_url(folder_id: str) -> str:
+    return f"https://drive.google.com/drive/folders/{folder_id}?usp=sharing"
+
+def render():
+    # ===========================
+    # === İÇERİK ARŞİVİ MENÜSÜ ===
+    # ===========================
+
+    st.markdown("<h2 style='color:#8e54e9; font-weight:bold;'>İçerik Arşivi</h2>", unsafe_allow_html=True)
+    st.info("Google Drive’daki medya, ürün görselleri ve kalite evraklarına aşağıdaki sekmelerden ulaşabilirsiniz.")
+
+    tabs = st.tabs(list(DRIVE_FOLDER_IDS.keys()))
+    for tab, tab_name in zip(tabs, DRIVE_FOLDER_IDS.keys()):
+        with tab:
+            fid = DRIVE_FOLDER_IDS[tab_name]
+            durum, hata, son_tarama = archive_status(fid)
+            katalog = archive_catalog(fid)
+
+            col_a, col_b, col_c = st.columns([2, 1, 1])
+            with col_a:
+                if durum == "error":
+                    st.warning(f"Katalog güncellenemedi: {hata}")
+                elif durum == "crawling":
+                    st.caption(f"⏳ Katalog taranıyor… ({len(katalog)} öğe)")
+                else:
+                    st.caption(
+                        f"{len(katalog)} öğe" + (f" · son tarama {son_tarama:%d.%m.%Y %H:%M}" if son_tarama else "")
+                    )
+            with col_b:
+                if st.button("Yenile", key=f"arsiv_yenile_{fid}"):
+                    request_archive_refresh()
+                    st.toast("Katalog yenileniyor; birkaç saniye sonra sayfayı yenileyin.")
+            with col_c:
+                st.link_button("Klasörü yeni sekmede aç", open_url(fid))
+
+            if katalog.empty:
+                st.info("Katalog hazırlanıyor. İlk tarama klasör boyutuna göre biraz sürebilir.")
+                continue
+
+            col_s, col_m = st.columns([3, 1])
+            with col_s:
+                aranan = st.text_input("Ara (dosya adı / klasör)", key=f"arsiv_ara_{fid}").strip().lower()
+            with col_m:
+                arama_modu = st.radio("Eşleşme", ["İçerir", "Başlar"], horizontal=True, key=f"arsiv_mod_{fid}")
+            sadece_dosya = st.checkbox("Klasörleri gizle", value=True, key=f"arsiv_dosya_{fid}")
+
+            sonuc = katalog
+            if sadece_dosya:
+                sonuc = sonuc[sonuc["is_folder"] == 0]
+            if aranan:
+                if arama_modu == "Başlar":
+                    sonuc = sonuc[sonuc["_ad"].str.startswith(aranan)]
+                else:
+                    sonuc = sonuc[sonuc["_arama"].str.contains(aranan, regex=False)]
+
+            col_p, col_n = st.columns([1, 1])
+            with col_p:
+                sayfa_boyu = st.selectbox("Sayfa başına", [25, 50, 100, 200], index=1, key=f"arsiv_boy_{fid}")
+            sayfa_sayisi = max(1, -(-len(sonuc) // sayfa_boyu))
+            with col_n:
+                sayfa = st.number_input("Sayfa", min_value=1, max_value=sayfa_sayisi, value=1, key=f"arsiv_sayfa_{fid}")
+            bas = (int(sayfa) - 1) * sayfa_boyu
+            st.caption(f"{len(sonuc)} sonuç · {min(bas + 1, len(sonuc))}–{min(bas + sayfa_boyu, len(sonuc))} gösteriliyor")
+            st.dataframe(
+                sonuc.iloc[bas:bas + sayfa_boyu][["Ad", "Klasör", "Tür", "Boyut (KB)", "Değiştirilme", "Link"]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={"Link": st.column_config.LinkColumn("Link", display_text="Aç")},
+            )
@@ -0,0 +1,303 @@
+# Müşteri Portföyü sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import re
+
+import numpy as np
+import streamlit as st
+
+from ortak import (
+    _smtp_credentials,
+    build_email_message,
+    enqueue_mail_job,
+    id_label_map,
+    send_email,
+    storage_delete_rows,
+    storage_update_rows,
+    table_frame,
+    temsilci_listesi,
+    typed_table,
+    ulke_listesi,
+)
+
+def render():
+    df_musteri = table_frame("df_musteri")
+
+    ### ===========================
+    ### === MÜŞTERİ LİSTESİ MENÜSÜ (Cloud-Sağlam) ===
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Müşteri Listesi</h2>", unsafe_allow_html=True)
+
+    # ---- Üst Araçlar: Arama + Filtreler ----
+    with st.container():
+        c1, c2, c3, c4 = st.columns([2, 1.2, 1.2, 1.2])
+        aranacak = c1.text_input("Arama (Ad / Telefon / E-posta / Adres)", value="")
+        ulke_filtre = c2.multiselect("Ülke Filtresi", sorted([u for u in df_musteri["Ülke"].dropna().unique() if str(u).strip()]), default=[])
+        temsilci_filtre = c3.multiselect("Temsilci Filtresi", sorted([t for t in df_musteri["Satış Temsilcisi"].dropna().unique() if str(t).strip()]), default=[])
+        durum_filtre = c4.multiselect("Durum", ["Aktif", "Pasif"], default=["Aktif"])  # Varsayılan: Aktif
+
+    # ---- Filtreleme mantığı ----
+    view_df = typed_table("df_musteri")
+
+    # Durum filtresi
+    if len(durum_filtre) > 0:
+        view_df = view_df[view_df["Durum"].isin(durum_filtre)]
+
+    # Ülke filtresi
+    if len(ulke_filtre) > 0:
+        view_df = view_df[view_df["Ülke"].isin(ulke_filtre)]
+
+    # Temsilci filtresi
+    if len(temsilci_filtre) > 0:
+        view_df = view_df[view_df["Satış Temsilcisi"].isin(temsilci_filtre)]
+
+    # Arama filtresi
+    if aranacak.strip():
+        s = aranacak.strip().lower()
+        view_df = view_df[view_df["_arama"].str.contains(s, regex=False)]
+
+    # Görüntü tablosu (boşları sadece tabloda “—” yap)
+    show_cols = ["Müşteri Adı", "Ülke", "Satış Temsilcisi", "Telefon", "E-posta", "Adres", "Kategori", "Durum", "Vade (Gün)", "Ödeme Şekli", "Para Birimi", "DT Seçimi"]
+    for c in show_cols:
+        if c not in view_df.columns:
+            view_df[c] = ""
+
+    table_df = view_df[show_cols].replace({np.nan: "—", "": "—"})
+    table_df = table_df.sort_values("Müşteri Adı").reset_index(drop=True)
+
+    # Özet bilgi ve dışa aktar
+    top_row = st.columns([3, 1])
+    with top_row[0]:
+        st.markdown(f"<div style='color:#219A41; font-weight:700;'>Toplam Kayıt: {len(view_df)}</div>", unsafe_allow_html=True)
+    with top_row[1]:
+        st.download_button(
+            "CSV indir",
+            data=table_df.to_csv(index=False).encode("utf-8"),
+            file_name="musteri_listesi.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+    if table_df.empty:
+        st.markdown("<div style='color:#b00020; font-weight:bold; font-size:1.1em;'>Kayıt bulunamadı.</div>", unsafe_allow_html=True)
+    else:
+        st.dataframe(table_df, use_container_width=True)
+
+        st.markdown("#### Toplu Mail Gönderimi")
+    with st.expander("Filtrelenmiş müşterilere toplu mail gönder", expanded=False):
+        email_pattern = re.compile(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$")
+        mevcut_epostalar = []
+        if "E-posta" in view_df.columns:
+            mevcut_epostalar = [
+                str(e).strip()
+                for e in view_df["E-posta"].dropna().tolist()
+                if str(e).strip()
+            ]
+
+        mevcut_epostalar = sorted({e for e in mevcut_epostalar if email_pattern.match(e)})
+
+        if not mevcut_epostalar:
+            st.info("Seçili filtrelere göre geçerli e-posta adresi bulunamadı.")
+        else:
+            with st.form("bulk_mail_form"):
+                secilen_adresler = st.multiselect(
+                    "Alıcıları seçin", mevcut_epostalar, help="Listelenen geçerli adreslerden seçim yapın."
+                )
+                ek_adresler = st.text_area(
+                    "Ek alıcılar", "", help="Virgül, satır sonu veya noktalı virgülle ayırabilirsiniz."
+                )
+                toplu_konu = st.text_input("Konu")
+                toplu_icerik = st.text_area("İçerik")
+                yuklenen_dosyalar = st.file_uploader(
+                    "Ekler", accept_multiple_files=True, help="E-posta eklerini buradan yükleyin."
+                )
+                gonder = st.form_submit_button("E-postayı Gönder")
+
+            if gonder:
+                tum_adresler = list(secilen_adresler)
+                if ek_adresler.strip():
+                    for parca in re.split(r"[\s,;]+", ek_adresler):
+                        aday = parca.strip()
+                        if aday and email_pattern.match(aday):
+                            tum_adresler.append(aday)
+
+                # Sıra koruyarak tekrarları kaldır
+                benzersiz_adresler = []
+                for adres in tum_adresler:
+                    if adres not in benzersiz_adresler:
+                        benzersiz_adresler.append(adres)
+
+                if not benzersiz_adresler:
+                    st.warning("Lütfen en az bir geçerli alıcı belirtin.")
+                elif not toplu_konu.strip():
+                    st.warning("Konu alanı boş bırakılamaz.")
+                else:
+                    ekler = []
+                    if yuklenen_dosyalar:
+                        for dosya in yuklenen_dosyalar:
+                            try:
+                                icerik = dosya.read()
+                            except Exception:
+                                icerik = dosya.getvalue()
+                            ekler.append(
+                                (
+                                    dosya.name,
+                                    icerik,
+                                    dosya.type or "application/octet-stream",
+                                )
+                            )
+
+                    try:
+                        gonderen, _parola = _smtp_credentials()
+                        mesaj = build_email_message(gonderen, toplu_konu.strip(), toplu_icerik, ekler)
+                        enqueue_mail_job(mesaj, benzersiz_adresler, f"Müşteri Portföyü: {toplu_konu.strip()}")
+                    except Exception as e:
+                        st.error(f"E-posta gönderimi sırasında hata oluştu: {e}")
+                    else:
+                        st.success(
+                            f"E-posta {len(benzersiz_adresler)} alıcı için kuyruğa alındı. "
+                            "Durumu kenar çubuğundaki Mail Kuyruğu panelinden izleyebilirsiniz."
+                        )
+
+    st.markdown("<h4 style='margin-top: 24px;'>Müşteri Düzenle / Sil</h4>", unsafe_allow_html=True)
+
+    # Düzenleme/Silme için seçim: ID ile — güvenli
+    # Önce ekranda gösterilen view_df'ten seçim yaptırıyoruz (alfabetik)
+    secenek_df = view_df.sort_values("Müşteri Adı").reset_index(drop=True)
+    if secenek_df.empty:
+        st.info("Düzenlemek/silmek için uygun kayıt yok.")
+    else:
+        musteri_etiketleri = id_label_map(
+            secenek_df["ID"],
+            [f"{ad} ({kategori})" for ad, kategori in zip(secenek_df["Müşteri Adı"], secenek_df["Kategori"])],
+        )
+        secim = st.selectbox(
+            "Düzenlenecek Müşteriyi Seçin",
+            options=secenek_df["ID"].tolist(),
+            format_func=musteri_etiketleri.get
+        )
+
+        # Orijinal index (ana df_musteri içinden) — ID ile eşle
+        orj_mask = (df_musteri["ID"] == secim)
+        if not orj_mask.any():
+            st.warning("Beklenmeyen hata: Seçilen kayıt ana tabloda bulunamadı.")
+        else:
+            orj_idx = df_musteri.index[orj_mask][0]
+
+            with st.form("edit_existing_customer"):
+                name = st.text_input("Müşteri Adı", value=str(df_musteri.at[orj_idx, "Müşteri Adı"]))
+                phone = st.text_input("Telefon", value=str(df_musteri.at[orj_idx, "Telefon"]))
+                email = st.text_input("E-posta", value=str(df_musteri.at[orj_idx, "E-posta"]))
+                address = st.text_area("Adres", value=str(df_musteri.at[orj_idx, "Adres"]))
+
+                # Ülke / Temsilci seçimleri
+                try:
+                    ulke_def = df_musteri.at[orj_idx, "Ülke"]
+                    ulke_idx = ulke_listesi.index(ulke_def) if ulke_def in ulke_listesi else 0
+                except Exception:
+                    ulke_idx = 0
+                ulke = st.selectbox("Ülke", ulke_listesi, index=ulke_idx)
+
+                try:
+                    tem_def = df_musteri.at[orj_idx, "Satış Temsilcisi"]
+                    tem_idx = temsilci_listesi.index(tem_def) if tem_def in temsilci_listesi else 0
+                except Exception:
+                    tem_idx = 0
+                temsilci = st.selectbox("Satış Temsilcisi", temsilci_listesi, index=tem_idx)
+
+                kategori = st.selectbox(
+                    "Kategori",
+                    sorted(["Avrupa bayi", "bayi", "müşteri", "yeni müşteri"]),
+                    index=sorted(["Avrupa bayi", "bayi", "müşteri", "yeni müşteri"]).index(df_musteri.at[orj_idx, "Kategori"])
+                    if df_musteri.at[orj_idx, "Kategori"] in ["Avrupa bayi", "bayi", "müşteri", "yeni müşteri"] else 0
+                )
+                aktif_pasif = st.selectbox(
+                    "Durum", ["Aktif", "Pasif"],
+                    index=(0 if str(df_musteri.at[orj_idx, "Durum"]) == "Aktif" else 1)
+                )
+
+                vade = st.text_input("Vade (Gün)", value=str(df_musteri.at[orj_idx, "Vade (Gün)"]) if "Vade (Gün)" in df_musteri.columns else "")
+                odeme_sekli = st.selectbox(
+                    "Ödeme Şekli",
+                    ["Peşin", "Mal Mukabili", "Vesaik Mukabili", "Akreditif", "Diğer"],
+                    index=["Peşin", "Mal Mukabili", "Vesaik Mukabili", "Akreditif", "Diğer"].index(df_musteri.at[orj_idx, "Ödeme Şekli"])
+                    if df_musteri.at[orj_idx, "Ödeme Şekli"] in ["Peşin", "Mal Mukabili", "Vesaik Mukabili", "Akreditif", "Diğer"] else 0
+                )
+
+                para_birimi = st.selectbox(
+                    "Para Birimi",
+                    ["EURO", "USD", "TL", "RUBLE"],
+                    index=["EURO", "USD", "TL", "RUBLE"].index(df_musteri.at[orj_idx, "Para Birimi"]) if df_musteri.at[orj_idx, "Para Birimi"] in ["EURO", "USD", "TL", "RUBLE"] else 0
+                )
+
+                dt_secimi = st.selectbox(
+                    "DT Seçimi",
+                    ["DT-1", "DT-2", "DT-3", "DT-4"],
+                    index=["DT-1", "DT-2", "DT-3", "DT-4"].index(df_musteri.at[orj_idx, "DT Seçimi"]) if df_musteri.at[orj_idx, "DT Seçimi"] in ["DT-1", "DT-2", "DT-3", "DT-4"] else 0
+                )
+
+                colu, colm, cols = st.columns(3)
+                guncelle = colu.form_submit_button("Güncelle")
+                muhasebe_gonder = colm.form_submit_button("Muhasebeye Gönder")
+                sil = cols.form_submit_button("Sil")
+
+            if guncelle:
+                storage_update_rows("df_musteri", orj_idx, {
+                    "Müşteri Adı": name,
+                    "Telefon": phone,
+                    "E-posta": email,
+                    "Adres": address,
+                    "Ülke": ulke,
+                    "Satış Temsilcisi": temsilci,
+                    "Kategori": kategori,
+                    "Durum": aktif_pasif,
+                    "Vade (Gün)": vade,
+                    "Ödeme Şekli": odeme_sekli,
+                    "Para Birimi": para_birimi,
+                    "DT Seçimi": dt_secimi,
+                })
+                st.success("Müşteri bilgisi güncellendi!")
+                st.rerun()
+
+            if muhasebe_gonder:
+                guncel_bilgiler = {
+                    "Müşteri Adı": name,
+                    "Telefon": phone,
+                    "E-posta": email,
+                    "Adres": address,
+                    "Ülke": ulke,
+                    "Satış Temsilcisi": temsilci,
+                    "Kategori": kategori,
+                    "Durum": aktif_pasif,
+                    "Vade (Gün)": vade,
+                    "Ödeme Şekli": odeme_sekli,
+                    "Para Birimi": para_birimi,
+                    "DT Seçimi": dt_secimi,
+                }
+
+                try:
+                    yeni_cari_txt_olustur(guncel_bilgiler)
+                    attachments = []
+                    try:
+                        with open("yeni_cari.txt", "rb") as attachment_file:
+                            attachments.append(("yeni_cari.txt", attachment_file.read(), "text/plain"))
+                    except FileNotFoundError:
+                        pass
+
+                    send_email(
+                        to_email=["muhasebe@sekeroglugroup.com", "h.boy@sekeroglugroup.com"],
+                        subject="Güncel Cari Bilgisi",
+                        body="Mevcut müşteri için güncel cari bilgileri ekte yer almaktadır.",
+                        attachments=attachments,
+                        fallback_txt_path="yeni_cari.txt",
+                    )
+                except Exception as e:
+                    st.warning(f"Muhasebeye gönderim sırasında bir hata oluştu: {e}")
+                else:
+                    st.success("Güncel müşteri bilgileri muhasebeye gönderildi!")
+                    st.rerun()
+
+            if sil:
+                storage_delete_rows("df_musteri", orj_idx)
+                st.success("Müşteri kaydı silindi!")
+                st.rerun()
@@ -0,0 +1,217 @@
+# Özel Gün Tebrikleri sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    COUNTRY_LANGUAGE_MAP,
+    EMAIL_UNKNOWN_COUNTRY,
+    HOLIDAY_MAIL_TEMPLATES,
+    LANGUAGE_LABELS,
+    email_country_index,
+    get_holiday_template_content,
+    send_fair_bulk_email,
+)
+
+def render():
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Özel Gün Tebrikleri</h2>", unsafe_allow_html=True)
+    st.markdown("Seçilmiş kişilere bayram ve yeni yıl tebrik e-postaları gönderebilirsiniz.")
+
+    st.markdown(
+        "<h4 style='margin-top:0;'>Seçilmiş kişilere bayram ve yeni yıl tebrikleri gönderin</h4>",
+        unsafe_allow_html=True,
+    )
+
+    unknown_country_label = EMAIL_UNKNOWN_COUNTRY
+
+    # Tablolar değişmedikçe önbellekten gelir; widget etkileşimlerinde yeniden kurulmaz
+    eposta_ulke = email_country_index()
+    tum_epostalar = eposta_ulke["emails"]
+    tum_ulkeler = eposta_ulke["countries"]
+
+    if not tum_epostalar:
+        st.info("Gönderim yapabileceğiniz e-posta adresi bulunamadı.")
+        tum_ulkeler = []
+    else:
+        st.caption(f"Toplam benzersiz e-posta: {len(tum_epostalar)}")
+
+    st.session_state.setdefault("bulk_mail_subject", "")
+    st.session_state.setdefault("bulk_mail_body", "")
+    st.session_state.setdefault("bulk_mail_template_info", None)
+    st.session_state.setdefault("holiday_selected_template", "(Şablon seçiniz)")
+    st.session_state.setdefault("holiday_selected_language", None)
+
+    secili_ulkeler = st.multiselect(
+        "Ülke filtresi",
+        tum_ulkeler,
+        default=tum_ulkeler,
+        help="Sadece seçilen ülkelerle ilişkili e-posta adresleri listelenir.",
+    ) if tum_ulkeler else []
+
+    secili_ulkeler_kumesi = set(secili_ulkeler) if secili_ulkeler else set(tum_ulkeler)
+
+    if secili_ulkeler_kumesi:
+        ciftler = eposta_ulke["pairs"]
+        filtrelenmis_epostalar = ciftler.loc[ciftler["Ülke"].isin(secili_ulkeler_kumesi), "E-posta"].unique().tolist()
+    else:
+        filtrelenmis_epostalar = list(tum_epostalar)
+
+    tumunu_sec_opsiyonu = "(Tümünü seç)"
+    multiselect_options = ([tumunu_sec_opsiyonu] + filtrelenmis_epostalar) if filtrelenmis_epostalar else []
+    varsayilan_secim = [tumunu_sec_opsiyonu] if filtrelenmis_epostalar else []
+
+    secilen_epostalar_raw = st.multiselect(
+        "E-posta adresleri",
+        multiselect_options,
+        default=varsayilan_secim,
+        help="Gönderim yapılacak adresleri seçin.",
+    ) if multiselect_options else []
+
+    if tumunu_sec_opsiyonu in secilen_epostalar_raw:
+        secilen_epostalar = filtrelenmis_epostalar
+    else:
+        secilen_epostalar = secilen_epostalar_raw
+
+    derived_languages = sorted({
+        COUNTRY_LANGUAGE_MAP.get(country)
+        for country in secili_ulkeler_kumesi
+        if country != unknown_country_label and COUNTRY_LANGUAGE_MAP.get(country)
+    })
+
+    template_placeholder = "(Şablon seçiniz)"
+    template_options = [template_placeholder] + list(HOLIDAY_MAIL_TEMPLATES.keys())
+    if st.session_state["holiday_selected_template"] not in template_options:
+        st.session_state["holiday_selected_template"] = template_placeholder
+
+    secilen_sablon = st.selectbox(
+        "Şablon",
+        template_options,
+        key="holiday_selected_template",
+    )        
+
+    secilen_dil = None
+    fallback_kullanildi = False
+    if secilen_sablon != template_placeholder:
+        sablon_dilleri = sorted(HOLIDAY_MAIL_TEMPLATES.get(secilen_sablon, {}).keys())
+        aday_diller = [lang for lang in sablon_dilleri if lang in derived_languages]
+        if not aday_diller:
+            aday_diller = sablon_dilleri
+
+        if len(aday_diller) == 1:
+            secilen_dil = aday_diller[0]
+            st.session_state["holiday_selected_language"] = secilen_dil
+            st.caption(
+                f"Seçilen ülkelere göre dil otomatik olarak {LANGUAGE_LABELS.get(secilen_dil, secilen_dil)} olarak belirlendi."
+            )
+        else:
+            onceki_dil = st.session_state.get("holiday_selected_language")
+            varsayilan_dil = None
+            if derived_languages:
+                for dil in derived_languages:
+                    if dil in aday_diller:
+                        varsayilan_dil = dil
+                        break
+            if varsayilan_dil is None:
+                varsayilan_dil = aday_diller[0] if aday_diller else None
+            if onceki_dil not in aday_diller:
+                st.session_state["holiday_selected_language"] = varsayilan_dil
+
+            secilen_dil = st.selectbox(
+                "Dil",
+                aday_diller,
+                format_func=lambda lang: LANGUAGE_LABELS.get(lang, lang.upper()),
+                key="holiday_selected_language",                      
+
+            )
+
+        mevcut_info = st.session_state.get("bulk_mail_template_info")
+        onceki_konu = st.session_state.get("bulk_mail_subject", "")
+        onceki_govde = st.session_state.get("bulk_mail_body", "")
+        mevcut_sablon_adi = mevcut_info["name"] if mevcut_info else None
+        mevcut_sablon_dili = mevcut_info["language"] if mevcut_info else None
+        alanlar_bos = not onceki_konu.strip() and not onceki_govde.strip()
+        alanlar_mevcut_sablona_esit = bool(
+            mevcut_info
+            and onceki_konu == mevcut_info.get("subject", "")
+            and onceki_govde == mevcut_info.get("body", "")
+        )
+
+        yeni_icerik, fallback_kullanildi = get_holiday_template_content(secilen_sablon, secilen_dil)
+        if yeni_icerik:
+            sablon_degisti = (
+                mevcut_sablon_adi != secilen_sablon
+                or mevcut_sablon_dili != secilen_dil
+            )
+            manuel_duzenleme = bool(mevcut_info and not alanlar_mevcut_sablona_esit)
+
+            sablon_yuklenecek = False
+            if alanlar_bos:
+                sablon_yuklenecek = True
+            elif sablon_degisti and not manuel_duzenleme:
+                sablon_yuklenecek = True
+            elif not sablon_degisti and alanlar_mevcut_sablona_esit:
+                sablon_yuklenecek = True
+
+            if sablon_yuklenecek:
+                st.session_state["bulk_mail_subject"] = yeni_icerik["subject"]
+                st.session_state["bulk_mail_body"] = yeni_icerik["body"]
+                st.session_state["bulk_mail_template_info"] = {
+                    "name": secilen_sablon,
+                    "language": secilen_dil,
+                    "subject": yeni_icerik["subject"],
+                    "body": yeni_icerik["body"],
+                    "fallback": fallback_kullanildi,
+                }
+    else:
+        st.session_state["holiday_selected_language"] = None
+
+    konu = st.text_input("E-posta Konusu", key="bulk_mail_subject")
+    govde = st.text_area(
+        "HTML Gövde",
+        key="bulk_mail_body",
+        height=280,
+        help="İsterseniz metni Türkçe/İngilizce olarak düzenleyebilirsiniz.",
+    )
+
+    yuklenen_gorsel = st.file_uploader(
+        "Görsel ekleyin (isteğe bağlı)",
+        type=["png", "jpg", "jpeg", "gif", "webp", "svg"],
+        accept_multiple_files=False,
+        help="Tek bir görsel yükleyebilirsiniz. Görsel inline gönderim için saklanacaktır.",
+    )
+
+    if filtrelenmis_epostalar:
+        onizleme_df = pd.DataFrame({
+            "E-posta": filtrelenmis_epostalar,
+            "Ülkeler": eposta_ulke["ulkeler"].reindex(filtrelenmis_epostalar).fillna(unknown_country_label).to_numpy(),
+        })
+
+        st.dataframe(onizleme_df, use_container_width=True, hide_index=True)
+
+    etkin_ulke_text = "Tüm ülkeler" if not secili_ulkeler else ", ".join(secili_ulkeler)
+    st.markdown(
+        f"<div style='margin-top:12px; font-size:0.95em;'>"
+        f"<strong>Aktif ülke filtresi:</strong> {etiket if (etiket := etkin_ulke_text) else 'Tüm ülkeler'}<br>"
+        f"<strong>Seçilen adres sayısı:</strong> {len(secilen_epostalar)}<br>"
+        "<strong>Not:</strong> Gönderimlerde varsayılan HTML imzası otomatik olarak eklenecektir."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
+    if st.button("Toplu Maili Gönder", type="primary"):
+        if not secilen_epostalar:
+            st.warning("Lütfen en az bir e-posta adresi seçiniz.")
+        elif not konu.strip():
+            st.warning("Lütfen e-posta konusu giriniz.")
+        else:
+            attachments = [yuklenen_gorsel] if yuklenen_gorsel else []
+            try:
+                send_fair_bulk_email(
+                    secilen_epostalar, konu.strip(), govde, attachments=attachments, label="Özel Gün Tebrikleri"
+                )
+                st.success(
+                    f"E-posta {len(secilen_epostalar)} alıcı için kuyruğa alındı. "
+                    "Durumu kenar çubuğundaki Mail Kuyruğu panelinden izleyebilirsiniz."
+                )
+            except Exception as exc:
+                st.error(f"Gönderim sırasında bir hata oluştu: {exc}")
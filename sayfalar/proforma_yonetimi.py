@@ -0,0 +1,277 @@
+# Proforma Yönetimi sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    PROFORMA_PDF_FOLDER_ID,
+    SIPARIS_FORMU_FOLDER_ID,
+    drive_safe_name,
+    ensure_proforma_folder,
+    id_label_map,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+    upload_to_drive_folder,
+)
+
+def render_siparis_formu_yukleme(df, hedef_id):
+    if not hedef_id:
+        return
+
+    hedef_mask = df["ID"] == hedef_id
+    if not hedef_mask.any():
+        st.session_state.convert_proforma_id = None
+        return
+
+    hedef_idx = df.index[hedef_mask][0]
+    hedef_kayit = df.loc[hedef_idx]
+
+    st.markdown("#### Siparişe Dönüştürme - Sipariş Formu Yükle")
+    st.info(
+        f"{hedef_kayit['Müşteri Adı']} - {hedef_kayit['Proforma No']} için sipariş formunu yükleyin."
+    )
+
+    form_key = f"siparis_formu_upload_{hedef_id}"
+    with st.form(form_key):
+        siparis_formu_file = st.file_uploader(
+            "Sipariş Formu PDF", type="pdf", key=f"sf_{hedef_id}"
+        )
+        col_sf1, col_sf2 = st.columns(2)
+        kaydet_sf = col_sf1.form_submit_button("Sipariş Formunu Kaydet ve Dönüştür")
+        vazgec_sf = col_sf2.form_submit_button("Vazgeç")
+
+    if kaydet_sf:
+        if siparis_formu_file is None:
+            st.error("Sipariş formu yüklenmeli.")
+            return
+
+        if not SIPARIS_FORMU_FOLDER_ID:
+            st.error("Sipariş formu klasör ID'si yapılandırılmamış.")
+            return
+
+        sf_name = (
+            f"{hedef_kayit['Müşteri Adı']}_{hedef_kayit['Proforma No']}_SiparisFormu_"
+            f"{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.pdf"
+        )
+        sf_url = upload_to_drive_folder(SIPARIS_FORMU_FOLDER_ID, sf_name, siparis_formu_file, "Sipariş formu PDF")
+        if not sf_url:
+            return
+        storage_update_rows("df_proforma", hedef_idx, {
+            "Sipariş Formu": sf_url,
+            "Durum": "Siparişe Dönüştü",
+            "Sevk Durumu": "",
+        })
+        st.session_state.convert_proforma_id = None
+        st.success(
+            "Sipariş formu kaydedildi ve durum 'Siparişe Dönüştü' olarak güncellendi!"
+        )
+        st.rerun()
+
+    elif vazgec_sf:
+        st.session_state.convert_proforma_id = None
+        st.info("Siparişe dönüştürme işlemi iptal edildi.")
+        st.rerun()
+
+def render():
+    df_musteri = table_frame("df_musteri")
+    df_proforma = table_frame("df_proforma")
+
+    ### ===========================
+    ### --- PROFORMA TAKİBİ MENÜSÜ (Cloud-Sağlam) ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Proforma Yönetimi</h2>", unsafe_allow_html=True)
+
+    if "convert_proforma_id" not in st.session_state:
+        st.session_state.convert_proforma_id = None
+
+    # ---- Drive klasör ID'leri (üstten tanımlıysa onları kullan) ----
+
+    # ---------- ÜST ÖZET: Bekleyen Proformalar ----------
+    pview = typed_table("df_proforma")
+    beklemede_kayitlar = pview[pview["Durum"] == "Beklemede"].sort_values(["Tarih","Müşteri Adı"], ascending=[False, True])
+    toplam_bekleyen = float(beklemede_kayitlar["Tutar_num"].sum())
+
+    st.subheader("Bekleyen Proformalar")
+    st.markdown(f"<div style='font-weight:600;'>Toplam Bekleyen: {toplam_bekleyen:,.2f} USD</div>", unsafe_allow_html=True)
+    if not beklemede_kayitlar.empty:
+        g = beklemede_kayitlar.copy()
+        g["Tarih"] = g["Tarih"].dt.strftime("%d/%m/%Y")
+        st.dataframe(g[["Müşteri Adı","Proforma No","Tarih","Tutar","Durum","Vade (gün)","Sevk Durumu"]], use_container_width=True)
+    else:
+        st.info("Beklemede proforma bulunmuyor.")
+
+    # ---------- Müşteri seçimi ----------
+    musteri_list = sorted([x for x in df_musteri["Müşteri Adı"].dropna().unique() if str(x).strip()!=""]) if not df_musteri.empty else []
+    musteri_sec = st.selectbox("Müşteri Seç", [""] + musteri_list)
+
+    if musteri_sec:
+        st.write("Proforma işlemi seçin:")
+        islem = st.radio("", ["Yeni Kayıt","Eski Kayıt / Düzenle"], horizontal=True)
+
+        # ============== YENİ KAYIT ==============
+        if islem == "Yeni Kayıt":
+            musteri_info = df_musteri[df_musteri["Müşteri Adı"] == musteri_sec]
+            default_ulke      = musteri_info["Ülke"].values[0] if not musteri_info.empty else ""
+            default_temsilci  = musteri_info["Satış Temsilcisi"].values[0] if not musteri_info.empty else ""
+            default_odeme     = musteri_info["Ödeme Şekli"].values[0] if not musteri_info.empty else ""
+
+            with st.form("add_proforma"):
+                tarih      = st.date_input("Tarih", value=datetime.date.today())
+                proforma_no= st.text_input("Proforma No")
+                tutar      = st.text_input("Tutar (USD)")
+                vade_gun   = st.text_input("Vade (gün)")
+                ulke       = st.text_input("Ülke", value=default_ulke, disabled=True)
+                temsilci   = st.text_input("Satış Temsilcisi", value=default_temsilci, disabled=True)
+                odeme      = st.text_input("Ödeme Şekli", value=default_odeme, disabled=True)
+                aciklama   = st.text_area("Açıklama")
+                durum      = st.selectbox("Durum", ["Beklemede","İptal","Faturası Kesildi","Siparişe Dönüştü"], index=0)
+                pdf_file   = st.file_uploader("Proforma PDF", type="pdf")
+                submitted  = st.form_submit_button("Kaydet")
+
+                if submitted:
+                    if not proforma_no.strip() or not vade_gun.strip():
+                        st.error("Proforma No ve Vade (gün) boş olamaz!")
+                    else:
+                        # Aynı müşteri+proforma no duplike kontrolü
+                        if ((df_proforma["Müşteri Adı"]==musteri_sec) & (df_proforma["Proforma No"].astype(str)==proforma_no.strip())).any():
+                            st.warning("Bu Proforma No bu müşteri için zaten kayıtlı.")
+                        else:
+                            pdf_link = ""
+                            if pdf_file and PROFORMA_PDF_FOLDER_ID:
+                                hedef_kok = PROFORMA_PDF_FOLDER_ID
+                                hedef_klasor = ensure_proforma_folder(hedef_kok, proforma_no.strip(), tarih)
+                                parent_id = hedef_klasor or PROFORMA_PDF_FOLDER_ID
+
+                                tarih_str = tarih.strftime("%Y-%m-%d") if isinstance(tarih, (datetime.date, datetime.datetime)) else str(tarih)
+                                base_name = drive_safe_name(f"{musteri_sec}_{tarih_str}_{proforma_no}" ) or "Proforma"
+                                fname = f"{base_name}.pdf"
+
+                                pdf_link = upload_to_drive_folder(parent_id, fname, pdf_file, "Proforma PDF")
+
+                            new_row = {
+                                "ID": str(uuid.uuid4()),
+                                "Müşteri Adı": musteri_sec,
+                                "Tarih": tarih,
+                                "Proforma No": proforma_no.strip(),
+                                "Tutar": tutar,
+                                "Vade (gün)": vade_gun,
+                                "Ülke": default_ulke,
+                                "Satış Temsilcisi": default_temsilci,
+                                "Ödeme Şekli": default_odeme,
+                                "Açıklama": aciklama,
+                                "Durum": "Beklemede" if durum!="Siparişe Dönüştü" else "Siparişe Dönüştü",
+                                "PDF": pdf_link,
+                                "Sipariş Formu": "",
+                                "Sevk Durumu": "",
+                                "Termin Tarihi": "",
+                                "Ulaşma Tarihi": ""
+                            }
+                            storage_insert_row("df_proforma", new_row)
+                            st.success("Proforma eklendi!")
+                            st.rerun()
+
+        # ============== ESKİ KAYIT / DÜZENLE / SİL / SİPARİŞE DÖNÜŞTÜR ==============
+        elif islem == "Eski Kayıt / Düzenle":
+            # Seçilen müşterinin beklemede + diğer durumları
+            kayitlar = pview[pview["Müşteri Adı"] == musteri_sec]
+            if (
+                st.session_state.convert_proforma_id
+                and st.session_state.convert_proforma_id not in kayitlar["ID"].tolist()
+            ):
+                st.session_state.convert_proforma_id = None
+            if kayitlar.empty:
+                st.info("Bu müşteriye ait proforma kaydı yok.")
+            else:
+                st.dataframe(
+                    kayitlar.sort_values("Tarih", ascending=False)[
+                        ["Müşteri Adı","Proforma No","Tarih","Tutar","Durum","Vade (gün)","Sevk Durumu"]
+                    ],
+                    use_container_width=True
+                )
+
+                proforma_etiketleri = id_label_map(
+                    kayitlar["ID"],
+                    [
+                        f"{no} | {tarih.strftime('%d/%m/%Y') if pd.notna(tarih) else ''}"
+                        for no, tarih in zip(kayitlar["Proforma No"], kayitlar["Tarih"])
+                    ],
+                )
+                sec_id = st.selectbox(
+                    "Proforma Seç",
+                    options=kayitlar["ID"].tolist(),
+                    format_func=proforma_etiketleri.get
+                )
+
+                orj_mask = (df_proforma["ID"] == sec_id)
+                if not orj_mask.any():
+                    st.warning("Beklenmeyen hata: Kayıt bulunamadı.")
+                else:
+                    idx = df_proforma.index[orj_mask][0]
+                    kayit = df_proforma.loc[idx]
+
+                    if str(kayit.get("PDF","")).strip():
+                        st.markdown(f"**Proforma PDF:** [Görüntüle]({kayit['PDF']})", unsafe_allow_html=True)
+
+                    with st.form("edit_proforma"):
+                        tarih_      = st.date_input("Tarih", value=(pd.to_datetime(kayit["Tarih"], errors="coerce").date() if pd.notna(pd.to_datetime(kayit["Tarih"], errors="coerce")) else datetime.date.today()))
+                        proforma_no_= st.text_input("Proforma No", value=str(kayit["Proforma No"]))
+                        tutar_      = st.text_input("Tutar (USD)", value=str(kayit["Tutar"]))
+                        vade_gun_   = st.text_input("Vade (gün)", value=str(kayit["Vade (gün)"]))
+                        aciklama_   = st.text_area("Açıklama", value=str(kayit["Açıklama"]))
+                        durum_      = st.selectbox("Durum", ["Beklemede","Siparişe Dönüştü","İptal","Faturası Kesildi"],
+                                                    index=["Beklemede","Siparişe Dönüştü","İptal","Faturası Kesildi"].index(kayit["Durum"]) if kayit["Durum"] in ["Beklemede","Siparişe Dönüştü","İptal","Faturası Kesildi"] else 0)
+                        termin_     = st.date_input("Termin Tarihi", value=(pd.to_datetime(kayit.get("Termin Tarihi",""), errors="coerce").date() if pd.notna(pd.to_datetime(kayit.get("Termin Tarihi",""), errors="coerce")) else datetime.date.today()), key="termin_inp")
+                        pdf_yeni    = st.file_uploader("Proforma PDF (güncelle - opsiyonel)", type="pdf")
+                        colu, colm, cols = st.columns(3)
+                        guncelle = colu.form_submit_button("Güncelle")
+                        donustur = colm.form_submit_button("Siparişe Dönüştür (+ Sipariş Formu)")
+                        sil      = cols.form_submit_button("Sil")
+
+                    # --- GÜNCELLE ---
+                    if guncelle:
+                        pdf_final = str(kayit.get("PDF",""))
+                        if pdf_yeni and PROFORMA_PDF_FOLDER_ID:
+                            hedef_kok = PROFORMA_PDF_FOLDER_ID
+                            hedef_klasor = ensure_proforma_folder(hedef_kok, proforma_no_.strip(), tarih_)
+                            parent_id = hedef_klasor or PROFORMA_PDF_FOLDER_ID
+
+                            tarih_str = tarih_.strftime("%Y-%m-%d") if isinstance(tarih_, (datetime.date, datetime.datetime)) else str(tarih_)
+                            base_name = drive_safe_name(f"{musteri_sec}_{tarih_str}_{proforma_no_}") or "Proforma"
+                            fname = f"{base_name}.pdf"
+
+                            pdf_final = upload_to_drive_folder(parent_id, fname, pdf_yeni, "Proforma PDF (güncelleme)") or pdf_final
+
+                        storage_update_rows("df_proforma", idx, {
+                            "Tarih": tarih_,
+                            "Proforma No": proforma_no_,
+                            "Tutar": tutar_,
+                            "Vade (gün)": vade_gun_,
+                            "Açıklama": aciklama_,
+                            "Durum": durum_ if durum_ != "Siparişe Dönüştü" else df_proforma.at[idx, "Durum"],
+                            "Termin Tarihi": termin_,
+                            "PDF": pdf_final,
+                        })
+                        st.session_state.convert_proforma_id = None
+                        st.success("Proforma güncellendi!")
+                        st.rerun()
+
+                    # --- SİPARİŞE DÖNÜŞTÜR (Sipariş Formu zorunlu) ---
+                    if donustur:
+                        st.session_state.convert_proforma_id = sec_id
+                        st.rerun()
+
+                    # --- SİL ---
+                    if sil:
+                        st.session_state.convert_proforma_id = None
+                        storage_delete_rows("df_proforma", idx)
+                        st.success("Kayıt silindi!")
+                        st.rerun()
+
+                    render_siparis_formu_yukleme(df_proforma, st.session_state.convert_proforma_id)
@@ -0,0 +1,227 @@
+# Satış Analitiği sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ortak import table_frame, typed_table
+
+def render():
+    df_musteri = table_frame("df_musteri")
+
+    ### ===========================
+    ### --- SATIŞ ANALİTİĞİ MENÜSÜ ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Satış Analitiği</h2>", unsafe_allow_html=True)
+
+    # ---- Tipli faturalar (Tutar_num, datetime tarih) ----
+    date_col = "Fatura Tarihi"
+    evrak_t = typed_table("df_evrak")
+    evrak_t = evrak_t[evrak_t[date_col].notna()]  # geçersiz tarihleri at
+
+    # ---- Toplamlar ----
+    toplam_fatura = float(evrak_t["Tutar_num"].sum())
+    st.markdown(
+        f"<div style='font-size:1.3em; color:#185a9d; font-weight:bold;'>Toplam Fatura Tutarı: {toplam_fatura:,.2f} USD</div>",
+        unsafe_allow_html=True,
+    )
+    # ---- Tarih aralığı filtresi (Timestamp ile) ----
+    min_ts = evrak_t[date_col].min()
+    max_ts = evrak_t[date_col].max()
+    d1, d2 = st.date_input("Tarih Aralığı", value=(min_ts.date(), max_ts.date()))
+
+    start_ts = pd.to_datetime(d1)  # 00:00
+    end_ts   = pd.to_datetime(d2) + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)  # gün sonu
+
+    mask = evrak_t[date_col].between(start_ts, end_ts, inclusive="both")
+    df_range = evrak_t[mask].copy()
+
+    aralik_toplam = float(df_range["Tutar_num"].sum())
+    st.markdown(
+        f"<div style='font-size:1.2em; color:#f7971e; font-weight:bold;'>{d1} - {d2} Arası Toplam: {aralik_toplam:,.2f} USD</div>",
+        unsafe_allow_html=True,
+    )
+
+    # ---- Müşteri filtresi ----
+    df_analytics = df_range.copy()
+    customer_col = "Müşteri Adı" if "Müşteri Adı" in df_analytics.columns else None
+
+    selected_segment = None
+    segment_label = "Müşteri Segmenti"
+    if customer_col and "Kategori" in df_musteri.columns and not df_musteri.empty:
+        segment_df = df_musteri[["Müşteri Adı", "Kategori"]].dropna(subset=["Müşteri Adı"]).copy()
+        if not segment_df.empty:
+            segment_df["Müşteri Adı"] = segment_df["Müşteri Adı"].astype(str).str.strip()
+            segment_series = (
+                segment_df.drop_duplicates("Müşteri Adı").set_index("Müşteri Adı")["Kategori"]
+            )
+            if not segment_series.empty:
+                df_analytics[segment_label] = (
+                    df_analytics[customer_col]
+                    .fillna("")
+                    .astype(str)
+                    .str.strip()
+                    .map(segment_series)
+                    .fillna("Belirtilmemiş")
+                )
+                segment_options = (
+                    ["Tüm Segmentler"]
+                    + sorted(
+                        df_analytics[segment_label]
+                        .dropna()
+                        .astype(str)
+                        .str.strip()
+                        .unique()
+                        .tolist(),
+                        key=lambda x: x.lower(),
+                    )
+                )
+                if len(segment_options) > 1:
+                    selected_segment = st.selectbox("Müşteri Segmenti", segment_options)
+                    if selected_segment != "Tüm Segmentler":
+                        df_analytics = df_analytics[df_analytics[segment_label] == selected_segment]
+
+    df_filtered = df_analytics.copy()
+    selected_customer = None
+    if customer_col:
+        musteri_listesi = sorted(
+            df_analytics[customer_col]
+            .dropna()
+            .astype(str)
+            .str.strip()
+            .replace("", np.nan)
+            .dropna()
+            .unique()
+        )
+        musteri_opsiyonlari = ["Tüm Müşteriler"] + musteri_listesi
+        selected_customer = st.selectbox("Müşteri Bazında Filtre", musteri_opsiyonlari)
+        if selected_customer != "Tüm Müşteriler":
+            df_filtered = df_filtered[
+                df_filtered[customer_col].fillna("").astype(str).str.strip() == selected_customer
+            ]
+
+    filtered_total = float(df_filtered["Tutar_num"].sum())
+    segment_text = (
+        f"{selected_segment} Segmenti - "
+        if selected_segment and selected_segment != "Tüm Segmentler"
+        else ""
+    )
+    if customer_col and selected_customer and selected_customer != "Tüm Müşteriler":
+        toplam_baslik = f"{segment_text}{selected_customer} Toplam"
+    elif customer_col:
+        toplam_baslik = f"{segment_text}Tüm Müşteriler Toplam"
+    else:
+        toplam_baslik = f"{segment_text}Seçili Aralık Toplam"
+
+    st.markdown(
+        f"<div style='font-size:1.1em; color:#185a9d; font-weight:bold;'>{toplam_baslik}: {filtered_total:,.2f} USD</div>",
+        unsafe_allow_html=True,
+    )
+        # ---- En yüksek ciroya sahip müşteriler ----
+    # ---- En yüksek ciroya sahip müşteriler ----
+    if "Müşteri Adı" in df_analytics.columns and not df_analytics.empty:
+        df_musteri = df_analytics.copy()
+        df_musteri["Müşteri Adı"] = df_musteri["Müşteri Adı"].fillna("Bilinmeyen Müşteri")
+        top_musteriler = (
+            df_musteri.groupby("Müşteri Adı")["Tutar_num"]
+            .sum()
+            .sort_values(ascending=False)
+            .head(5)
+            .reset_index()
+        )
+        top_musteriler.rename(columns={"Tutar_num": "Toplam Ciro"}, inplace=True)
+
+        st.markdown(
+            "<h3 style='margin-top:20px; color:#185a9d;'>En Yüksek Ciroya Sahip İlk 5 Müşteri</h3>",
+            unsafe_allow_html=True,
+        )
+
+        col_tab, col_chart = st.columns([1, 1])
+        with col_tab:
+            display_df = top_musteriler.copy()
+            display_df["Toplam Ciro"] = display_df["Toplam Ciro"].map(lambda x: f"{x:,.2f} USD")
+            st.dataframe(display_df, use_container_width=True)
+        with col_chart:
+            st.bar_chart(top_musteriler.set_index("Müşteri Adı")["Toplam Ciro"], use_container_width=True)
+    else:
+        st.info("Seçilen tarih aralığında müşteri bazlı ciro bilgisi bulunamadı.")
+
+    if "Müşteri Adı" in df_analytics.columns and not df_analytics.empty:
+        st.markdown(
+            "<h3 style='margin-top:20px; color:#185a9d;'>Müşteri Bazında Ciro Yüzdeleri</h3>",
+            unsafe_allow_html=True,
+        )
+
+        pie_df = df_analytics.copy()
+        pie_df["Müşteri Adı"] = pie_df["Müşteri Adı"].fillna("Bilinmeyen Müşteri")
+        pie_summary = (
+            pie_df.groupby("Müşteri Adı")["Tutar_num"]
+            .sum()
+            .reset_index()
+            .sort_values("Tutar_num", ascending=False)
+        )
+
+        if not pie_summary.empty:
+            total_value = float(pie_summary["Tutar_num"].sum())
+
+            if total_value <= 0:
+                st.info("Müşteri bazında ciro yüzdesi hesaplanamadı.")
+            else:
+                pie_summary["Yüzde"] = pie_summary["Tutar_num"].apply(
+                    lambda value: round((float(value) / total_value) * 100, 1) if total_value else 0.0
+                )
+
+                colors = plt.cm.tab20(np.linspace(0, 1, len(pie_summary)))
+                fig, ax = plt.subplots(figsize=(8, 6))
+                wedges, _, autotexts = ax.pie(
+                    pie_summary["Tutar_num"],
+                    autopct=lambda pct: f"%{pct:.1f}" if pct > 0 else "",
+                    startangle=0,
+                    colors=colors,
+                    textprops={"color": "white", "weight": "bold"},
+                )
+                for autotext in autotexts:
+                    autotext.set_fontsize(10)
+
+                legend_labels = [
+                    f"{label} (%{pct:.1f})" for label, pct in zip(pie_summary["Müşteri Adı"], pie_summary["Yüzde"])
+                ]
+
+                ax.legend(
+                    wedges,
+                    legend_labels,
+                    title="Müşteriler",
+                    loc="center left",
+                    bbox_to_anchor=(1, 0.5),
+                    fontsize=10,
+                    title_fontsize=11,
+                )
+                ax.set_title("Müşteri Bazında Ciro Dağılımı", color="#185a9d", fontsize=14)
+                ax.axis("equal")
+
+                st.pyplot(fig, use_container_width=True)
+                plt.close(fig)
+
+                display_pie = pie_summary.copy()
+                display_pie["Tutar (USD)"] = display_pie["Tutar_num"].map(lambda x: f"{float(x):,.2f}")
+                display_pie["Yüzde (%)"] = display_pie["Yüzde"].map(lambda x: f"%{x:.1f}")
+                display_pie = display_pie[["Müşteri Adı", "Tutar (USD)", "Yüzde (%)"]]
+                st.dataframe(display_pie, use_container_width=True)
+        else:
+            st.info("Müşteri bazında ciro yüzdesi hesaplanamadı.")
+
+    # ---- Detay tablo ----
+    detail_cols = ["Müşteri Adı", "Fatura No", date_col, "Tutar"]
+    detail_cols = [c for c in detail_cols if c in df_filtered.columns]
+
+    if df_filtered.empty:
+        st.info("Seçilen kriterlere uygun satış kaydı bulunamadı.")
+    else:
+        detail_df = df_filtered.copy()
+        if date_col in detail_df.columns:
+            detail_df = detail_df.sort_values(by=date_col, ascending=False)
+        if detail_cols:
+            detail_df = detail_df[detail_cols]
+        st.dataframe(detail_df, use_container_width=True)
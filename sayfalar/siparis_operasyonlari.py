@@ -0,0 +1,154 @@
+# Sipariş Operasyonları sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    ETA_COLUMNS,
+    id_label_map,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+)
+
+def render():
+    df_proforma = table_frame("df_proforma")
+    df_eta = table_frame("df_eta")
+
+    ### ===========================
+    ### --- SİPARİŞ OPERASYONLARI (ID tabanlı) ---
+    ### ===========================
+
+    st.header("Güncel Sipariş Durumu")
+
+    # ---- Filtre: Siparişe dönmüş ama sevk edilmemiş/ulaşmamış kayıtlar
+    proforma_t = typed_table("df_proforma")
+    siparisler = proforma_t[
+        (proforma_t["Durum"] == "Siparişe Dönüştü")
+        & (~proforma_t["Sevk Durumu"].isin(["Sevkedildi","Ulaşıldı"]))
+    ]
+
+    if siparisler.empty:
+        st.info("Henüz sevk edilmeyi bekleyen sipariş yok.")
+        st.stop()
+
+    # ---- Sıralama: Termin Tarihi
+    siparisler = siparisler.sort_values(["Termin Tarihi","Tarih"], ascending=[True, True])
+
+    # ---- Görünüm için format
+    siparis_sayisi = len(siparisler)
+    g = siparisler.copy()
+    g["Tarih"] = g["Tarih"].dt.strftime("%d/%m/%Y")
+    g["Termin Tarihi"] = g["Termin Tarihi"].dt.strftime("%d/%m/%Y")
+
+    st.markdown(
+        f"<h4 style='color:#219A41; font-weight:bold;'>Tüm Siparişe Dönüşenler ({siparis_sayisi} Adet)</h4>",
+        unsafe_allow_html=True,
+    )
+    goruntulenecek_kolonlar = [
+        "Tarih",
+        "Müşteri Adı",
+        "Termin Tarihi",
+        "Ülke",
+        "Satış Temsilcisi",
+        "Ödeme Şekli",
+        "Proforma No",
+        "Tutar",
+        "Açıklama",
+    ]
+    g_tab = g[goruntulenecek_kolonlar].reset_index(drop=True)
+    g_tab.index = g_tab.index + 1
+    g_tab.index.name = "Sıra"
+    st.dataframe(g_tab, use_container_width=True)
+
+    siparis_etiketleri = id_label_map(
+        siparisler["ID"],
+        [f"{ad} - {no}" for ad, no in zip(siparisler["Müşteri Adı"], siparisler["Proforma No"])],
+    )
+
+    # ================= Termin Tarihi Güncelle =================
+    st.markdown("#### Termin Tarihi Güncelle")
+    sec_id_termin = st.selectbox(
+        "Termin Tarihi Girilecek Sipariş",
+        options=siparisler["ID"].tolist(),
+        format_func=siparis_etiketleri.get
+    )
+    mask_termin = (df_proforma["ID"] == sec_id_termin)
+    mevcut_termin = pd.to_datetime(df_proforma.loc[mask_termin, "Termin Tarihi"].values[0] if mask_termin.any() else None, errors="coerce")
+    default_termin = (mevcut_termin.date() if pd.notna(mevcut_termin) else datetime.date.today())
+    yeni_termin = st.date_input("Termin Tarihi", value=default_termin, key="termin_input")
+
+    if st.button("Termin Tarihini Kaydet"):
+        storage_update_rows("df_proforma", df_proforma.index[mask_termin], {"Termin Tarihi": yeni_termin})
+        st.success("Termin tarihi kaydedildi!")
+        st.rerun()
+
+    # ================= Sevk Et (ETA’ya gönder) =================
+    st.markdown("#### Siparişi Sevk Et (ETA İzleme Kaydına Gönder)")
+    sec_id_sevk = st.selectbox(
+        "Sevk Edilecek Sipariş",
+        options=siparisler["ID"].tolist(),
+        format_func=siparis_etiketleri.get,
+        key="sevk_sec"
+    )
+    if st.button("Sevkedildi → ETA İzlemeye Ekle"):
+        # Proforma'dan bilgiler
+        row = df_proforma.loc[df_proforma["ID"] == sec_id_sevk].iloc[0]
+        # ETA kolon güvenliği
+        for col in ETA_COLUMNS:        
+            if col not in df_eta.columns:
+                df_eta[col] = ""
+        # ETA'ya ekle (varsa güncelleme)
+        filt = (df_eta["Müşteri Adı"] == row["Müşteri Adı"]) & (df_eta["Proforma No"] == row["Proforma No"])
+        if filt.any():
+            storage_update_rows("df_eta", df_eta.index[filt], {
+                "Sevk Tarihi": row.get("Sevk Tarihi", ""),
+                "Açıklama": row.get("Açıklama",""),
+            })
+        else:
+            sevk_tarih = row.get("Sevk Tarihi", "")            
+            storage_insert_row("df_eta", {
+                "Müşteri Adı": row["Müşteri Adı"],
+                "Proforma No": row["Proforma No"],
+                "Sevk Tarihi": sevk_tarih,               
+                "ETA Tarihi": "",
+                "Açıklama": row.get("Açıklama","")
+            })
+        # Proforma'yı işaretle
+        storage_update_rows("df_proforma", df_proforma.index[df_proforma["ID"] == sec_id_sevk], {"Sevk Durumu": "Sevkedildi"})
+        st.success("Sipariş sevkedildi ve ETA takibine gönderildi!")
+        st.rerun()
+
+    # ================= Beklemeye Al (Geri Çağır) =================
+    st.markdown("#### Siparişi Beklemeye Al (Geri Çağır)")
+    sec_id_geri = st.selectbox(
+        "Beklemeye Alınacak Sipariş",
+        options=siparisler["ID"].tolist(),
+        format_func=siparis_etiketleri.get,
+        key="geri_sec"
+    )
+    if st.button("Beklemeye Al / Geri Çağır"):
+        m = (df_proforma["ID"] == sec_id_geri)
+        storage_update_rows("df_proforma", df_proforma.index[m], {"Durum": "Beklemede", "Sevk Durumu": "", "Termin Tarihi": ""})
+        st.success("Sipariş tekrar bekleyen proformalar listesine alındı!")
+        st.rerun()
+
+    # ================= Linkler + Toplam =================
+    st.markdown("#### Tıklanabilir Proforma ve Sipariş Formu Linkleri")
+    for _, r in siparisler.iterrows():
+        links = []
+        if str(r.get("PDF","")).strip():
+            links.append(f"[Proforma PDF: {r['Proforma No']}]({r['PDF']})")
+        if str(r.get("Sipariş Formu","")).strip():
+            fname = f"{r['Müşteri Adı']}__{r['Proforma No']}__SiparisFormu"
+            links.append(f"[Sipariş Formu: {fname}]({r['Sipariş Formu']})")
+        if links:
+            st.markdown(" - " + " | ".join(links), unsafe_allow_html=True)
+
+    # Toplam bekleyen sevk tutarı (akıllı parse)
+
+    toplam = float(siparisler["Tutar_num"].sum())
+    st.markdown(f"<div style='color:#219A41; font-weight:bold;'>*Toplam Bekleyen Sevk: {toplam:,.2f} USD*</div>", unsafe_allow_html=True)
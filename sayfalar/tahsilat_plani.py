@@ -0,0 +1,131 @@
+# Tahsilat Planı sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import pandas as pd
+import streamlit as st
+
+from ortak import id_label_map, storage_update_rows, typed_table
+
+def render():
+    ### ===========================
+    ### --- TAHSİLAT PLANI MENÜSÜ ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Tahsilat Planı</h2>", unsafe_allow_html=True)
+
+    # Sadece vadesi olan kayıtlar
+    vade_df = typed_table("df_evrak")
+    vade_df = vade_df[vade_df["Vade Tarihi"].notna()]
+    vade_df["Kalan Bakiye"] = (vade_df["Tutar_num"] - vade_df["Ödenen Tutar"]).clip(lower=0.0)    
+
+    if vade_df.empty:
+        st.info("Vade tarihi girilmiş kayıt bulunmuyor.")
+    else:
+        today = pd.Timestamp.today().normalize()
+        vade_df["Kalan Gün"] = (vade_df["Vade Tarihi"] - today).dt.days
+
+        # Ödenmemişler üzerinden özet kutucukları
+        acik_mask = vade_df["Kalan Bakiye"] > 0.01
+        acik = vade_df[acik_mask].copy()
+        vadesi_gelmemis = acik[acik["Kalan Gün"] > 0]
+        bugun = acik[acik["Kalan Gün"] == 0]
+        gecikmis = acik[acik["Kalan Gün"] < 0]
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Vadeleri Gelmeyen", f"{float(vadesi_gelmemis['Kalan Bakiye'].sum()):,.2f} USD", f"{len(vadesi_gelmemis)} Fatura")
+        c2.metric("Bugün Vadesi",   f"{float(bugun['Kalan Bakiye'].sum()):,.2f} USD", f"{len(bugun)} Fatura")
+        c3.metric("Gecikmiş Ödemeler",        f"{float(gecikmis['Kalan Bakiye'].sum()):,.2f} USD", f"{len(gecikmis)} Fatura")
+
+        st.markdown("---")
+
+        # Filtreler
+        f1, f2, f3 = st.columns([1.4, 1.2, 1.2])
+        ulke_f = f1.multiselect("Ülke", sorted([u for u in vade_df["Ülke"].dropna().unique() if str(u).strip()]))
+        tem_f  = f2.multiselect("Satış Temsilcisi", sorted([t for t in vade_df["Satış Temsilcisi"].dropna().unique() if str(t).strip()]))
+        durum_f = f3.selectbox("Ödeme Durumu", ["Ödenmemiş (varsayılan)", "Hepsi", "Sadece Ödenmiş"], index=0)
+
+        view = vade_df.copy()
+        if ulke_f:
+            view = view[view["Ülke"].isin(ulke_f)]
+        if tem_f:
+            view = view[view["Satış Temsilcisi"].isin(tem_f)]
+        if durum_f == "Ödenmemiş (varsayılan)":
+            view = view[view["Kalan Bakiye"] > 0.01]
+        elif durum_f == "Sadece Ödenmiş":
+            view = view[view["Kalan Bakiye"] <= 0.01]
+
+        # Görüntü tablosu (görsel kopya)
+        show = view.copy()
+        show["Vade Tarihi"] = show["Vade Tarihi"].dt.strftime("%d/%m/%Y")
+        show["Fatura Tarihi"] = show["Fatura Tarihi"].dt.strftime("%d/%m/%Y")
+        show["Tutar"] = show["Tutar_num"].map(lambda x: f"{float(x):,.2f} USD")
+        show["Ödenen Tutar"] = show["Ödenen Tutar"].map(lambda x: f"{float(x):,.2f} USD")
+        show["Kalan Bakiye"] = show["Kalan Bakiye"].map(lambda x: f"{float(x):,.2f} USD")
+        cols = ["Müşteri Adı","Ülke","Satış Temsilcisi","Fatura No","Fatura Tarihi","Vade Tarihi","Kalan Gün","Tutar","Ödenen Tutar","Kalan Bakiye","Ödendi"]
+        cols = [c for c in cols if c in show.columns]
+        st.dataframe(show[cols].sort_values(["Kalan Gün","Vade Tarihi"]), use_container_width=True)
+
+        st.markdown("#### Ödeme Durumu Güncelle")
+        if not view.empty:
+            # ID yoksa güvenli seçim için bir satır anahtarı oluşturalım
+            view = view.reset_index(drop=False).rename(columns={"index":"_row"})
+            fatura_etiketleri = id_label_map(
+                view["_row"],
+                [f"{ad} | {no}" for ad, no in zip(view["Müşteri Adı"], view["Fatura No"])],
+            )
+            sec = st.selectbox(
+                "Kayıt Seç",
+                options=view["_row"].tolist(),
+                format_func=fatura_etiketleri.get
+            )
+
+            secili = view.loc[view["_row"] == sec].iloc[0]
+            toplam_tutar = float(secili.get("Tutar_num", 0.0) or 0.0)
+            odenen_tutar = float(pd.to_numeric(pd.Series(secili.get("Ödenen Tutar", 0.0)), errors="coerce").fillna(0.0).iloc[0])
+            if odenen_tutar < 0:
+                odenen_tutar = 0.0
+            kalan_bakiye = max(toplam_tutar - odenen_tutar, 0.0)
+
+            ozet_cols = st.columns(3)
+            ozet_cols[0].metric("Fatura Tutarı", f"{toplam_tutar:,.2f} USD")
+            ozet_cols[1].metric("Ödenen Tutar", f"{odenen_tutar:,.2f} USD")
+            ozet_cols[2].metric("Kalan Bakiye", f"{kalan_bakiye:,.2f} USD")
+
+            min_ara_odeme = -odenen_tutar
+            max_ara_odeme = max(toplam_tutar - odenen_tutar, 0.0)
+
+            with st.form(f"tahsilat_guncelle_{sec}"):
+                mevcut_odendi = bool(secili.get("Ödendi", False))
+                ara_odeme = st.number_input(
+                    "Ara ödeme tutarı (USD)",
+                    min_value=float(min_ara_odeme),
+                    max_value=float(max_ara_odeme),
+                    value=0.0,
+                    step=100.0,
+                    format="%.2f",
+                    key=f"ara_odeme_input_{sec}"
+                )
+                st.caption("Not: Gerekirse eksi tutar girerek önceki tahsilatı azaltabilirsiniz.")
+                odendi_mi = st.checkbox(
+                    "Ödendi olarak işaretle",
+                    value=mevcut_odendi,
+                    key=f"odendi_checkbox_{sec}"
+                )
+                kaydet = st.form_submit_button("Kaydet / Güncelle")
+
+            if kaydet:
+                ana_index = int(view.loc[view["_row"] == sec, "_row"].iloc[0])
+                yeni_odenen = odenen_tutar + float(ara_odeme)
+                yeni_odenen = max(min(yeni_odenen, toplam_tutar), 0.0)
+                if toplam_tutar <= 0:
+                    yeni_odenen = 0.0
+                if odendi_mi or yeni_odenen >= max(toplam_tutar - 0.01, 0):
+                    yeni_odenen = toplam_tutar
+                    odendi_mi = True
+                else:
+                    odendi_mi = yeni_odenen >= max(toplam_tutar - 0.01, 0)
+                storage_update_rows("df_evrak", ana_index, {
+                    "Ödenen Tutar": round(yeni_odenen, 2),
+                    "Ödendi": bool(odendi_mi),
+                })
+                st.success("Tahsilat bilgisi güncellendi!")
+                st.rerun()
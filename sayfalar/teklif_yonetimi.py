@@ -0,0 +1,241 @@
+# Teklif Yönetimi sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from ortak import (
+    FIYAT_TEKLIFI_ID,
+    id_label_map,
+    storage_delete_rows,
+    storage_insert_row,
+    storage_update_rows,
+    table_frame,
+    typed_table,
+    upload_to_drive_folder,
+)
+
+def render():
+    df_musteri = table_frame("df_musteri")
+    df_teklif = table_frame("df_teklif")
+
+    ### ===========================
+    ### --- TEKLİF YÖNETİMİ (Cloud-Sağlam) ---
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Teklif Yönetimi</h2>", unsafe_allow_html=True)
+
+    # --- Otomatik teklif no ---
+    def otomatik_teklif_no():
+        if df_teklif.empty or "Teklif No" not in df_teklif.columns:
+            return "TKF-0001"
+        sayilar = pd.to_numeric(
+            df_teklif["Teklif No"].astype(str).str.extract(r'(\d+)$')[0], errors='coerce'
+        ).dropna().astype(int)
+        yeni_no = (sayilar.max() + 1) if not sayilar.empty else 1
+        return f"TKF-{yeni_no:04d}"
+
+    # ---------- ÜST ÖZET: Açık teklifler ----------
+    tkg = typed_table("df_teklif")
+    acik_teklifler = tkg[tkg["Durum"] == "Açık"].sort_values(["Müşteri Adı", "Teklif No"])
+    toplam_teklif = float(acik_teklifler["Tutar_num"].sum())
+    acik_teklif_sayi = len(acik_teklifler)
+    st.subheader("Açık Pozisyondaki Teklifler")
+    st.markdown(
+        f"<div style='font-size:1.05em; color:#11998e; font-weight:bold;'>Toplam: {toplam_teklif:,.2f} USD | "
+        f"Toplam Açık Teklif: {acik_teklif_sayi} adet</div>",
+        unsafe_allow_html=True
+    )
+    if not acik_teklifler.empty:
+        goster = acik_teklifler.copy()
+        goster["Tarih"] = goster["Tarih"].dt.strftime("%d/%m/%Y")
+        st.dataframe(goster[["Müşteri Adı", "Tarih", "Teklif No", "Tutar", "Ürün/Hizmet", "Açıklama"]], use_container_width=True)
+    else:
+        st.info("Açık teklif bulunmuyor.")
+
+    st.markdown("##### Lütfen bir işlem seçin")
+    col1, col2 = st.columns(2)
+    with col1:
+        yeni_teklif_buton = st.button("Yeni Teklif")
+    with col2:
+        eski_teklif_buton = st.button("Eski Teklifler / Düzenle")
+
+    if "teklif_view" not in st.session_state:
+        st.session_state['teklif_view'] = None
+    if yeni_teklif_buton:
+        st.session_state['teklif_view'] = "yeni"
+    if eski_teklif_buton:
+        st.session_state['teklif_view'] = "eski"
+
+    # ============== YENİ TEKLİF ==============
+    if st.session_state['teklif_view'] == "yeni":
+        musteri_list = [""] + sorted(df_musteri["Müşteri Adı"].dropna().unique().tolist())
+        st.subheader("Yeni Teklif Ekle")
+        with st.form("add_teklif"):
+            musteri_sec = st.selectbox("Müşteri Seç", musteri_list, key="yeni_teklif_musteri")
+            tarih = st.date_input("Tarih", value=datetime.date.today(), format="DD/MM/YYYY")
+            teklif_no = st.text_input("Teklif No", value=otomatik_teklif_no())
+            tutar = st.text_input("Tutar (USD)")
+            urun = st.text_input("Ürün/Hizmet")
+            aciklama = st.text_area("Açıklama")
+            durum = st.selectbox("Durum", ["Açık", "Sonuçlandı", "Beklemede"])
+            pdf_file = st.file_uploader("Teklif PDF", type="pdf")
+            submitted = st.form_submit_button("Kaydet")
+
+            pdf_link = ""
+            if submitted:
+                if not teklif_no.strip():
+                    st.error("Teklif No boş olamaz!")
+                elif not musteri_sec:
+                    st.error("Lütfen müşteri seçiniz!")
+                else:
+                    # PDF'yi Drive'a yükle (varsa)
+                    if pdf_file:
+                        temiz_musteri = "".join(x if x.isalnum() else "_" for x in str(musteri_sec))
+                        temiz_tarih = str(tarih).replace("-", "")
+                        pdf_filename = f"{temiz_musteri}__{temiz_tarih}__{teklif_no}.pdf"
+                        pdf_link = upload_to_drive_folder(FIYAT_TEKLIFI_ID, pdf_filename, pdf_file, "Teklif PDF")
+
+                    new_row = {
+                        "ID": str(uuid.uuid4()),
+                        "Müşteri Adı": musteri_sec,
+                        "Tarih": tarih,
+                        "Teklif No": teklif_no,
+                        "Tutar": tutar,
+                        "Ürün/Hizmet": urun,
+                        "Açıklama": aciklama,
+                        "Durum": durum,
+                        "PDF": pdf_link
+                    }
+                    storage_insert_row("df_teklif", new_row)
+                    st.success("Teklif eklendi!")
+                    st.session_state['teklif_view'] = None
+                    st.rerun()
+
+    # ============== ESKİ TEKLİFLER / DÜZENLE / SİL ==============
+    if st.session_state['teklif_view'] == "eski":
+        st.subheader("Eski Teklifler")
+
+        # ---- Filtreler ----
+        f1, f2, f3, f4 = st.columns([1.5, 1, 1.3, 1.2])
+        musteri_f = f1.selectbox("Müşteri", ["(Hepsi)"] + sorted(df_teklif["Müşteri Adı"].dropna().unique().tolist()))
+        durum_f = f2.multiselect("Durum", ["Açık", "Beklemede", "Sonuçlandı"], default=[])
+        # Tarih aralığı
+        view = typed_table("df_teklif")
+        tmp = view["Tarih"]
+        min_dt = (tmp.min().date() if tmp.notna().any() else datetime.date.today())
+        max_dt = (tmp.max().date() if tmp.notna().any() else datetime.date.today())
+        d1 = f3.date_input("Başlangıç", value=min_dt)
+        d2 = f4.date_input("Bitiş", value=max_dt)
+        aranacak = st.text_input("Ara (ürün/açıklama/teklif no)")
+
+        if musteri_f and musteri_f != "(Hepsi)":
+            view = view[view["Müşteri Adı"] == musteri_f]
+        if durum_f:
+            view = view[view["Durum"].isin(durum_f)]
+
+        start_ts = pd.to_datetime(d1)
+        end_ts = pd.to_datetime(d2) + pd.Timedelta(days=1) - pd.Timedelta(milliseconds=1)
+        view = view[view["Tarih"].between(start_ts, end_ts, inclusive="both")]
+
+        if aranacak.strip():
+            s = aranacak.lower().strip()
+            view = view[
+                view["Ürün/Hizmet"].astype(str).str.lower().str.contains(s, na=False) |
+                view["Açıklama"].astype(str).str.lower().str.contains(s, na=False) |
+                view["Teklif No"].astype(str).str.lower().str.contains(s, na=False)
+            ]
+
+        # Toplam ve tablo
+        toplam_view = float(view["Tutar_num"].sum())
+        st.markdown(f"<div style='margin:.25rem 0 .5rem 0; font-weight:600;'>Filtreli Toplam: {toplam_view:,.2f} USD</div>", unsafe_allow_html=True)
+
+        if not view.empty:
+            tablo = view.sort_values("Tarih", ascending=False).drop(columns=["Tutar_num"])
+            tablo["Tarih"] = tablo["Tarih"].dt.strftime("%d/%m/%Y")
+            st.dataframe(tablo[["Müşteri Adı", "Tarih", "Teklif No", "Tutar", "Durum", "Ürün/Hizmet", "Açıklama"]], use_container_width=True)
+            st.download_button(
+                "CSV indir",
+                data=tablo.to_csv(index=False).encode("utf-8"),
+                file_name="teklifler.csv",
+                mime="text/csv"
+            )
+        else:
+            st.info("Filtrelere göre teklif bulunamadı.")
+
+        # ---- Düzenle / Sil ----
+        st.markdown("#### Teklif Düzenle / Sil")
+        if view.empty:
+            st.caption("Önce filtrelerle bir kayıt listeleyin.")
+        else:
+            v_sorted = view.sort_values("Tarih", ascending=False).reset_index(drop=True)
+            teklif_etiketleri = id_label_map(
+                v_sorted["ID"],
+                [f"{ad} | {no}" for ad, no in zip(v_sorted["Müşteri Adı"], v_sorted["Teklif No"])],
+            )
+            sec_id = st.selectbox(
+                "Teklif Seçiniz",
+                options=v_sorted["ID"].tolist(),
+                format_func=teklif_etiketleri.get
+            )
+
+            orj_mask = (df_teklif["ID"] == sec_id)
+            if not orj_mask.any():
+                st.warning("Beklenmeyen hata: Teklif ana tabloda bulunamadı.")
+            else:
+                orj_idx = df_teklif.index[orj_mask][0]
+                # Var olan PDF linkini göster
+                mevcut_pdf = str(df_teklif.at[orj_idx, "PDF"]) if pd.notna(df_teklif.at[orj_idx, "PDF"]) else ""
+                if mevcut_pdf:
+                    st.markdown(f"**Mevcut PDF:** [Görüntüle]({mevcut_pdf})", unsafe_allow_html=True)
+
+                with st.form("edit_teklif"):
+                    try:
+                        tarih_g = pd.to_datetime(df_teklif.at[orj_idx, "Tarih"]).date()
+                    except Exception:
+                        tarih_g = datetime.date.today()
+                    tarih_g = st.date_input("Tarih", value=tarih_g, format="DD/MM/YYYY")
+                    teklif_no_g = st.text_input("Teklif No", value=str(df_teklif.at[orj_idx, "Teklif No"]))
+                    musteri_g = st.selectbox(
+                        "Müşteri",
+                        [""] + sorted(df_musteri["Müşteri Adı"].dropna().unique().tolist()),
+                        index=([""] + sorted(df_musteri["Müşteri Adı"].dropna().unique().tolist())).index(df_teklif.at[orj_idx, "Müşteri Adı"]) if df_teklif.at[orj_idx, "Müşteri Adı"] in ([""] + sorted(df_musteri["Müşteri Adı"].dropna().unique().tolist())) else 0
+                    )
+                    tutar_g = st.text_input("Tutar (USD)", value=str(df_teklif.at[orj_idx, "Tutar"]))
+                    urun_g = st.text_input("Ürün/Hizmet", value=str(df_teklif.at[orj_idx, "Ürün/Hizmet"]))
+                    aciklama_g = st.text_area("Açıklama", value=str(df_teklif.at[orj_idx, "Açıklama"]))
+                    durum_g = st.selectbox("Durum", ["Açık", "Beklemede", "Sonuçlandı"],
+                                           index=["Açık", "Beklemede", "Sonuçlandı"].index(df_teklif.at[orj_idx, "Durum"]) if df_teklif.at[orj_idx, "Durum"] in ["Açık","Beklemede","Sonuçlandı"] else 0)
+                    pdf_yeni = st.file_uploader("PDF Güncelle (opsiyonel)", type="pdf", key=f"pdf_guncel_{sec_id}")
+                    colu, cols = st.columns(2)
+                    guncelle = colu.form_submit_button("Güncelle")
+                    sil = cols.form_submit_button("Sil")
+
+                if guncelle:
+                    pdf_link_final = mevcut_pdf
+                    if pdf_yeni:
+                        # Yeni PDF yükle
+                        temiz_m = "".join(x if x.isalnum() else "_" for x in str(musteri_g or "musteri"))
+                        temiz_t = str(tarih_g).replace("-", "")
+                        fname = f"{temiz_m}__{temiz_t}__{teklif_no_g}.pdf"
+                        pdf_link_final = upload_to_drive_folder(FIYAT_TEKLIFI_ID, fname, pdf_yeni, "Teklif PDF (güncelleme)") or mevcut_pdf
+
+                    storage_update_rows("df_teklif", orj_idx, {
+                        "Tarih": tarih_g,
+                        "Teklif No": teklif_no_g,
+                        "Müşteri Adı": musteri_g,
+                        "Tutar": tutar_g,
+                        "Ürün/Hizmet": urun_g,
+                        "Açıklama": aciklama_g,
+                        "Durum": durum_g,
+                        "PDF": pdf_link_final,
+                    })
+                    st.success("Teklif güncellendi!")
+                    st.rerun()
+
+                if sil:
+                    storage_delete_rows("df_teklif", orj_idx)
+                    st.success("Teklif silindi!")
+                    st.rerun()
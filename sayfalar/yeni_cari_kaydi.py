@@ -0,0 +1,142 @@
+# Yeni Cari Kaydı sayfası. crm.py, bu menü seçiliyken render()'ı çağırır.
+
+import datetime
+import re
+import uuid
+
+import streamlit as st
+
+from ortak import send_email, storage_insert_row, table_frame, temsilci_listesi, ulke_listesi
+
+def _clean_text(s):
+    return (str(s or "")).strip()
+
+def _valid_email(s):
+    s = _clean_text(s)
+    if not s:
+        return True  # boşsa zorunlu değil; doluysa kontrol
+    # basit ve sağlam bir desen
+    return re.match(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$", s) is not None
+
+def _normalized_phone(s):
+    # sadece rakamları al, 10–15 haneye izin ver
+    digits = re.sub(r"\D+", "", str(s or ""))
+    return digits
+
+def render():
+    df_musteri = table_frame("df_musteri")
+
+    ### ===========================
+    ### === CARİ EKLEME MENÜSÜ ===
+    ### ===========================
+
+    st.markdown("<h2 style='color:#219A41; font-weight:bold;'>Yeni Müşteri Ekle</h2>", unsafe_allow_html=True)
+
+    # ---- Yardımcılar: doğrulama & normalizasyon ----
+
+    # Mükerrer kontrol için set (ad+ülke)
+    if df_musteri.empty:
+        existing_pairs = set()
+    else:
+        existing_pairs = set(
+            (str(a).strip().lower(), str(u).strip().lower())
+            for a, u in zip(df_musteri.get("Müşteri Adı", []), df_musteri.get("Ülke", []))
+        )
+
+    with st.form("add_customer", clear_on_submit=False):
+        c1, c2 = st.columns(2)
+        with c1:
+            name = st.text_input("Müşteri Adı *", placeholder="Örn: ABC Dış Ticaret Ltd.")
+            phone = st.text_input("Telefon", placeholder="+90 ...")
+            email = st.text_input("E-posta", placeholder="ornek@firma.com")
+            address = st.text_area("Adres")
+            kategori = st.selectbox("Kategori", ["Avrupa bayi", "bayi", "müşteri", "yeni müşteri"], index=3)
+            aktif_pasif = st.selectbox("Durum", ["Aktif", "Pasif"], index=0)
+        with c2:
+            ulke = st.selectbox("Ülke *", ulke_listesi)
+            temsilci = st.selectbox("Satış Temsilcisi *", temsilci_listesi)
+            vade_gun = st.number_input("Vade (Gün Sayısı)", min_value=0, max_value=365, value=0, step=1)
+            odeme_sekli = st.selectbox("Ödeme Şekli", ["Peşin", "Mal Mukabili", "Vesaik Mukabili", "Akreditif", "Diğer"])
+            para_birimi = st.selectbox("Para Birimi", ["USD", "EURO", "TL", "RUBLE"], index=0)
+            dt_secim = st.selectbox("DT Seçin", ["DT-1", "DT-2", "DT-3", "DT-4"], index=0)
+
+        col_submit1, col_submit2 = st.columns([1, 1])
+        save_clicked = col_submit1.form_submit_button("Kaydet")
+        save_and_send_clicked = col_submit2.form_submit_button("Kaydet ve Muhasebeye Gönder")
+
+    if save_clicked or save_and_send_clicked:
+        send_to_accounting = save_and_send_clicked
+        # --- Normalizasyon ---
+        name_n = _clean_text(name)
+        ulke_n = _clean_text(ulke)
+        email_n = _clean_text(email)
+        phone_n = _normalized_phone(phone)
+
+        # --- Zorunlu alanlar ---
+        errors = []
+        if not name_n:
+            errors.append("Müşteri adı boş olamaz.")
+        if not ulke_n:
+            errors.append("Ülke seçimi zorunludur.")
+        if not temsilci:
+            errors.append("Satış temsilcisi seçimi zorunludur.")
+        if not _valid_email(email_n):
+            errors.append("E-posta formatı hatalı görünüyor.")
+
+        # --- Mükerrer kontrol (Ad + Ülke) ---
+        key = (name_n.lower(), ulke_n.lower())
+        if key in existing_pairs:
+            errors.append("Aynı ada ve ülkeye ait bir müşteri zaten kayıtlı görünüyor.")
+
+        if errors:
+            for e in errors:
+                st.error(e)
+            st.stop()
+
+        # --- Yeni satır ---
+        new_row = {
+            "ID": str(uuid.uuid4()),
+            "Müşteri Adı": name_n,
+            "Telefon": phone_n,                          # normalize edilmiş
+            "E-posta": email_n,
+            "Adres": _clean_text(address),
+            "Ülke": ulke_n,
+            "Satış Temsilcisi": temsilci,
+            "Kategori": kategori,
+            "Durum": aktif_pasif,
+            "Vade (Gün)": vade_gun,
+            "Ödeme Şekli": odeme_sekli,
+            "Para Birimi": para_birimi,
+            "DT Seçimi": dt_secim,
+            "Oluşturma Tarihi": datetime.date.today(),  # faydalı meta
+        }
+
+        # --- Kaydet ---
+        storage_insert_row("df_musteri", new_row)
+
+        if send_to_accounting:
+            # --- Muhasebeye e-posta (sende tanımlı yardımcılar) ---
+            try:
+                yeni_cari_txt_olustur(new_row)
+                attachments = []
+                try:
+                    with open("yeni_cari.txt", "rb") as attachment_file:
+                        attachments.append(("yeni_cari.txt", attachment_file.read(), "text/plain"))
+                except FileNotFoundError:
+                    pass
+
+                send_email(
+                    to_email=["kemal.ilker27@gmail.com"],
+                    subject="Yeni Cari Açılışı",
+                    body="Muhasebe için yeni cari açılışı ekte gönderilmiştir.",
+                    attachments=attachments,
+                    fallback_txt_path="yeni_cari.txt",
+                )
+                st.success("Müşteri eklendi ve e‑posta ile muhasebeye gönderildi!")
+            except Exception as e:
+                st.warning(f"Müşteri eklendi ancak e‑posta gönderilemedi: {e}")
+        else:
+            st.success("Müşteri eklendi. Muhasebeye göndermek için ilgili butonu kullanabilirsiniz.")
+
+        st.balloons()
+        st.rerun()
@@ -0,0 +1,57 @@
+# Tutar metinlerini ("1.234,50 TL", "$ 99.90") sayıya çeviren yardımcılar.
+# Streamlit'e bağlı değildir; crm.py ve testler doğrudan içe aktarır.
+import numpy as np
+import pandas as pd
+
+CURRENCY_SYMBOLS = ["USD", "$", "€", "EUR", "₺", "TL", "tl", "Tl"]
+
+def smart_to_num(value):
+    if pd.isna(value):
+        return 0.0
+    sanitized = str(value).strip()
+    for symbol in CURRENCY_SYMBOLS:
+        sanitized = sanitized.replace(symbol, "")
+    sanitized = sanitized.replace("\u00A0", "").replace(" ", "")
+    try:
+        return float(sanitized)
+    except Exception:
+        pass
+    if "," in sanitized:
+        try:
+            return float(sanitized.replace(".", "").replace(",", "."))
+        except Exception:
+            pass
+    return 0.0
+
+_PLAIN_DECIMAL = r"[+-]?(?:\d+\.?\d*|\.\d+)"
+
+def smart_to_num_series(values) -> pd.Series:
+    """smart_to_num'un vektörel karşılığı: tüm seriyi tek geçişte çevirir, sonuçlar birebir aynıdır."""
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    result = pd.Series(0.0, index=s.index, name=s.name)
+    present = s.notna()
+    if not present.any():
+        return result
+    raw = s[present].reset_index(drop=True)
+    text = raw.astype(str).str.strip()
+    # Sembolleri smart_to_num ile aynı sırayla sil (sıra, iç içe geçen sembollerde sonucu etkiler)
+    for symbol in CURRENCY_SYMBOLS:
+        text = text.str.replace(symbol, "", regex=False)
+    text = text.str.replace("[\u00A0 ]", "", regex=True)
+    # pd.to_numeric son basamakta float()'tan sapabildiği için düz ondalıklar astype(float) ile çevrilir
+    parsed = pd.Series(np.nan, index=text.index)
+    plain = text.str.fullmatch(_PLAIN_DECIMAL)
+    parsed[plain] = text[plain].astype(float)
+    # Virgüllü ondalık: binlik noktalarını at, virgülü noktaya çevir
+    comma = ~plain & text.str.contains(",", regex=False)
+    if comma.any():
+        converted = text[comma].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        ok = converted.str.fullmatch(_PLAIN_DECIMAL)
+        parsed[ok.index[ok]] = converted[ok].astype(float)
+    parsed[text == ""] = 0.0
+    # Kalan az sayıdaki değer ('1_000', '1e3', 'nan', geçersiz metin) için skaler sürüm
+    rest = parsed.isna()
+    if rest.any():
+        parsed[rest] = raw[rest].map(smart_to_num).astype(float)
+    result[present] = parsed.to_numpy()
+    return result
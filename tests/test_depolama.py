@@ -0,0 +1,45 @@
+"""Depolama katmanı: eklenen satır ID ile güncellenip silinebilmeli."""
+from streamlit.testing.v1 import AppTest
+
+
+def _uygulama():
+    import pydrive2.auth
+    pydrive2.auth.GoogleAuth.LocalWebserverAuth = lambda self, *a, **k: None
+    import ortak
+
+    ortak.ensure_workbook = lambda force=False: (ortak.WORKBOOK_PATH, None)
+    ortak.enqueue_workbook_upload = lambda data, q=None: None
+
+    ortak.begin_run()
+    label = ortak.storage_insert_row("df_musteri", {"Müşteri Adı": "Acme", "Telefon": "1"})
+    ortak.storage_insert_row("df_musteri", {"ID": "sabit-id", "Müşteri Adı": "Beta"})
+    row_id = ortak.table_frame("df_musteri").at[label, "ID"]
+    assert isinstance(row_id, str) and row_id.strip()
+
+    def _parse_yok(*args, **kwargs):
+        raise AssertionError("çalışma kitabı yeniden okunmamalı")
+    ortak._parse_workbook = _parse_yok
+
+    # Sonraki çalıştırma: tablolar ayrıştırılmadan önbellekten gelir
+    ortak.begin_run()
+    df = ortak.table_frame("df_musteri")
+    assert df.loc[df["ID"] == "sabit-id", "Müşteri Adı"].tolist() == ["Beta"]
+    ortak.storage_update_rows("df_musteri", df.index[df["ID"] == row_id], {"Telefon": "2"})
+    df = ortak.table_frame("df_musteri")
+    assert df.loc[df["ID"] == row_id, "Telefon"].tolist() == ["2"]
+
+    ortak.begin_run()
+    df = ortak.table_frame("df_musteri")
+    ortak.storage_delete_rows("df_musteri", df.index[df["ID"] == row_id])
+    ortak.begin_run()
+    df = ortak.table_frame("df_musteri")
+    assert row_id not in df["ID"].tolist()
+    assert df["Müşteri Adı"].tolist() == ["Beta"]
+
+
+def test_eklenen_satir_id_ile_guncellenir_ve_silinir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_function(_uygulama)
+    at.secrets["storage_backend"] = "excel"
+    at.run(timeout=30)
+    assert not at.exception, at.exception[0].value if at.exception else None
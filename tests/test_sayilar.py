@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sayilar import smart_to_num, smart_to_num_series
+
+DEGERLER = [
+    # para birimi sembolleri
+    "1.250,50 TL", "$ 99.90", "€1.000", "1000 EUR", "₺ 2.500,75", "USD 12", "12 tl", "5 Tl",
+    "TL", "$",
+    # virgüllü ondalık ve binlik ayırıcılar
+    "3,5", "1.234,56", "1.234.567,89", "1,234.56", "1.000", "10.000.000", "0,99", ",5", ".5",
+    "1 234,00", " 42 ",
+    # boş ve sayı olmayan değerler
+    None, np.nan, pd.NA, "", "   ", "nan", "NaN", "inf", "-inf", "abc", "1,2,3",
+    # Python float() yazımları
+    "1e3", "1E-2", "1_000", "+7",
+    # negatif değerler
+    "-5", "-1.234,50", "- 3", "-$4", "-,5",
+    # metin olmayan değerler
+    0, 7, -2.5, 1e20, True,
+]
+
+
+def _esit(beklenen, gercek):
+    assert beklenen.index.equals(gercek.index)
+    assert gercek.dtype == np.float64
+    assert beklenen.equals(gercek), pd.DataFrame({"skaler": beklenen, "vektorel": gercek})
+
+
+def test_nesne_serisi_skaler_ile_ayni():
+    s = pd.Series(DEGERLER, dtype=object)
+    _esit(s.map(smart_to_num), smart_to_num_series(s))
+
+
+def test_tek_tek_degerler_skaler_ile_ayni():
+    for deger in DEGERLER:
+        s = pd.Series([deger], dtype=object)
+        _esit(s.map(smart_to_num), smart_to_num_series(s))
+
+
+def test_metin_serisi_skaler_ile_ayni():
+    s = pd.Series([v for v in DEGERLER if v is None or isinstance(v, str)], dtype="string")
+    _esit(s.map(smart_to_num).astype(float), smart_to_num_series(s))
+
+
+def test_varsayilan_olmayan_indeks_ve_isim_korunur():
+    s = pd.Series(["1.000,5", None, "7 TL", "-3"], index=[10, 3, 7, 99], name="Tutar", dtype=object)
+    sonuc = smart_to_num_series(s)
+    _esit(s.map(smart_to_num), sonuc)
+    assert sonuc.name == "Tutar"
+    assert sonuc.loc[10] == 1000.5 and sonuc.loc[3] == 0.0
+
+
+@pytest.mark.parametrize(
+    "deger, beklenen",
+    [
+        ("1.250,50 TL", 1250.5),
+        ("$ 99.90", 99.9),
+        ("1.234.567,89", 1234567.89),
+        ("-1.234,50", -1234.5),
+        ("1e3", 1000.0),
+        ("1_000", 1000.0),
+        (None, 0.0),
+        ("", 0.0),
+        ("abc", 0.0),
+    ],
+)
+def test_skaler_degerler(deger, beklenen):
+    assert smart_to_num(deger) == beklenen
+
+
+def test_liste_girdisi_ve_bos_seri():
+    _esit(pd.Series([1.0, 0.0]), smart_to_num_series(["1", None]))
+    assert smart_to_num_series(pd.Series([], dtype=object)).empty
+    _esit(pd.Series([0.0, 0.0], index=[4, 5]), smart_to_num_series(pd.Series([None, np.nan], index=[4, 5])))
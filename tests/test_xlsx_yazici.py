@@ -0,0 +1,114 @@
+import datetime
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from xlsx_yazici import frame_fingerprint, sheet_xml, workbook_zip
+
+
+def _kitap(*sayfalar):
+    data = workbook_zip([(ad, sheet_xml(df)) for ad, df in sayfalar])
+    return openpyxl.load_workbook(io.BytesIO(data))
+
+
+def _degerler(ws):
+    return [list(satir) for satir in ws.iter_rows(values_only=True)]
+
+
+def test_turkce_sayfa_ve_kolon_adlari():
+    df = pd.DataFrame({"Müşteri Adı": ["Şeker Gıda", "İğdır Çay"], "Ödendi": [True, False], "Tutar <₺>": [1, 2]})
+    wb = _kitap(("Kayıtlar", df), ("Müşteri & Ödeme", df.head(0)))
+    assert wb.sheetnames == ["Kayıtlar", "Müşteri & Ödeme"]
+    assert _degerler(wb["Kayıtlar"]) == [
+        ["Müşteri Adı", "Ödendi", "Tutar <₺>"],
+        ["Şeker Gıda", True, 1],
+        ["İğdır Çay", False, 2],
+    ]
+    assert _degerler(wb["Müşteri & Ödeme"]) == [["Müşteri Adı", "Ödendi", "Tutar <₺>"]]
+    assert wb["Kayıtlar"]["A1"].font.b
+
+
+def test_tarihler():
+    df = pd.DataFrame(
+        {
+            "Tarih": [datetime.date(2024, 3, 5), None, datetime.date(1999, 12, 31)],
+            "Zaman": pd.to_datetime(["2024-03-05 13:45:30", None, "2000-01-01 00:00:00"]),
+            "Nesne": pd.Series(
+                [datetime.datetime(2024, 1, 2, 3, 4, 5), pd.Timestamp("2024-02-29", tz="Europe/Istanbul"), pd.NaT],
+                dtype=object,
+            ),
+        }
+    )
+    ws = _kitap(("ETA", df))["ETA"]
+    assert _degerler(ws)[1:] == [
+        [datetime.datetime(2024, 3, 5), datetime.datetime(2024, 3, 5, 13, 45, 30), datetime.datetime(2024, 1, 2, 3, 4, 5)],
+        [None, None, datetime.datetime(2024, 2, 29)],
+        [datetime.datetime(1999, 12, 31), datetime.datetime(2000, 1, 1), None],
+    ]
+    assert ws["A2"].number_format == "yyyy-mm-dd"
+    assert ws["B2"].number_format == "yyyy-mm-dd hh:mm:ss"
+
+
+def test_bool_ve_sayilar():
+    df = pd.DataFrame(
+        {
+            "B": pd.Series([True, np.bool_(False), None], dtype=object),
+            "I": pd.Series([1, np.int64(-7), 2**40], dtype=object),
+            "F": [1.5, -0.25, 1e-9],
+        }
+    )
+    assert _degerler(_kitap(("S", df))["S"])[1:] == [[True, 1, 1.5], [False, -7, -0.25], [None, 2**40, 1e-9]]
+
+
+def test_bos_degerler_hucre_yazmaz():
+    df = pd.DataFrame(
+        {
+            "F": [np.nan, 2.0, None],
+            "S": pd.Series(["", pd.NA, "x"], dtype=object),
+            "N": pd.Series([None, float("nan"), pd.NaT], dtype=object),
+            "Inf": [float("inf"), float("-inf"), 0.0],
+        }
+    )
+    assert _degerler(_kitap(("S", df))["S"])[1:] == [
+        [None, None, None, "inf"],
+        [2, None, None, "-inf"],
+        [None, "x", None, 0],
+    ]
+    # pandas okuyuşu: boş hücreler NaN
+    geri = pd.read_excel(io.BytesIO(workbook_zip([("S", sheet_xml(df))])))
+    assert geri["F"].isna().tolist() == [True, False, True]
+
+
+def test_xml_gecersiz_karakterler_atilir():
+    df = pd.DataFrame({"Açıklama\x07": ["a\x00b\x1fc", "satır\nsonu\tve sekme", "￾\x0bçğ", "<&>\"'"]})
+    assert _degerler(_kitap(("Kontrol\x01", df))["Kontrol"]) == [
+        ["Açıklama"],
+        ["abc"],
+        ["satır\nsonu\tve sekme"],
+        ["çğ"],
+        ["<&>\"'"],
+    ]
+
+
+def test_pandas_ile_gidis_donus():
+    df = pd.DataFrame(
+        {
+            "Müşteri Adı": ["Ö", "Ü"],
+            "Tutar": [1250.5, 3.0],
+            "Fatura Tarihi": pd.to_datetime(["2024-01-31", "2024-12-01"]),
+            "Ödendi": [False, True],
+        }
+    )
+    geri = pd.read_excel(io.BytesIO(workbook_zip([("Evraklar", sheet_xml(df))])), sheet_name="Evraklar")
+    pd.testing.assert_frame_equal(geri, df, check_dtype=False)
+
+
+def test_parmak_izi():
+    df = pd.DataFrame({"A": [1, 2], "B": ["x", "y"]})
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    assert frame_fingerprint(df) != frame_fingerprint(df.assign(B=["x", "z"]))
+    assert frame_fingerprint(df) != frame_fingerprint(df.rename(columns={"B": "C"}))
+    nesne = pd.DataFrame({"A": pd.Series([1], dtype=object)})
+    assert frame_fingerprint(nesne) != frame_fingerprint(pd.DataFrame({"A": pd.Series(["1"], dtype=object)}))
@@ -0,0 +1,172 @@
+# Sayfa bazlı XLSX yazıcı: her sayfa kendi XML parçası olarak serileştirilir, böylece
+# çağıran içerik parmak iziyle (frame_fingerprint) değişmeyen sayfaları önbellekten kullanabilir.
+# Streamlit'e bağlı değildir; crm.py ve testler doğrudan içe aktarır.
+import datetime
+import hashlib
+import html
+import io
+import numbers
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+_EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+_EXCEL_EPOCH_DATE = datetime.date(1899, 12, 30)
+_XLSX_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XLSX_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# 0: varsayılan, 1: başlık (kalın, kenarlıklı), 2: tarih, 3: tarih-saat
+_XLSX_STYLES = (
+    _XLSX_XML_DECL
+    + f'<styleSheet xmlns="{_XLSX_NS}">'
+    '<numFmts count="2"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="top"/></xf>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+).encode("utf-8")
+
+def frame_fingerprint(df: pd.DataFrame):
+    """Tablonun içerik parmak izi (kolonlar, tipler, hücreler). Hesaplanamazsa None: sayfa kirli sayılır."""
+    try:
+        h = hashlib.md5()
+        h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        # object kolonlarda 1 ile "1" aynı hash'i verebilir; hücre tiplerini de kat
+        for i in np.flatnonzero((df.dtypes == object).to_numpy()):
+            kinds = df.iloc[:, i].map(lambda v: type(v).__name__)
+            h.update(pd.util.hash_pandas_object(kinds, index=False).values.tobytes())
+        return h.hexdigest()
+    except Exception:
+        return None
+
+def _xlsx_col_letter(n: int) -> str:
+    letters = ""
+    n += 1
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _xlsx_text(ref: str, text: str, style: int = 0) -> str:
+    text = html.escape(_XML_ILLEGAL.sub("", text), quote=False)
+    s_attr = f' s="{style}"' if style else ""
+    return f'<c r="{ref}"{s_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _xlsx_cell(ref: str, v) -> str:
+    """Tek hücreyi XML'e çevir; boş değerler için hücre yazılmaz."""
+    if v is None or v is pd.NaT or v is pd.NA:
+        return ""
+    if isinstance(v, str):
+        return _xlsx_text(ref, v) if v else ""
+    if isinstance(v, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, np.datetime64):
+        v = pd.Timestamp(v)
+        if v is pd.NaT:
+            return ""
+    if isinstance(v, datetime.datetime):
+        if v.tzinfo is not None:
+            v = v.replace(tzinfo=None)
+        serial = (pd.Timestamp(v) - _EXCEL_EPOCH) / pd.Timedelta(days=1)
+        return f'<c r="{ref}" s="3"><v>{serial!r}</v></c>'
+    if isinstance(v, datetime.date):
+        return f'<c r="{ref}" s="2"><v>{(v - _EXCEL_EPOCH_DATE).days}</v></c>'
+    if isinstance(v, numbers.Number):
+        if isinstance(v, numbers.Integral):
+            return f'<c r="{ref}"><v>{int(v)}</v></c>'
+        try:
+            f = float(v)
+        except (TypeError, ValueError):
+            return _xlsx_text(ref, str(v))
+        if f != f:
+            return ""
+        if f in (float("inf"), float("-inf")):
+            return _xlsx_text(ref, str(v))
+        return f'<c r="{ref}"><v>{f!r}</v></c>'
+    try:
+        if pd.isna(v):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return _xlsx_text(ref, str(v))
+
+def sheet_xml(df: pd.DataFrame) -> bytes:
+    """Tek bir DataFrame'i worksheet XML'ine serileştir (başlık + satırlar)."""
+    letters = [_xlsx_col_letter(i) for i in range(df.shape[1])]
+    parts = [_XLSX_XML_DECL, f'<worksheet xmlns="{_XLSX_NS}"><sheetData>']
+    header = "".join(_xlsx_text(f"{L}1", str(c), style=1) for L, c in zip(letters, df.columns))
+    parts.append(f'<row r="1">{header}</row>')
+    for r, row in enumerate(df.itertuples(index=False, name=None), start=2):
+        cells = "".join(_xlsx_cell(f"{L}{r}", v) for L, v in zip(letters, row))
+        parts.append(f'<row r="{r}">{cells}</row>')
+    parts.append("</sheetData></worksheet>")
+    return "".join(parts).encode("utf-8")
+
+def workbook_zip(sheets: list) -> bytes:
+    """(sayfa adı, worksheet XML) listesinden .xlsx paketi oluştur."""
+    n = len(sheets)
+    content_types = (
+        _XLSX_XML_DECL
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        + "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, n + 1)
+        )
+        + "</Types>"
+    )
+    root_rels = (
+        _XLSX_XML_DECL
+        + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    )
+    workbook = (
+        _XLSX_XML_DECL
+        + f'<workbook xmlns="{_XLSX_NS}" xmlns:r="{_XLSX_REL_NS}"><sheets>'
+        + "".join(
+            f'<sheet name="{html.escape(_XML_ILLEGAL.sub("", name))}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, (name, _) in enumerate(sheets, start=1)
+        )
+        + "</sheets></workbook>"
+    )
+    workbook_rels = (
+        _XLSX_XML_DECL
+        + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + "".join(
+            f'<Relationship Id="rId{i}" Type="{_XLSX_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n + 1)
+        )
+        + f'<Relationship Id="rId{n + 1}" Type="{_XLSX_REL_NS}/styles" Target="styles.xml"/>'
+        "</Relationships>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", root_rels)
+        zf.writestr("xl/workbook.xml", workbook)
+        zf.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
+        zf.writestr("xl/styles.xml", _XLSX_STYLES)
+        for i, (_, xml) in enumerate(sheets, start=1):
+            zf.writestr(f"xl/worksheets/sheet{i}.xml", xml)
+    return buffer.getvalue()